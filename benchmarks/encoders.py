@@ -0,0 +1,146 @@
+# Times the vectorized board encoders, one position at a time and through encode_batch,
+# against the per-point loops they replaced, checking on every position that all of
+# them produce the same tensor
+import argparse
+import time
+
+import numpy as np
+
+from dlgo import goboard, goboard_fast
+from dlgo.agent.naive import RandomBot
+from dlgo.encoders.oneplane import OnePlaneEncoder
+from dlgo.encoders.sevenplane import SevenPlaneEncoder
+from dlgo.encoders.simple import SimpleEncoder
+from dlgo.goboard import Move
+from dlgo.gotypes import Player, Point
+
+ENGINES = {
+    'goboard': goboard,
+    'goboard_fast': goboard_fast,
+}
+
+
+def encode_oneplane_loop(encoder, game_state):
+    board_matrix = np.zeros(encoder.shape())
+    next_player = game_state.next_player
+    for r in range(encoder.board_height):
+        for c in range(encoder.board_width):
+            p = Point(row=r + 1, col=c + 1)
+            go_string = game_state.board.get_go_string(p)
+            if go_string is None:
+                continue
+            if go_string.color == next_player:
+                board_matrix[0, r, c] = 1
+            else:
+                board_matrix[0, r, c] = -1
+    return board_matrix
+
+
+def encode_simple_loop(encoder, game_state):
+    board_tensor = np.zeros(encoder.shape())
+    if game_state.next_player == Player.black:
+        board_tensor[8] = 1
+    else:
+        board_tensor[9] = 1
+    for r in range(encoder.board_height):
+        for c in range(encoder.board_width):
+            p = Point(row=r + 1, col=c + 1)
+            go_string = game_state.board.get_go_string(p)
+            if go_string is None:
+                if game_state.does_move_violate_ko(game_state.next_player, Move.play(p)):
+                    board_tensor[10][r][c] = 1
+            else:
+                liberty_plane = min(4, go_string.num_liberties) - 1
+                if go_string.color == Player.white:
+                    liberty_plane += 4
+                board_tensor[liberty_plane][r][c] = 1
+    return board_tensor
+
+
+def encode_sevenplane_loop(encoder, game_state):
+    board_tensor = np.zeros(encoder.shape())
+    base_plane = {
+        game_state.next_player: 0,
+        game_state.next_player.other: 3,
+    }
+    for row in range(encoder.board_height):
+        for col in range(encoder.board_width):
+            p = Point(row=row + 1, col=col + 1)
+            go_string = game_state.board.get_go_string(p)
+            if go_string is None:
+                if game_state.does_move_violate_ko(game_state.next_player, Move.play(p)):
+                    board_tensor[6][row][col] = 1
+            else:
+                liberty_plane = min(3, go_string.num_liberties) - 1
+                liberty_plane += base_plane[go_string.color]
+                board_tensor[liberty_plane][row][col] = 1
+    return board_tensor
+
+
+ENCODERS = {
+    'oneplane': (OnePlaneEncoder, encode_oneplane_loop),
+    'simple': (SimpleEncoder, encode_simple_loop),
+    'sevenplane': (SevenPlaneEncoder, encode_sevenplane_loop),
+}
+
+
+def random_positions(engine, board_size, num_games, max_moves):
+    """Every position of num_games random self-play games"""
+    bot = RandomBot()
+    positions = []
+    for _ in range(num_games):
+        game = engine.GameState.new_game(board_size)
+        num_moves = 0
+        while not game.is_over() and num_moves < max_moves:
+            positions.append(game)
+            game = game.apply_move(bot.select_move(game))
+            num_moves += 1
+    return positions
+
+
+def time_encode(encode, positions, repeats):
+    """Best time per position in microseconds over repeats passes"""
+    best = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for game_state in positions:
+            encode(game_state)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return 1e6 * best / len(positions)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--board-size', '-b', type=int, default=19)
+    parser.add_argument('--num-games', '-n', type=int, default=2)
+    parser.add_argument('--max-moves', '-m', type=int, default=400)
+    parser.add_argument('--repeats', '-r', type=int, default=5)
+    parser.add_argument('--engine', default='goboard_fast', choices=list(ENGINES))
+    parser.add_argument('--encoders', nargs='+', default=list(ENCODERS), choices=list(ENCODERS))
+    args = parser.parse_args()
+
+    positions = random_positions(ENGINES[args.engine], args.board_size,
+                                 args.num_games, args.max_moves)
+    print('%d positions' % len(positions))
+    for name in args.encoders:
+        encoder_class, encode_loop = ENCODERS[name]
+        encoder = encoder_class((args.board_size, args.board_size))
+        for i, game_state in enumerate(positions):
+            expected = encode_loop(encoder, game_state)
+            actual = encoder.encode(game_state)
+            if actual.dtype != expected.dtype or not np.array_equal(actual, expected):
+                raise AssertionError('%s differs from the loop on position %d' % (name, i))
+        batch = encoder.encode_batch(positions)
+        if not np.array_equal(batch, [encoder.encode(game_state) for game_state in positions]):
+            raise AssertionError('%s encode_batch differs from encode' % name)
+        loop_us = time_encode(lambda game_state: encode_loop(encoder, game_state),
+                              positions, 1)
+        vectorized_us = time_encode(encoder.encode, positions, args.repeats)
+        batch_us = time_encode(encoder.encode_batch, [positions], args.repeats) / len(positions)
+        print('%-12s loop %8.1fus  vectorized %6.1fus  batch %6.1fus  speedup %5.1fx' % (
+            name, loop_us, vectorized_us, batch_us, loop_us / vectorized_us))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+# Measures the memory an expanded MCTSNode costs, and what the compact Point/Move
+# representation saves over plain namedtuple points and dict-backed moves
+import argparse
+import random
+import tracemalloc
+
+from dlgo import goboard_fast, goboard_slow
+from dlgo.gotypes import Point_
+from dlgo.mcts import MCTSNode
+
+
+class DictNode(object):
+    """Stand-in for an MCTSNode without __slots__"""
+    pass
+
+
+def node_shell(cls):
+    node = cls.__new__(cls)
+    for attr in MCTSNode.__slots__:
+        setattr(node, attr, None)
+    return node
+
+
+def measure(build):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return after - before, result
+
+
+def legacy_moves(moves):
+    return [
+        goboard_slow.Move(point=Point_(m.point.row, m.point.col)) if m.is_play
+        else goboard_slow.Move(is_pass=m.is_pass, is_resign=m.is_resign)
+        for m in moves
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--board-size', '-b', type=int, default=19)
+    parser.add_argument('--num-children', '-n', type=int, default=200)
+    parser.add_argument('--opening-moves', type=int, default=20)
+    args = parser.parse_args()
+
+    random.seed(0)
+    game = goboard_fast.GameState.new_game(args.board_size)
+    for _ in range(args.opening_moves):
+        game = game.apply_move(random.choice(game.legal_moves()[:-2]))
+
+    def expand():
+        root = MCTSNode(game)
+        for _ in range(args.num_children):
+            if not root.can_add_child():
+                break
+            root.add_random_child()
+        return root
+
+    total, root = measure(expand)
+    num_nodes = len(root.children) + 1
+    print('expanded nodes:              %d' % num_nodes)
+    print('bytes per node (total):      %d' % (total // num_nodes))
+
+    moves = [child.game_state.legal_moves() for child in root.children]
+    compact, _ = measure(lambda: [list(m) for m in moves])
+    legacy, _ = measure(lambda: [legacy_moves(m) for m in moves])
+    print('move list per node, compact: %d' % (compact // len(moves)))
+    print('move list per node, legacy:  %d' % (legacy // len(moves)))
+
+    slotted, _ = measure(lambda: [node_shell(MCTSNode) for _ in range(1000)])
+    dict_backed, _ = measure(lambda: [node_shell(DictNode) for _ in range(1000)])
+    print('node shell, __slots__:       %d' % (slotted // 1000))
+    print('node shell, __dict__:        %d' % (dict_backed // 1000))
+    print('saved per node:              %d' % ((legacy - compact) // len(moves) + (dict_backed - slotted) // 1000))
+
+
+if __name__ == '__main__':
+    main()
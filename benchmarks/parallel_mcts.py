@@ -0,0 +1,48 @@
+# Times ParallelMCTSAgent move selection for a range of worker counts
+import argparse
+import contextlib
+import io
+import time
+
+from dlgo import goboard_fast
+from dlgo.mcts import MCTSAgent, ParallelMCTSAgent
+
+
+def time_select_move(bot, game_state, num_moves):
+    start = time.perf_counter()
+    for _ in range(num_moves):
+        # select_move prints its candidate moves
+        with contextlib.redirect_stdout(io.StringIO()):
+            bot.select_move(game_state)
+    return (time.perf_counter() - start) / num_moves
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--board-size', '-b', type=int, default=9)
+    parser.add_argument('--rounds', '-r', type=int, default=2000)
+    parser.add_argument('--temperature', '-t', type=float, default=1.4)
+    parser.add_argument('--num-moves', '-n', type=int, default=3)
+    parser.add_argument('--workers', '-w', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--modes', nargs='+', default=['root', 'tree'], choices=['root', 'tree'])
+    args = parser.parse_args()
+
+    game_state = goboard_fast.GameState.new_game(args.board_size)
+    serial = time_select_move(MCTSAgent(args.rounds, args.temperature), game_state, args.num_moves)
+    print('%-6s %8s %10.3fs per move %10.0f playouts/s' % (
+        'serial', '-', serial, args.rounds / serial))
+
+    for mode in args.modes:
+        for num_workers in args.workers:
+            bot = ParallelMCTSAgent(args.rounds, args.temperature,
+                                    num_workers=num_workers, mode=mode)
+            # Start the pool outside of the timing
+            bot._get_pool()
+            elapsed = time_select_move(bot, game_state, args.num_moves)
+            bot.close()
+            print('%-6s %8d %10.3fs per move %10.0f playouts/s  speedup %.2fx' % (
+                mode, num_workers, elapsed, args.rounds / elapsed, serial / elapsed))
+
+
+if __name__ == '__main__':
+    main()
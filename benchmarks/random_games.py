@@ -0,0 +1,143 @@
+# Times the board implementations against the baseline engine, goboard_slow:
+# - full random self-play games through apply_move
+# - expanding every legal move of positions from such games, as a search does, through
+#   apply_move, or through play/undo on goboard_fast.MutableGameState
+# - padded_arrays snapshots, as the vectorized encoders take them
+import argparse
+import time
+
+from dlgo import goboard, goboard_fast, goboard_slow
+from dlgo.agent.naive import RandomBot
+from dlgo.gotypes import Player
+
+ENGINES = {
+    'goboard_slow': goboard_slow,
+    'goboard': goboard,
+    'goboard_fast': goboard_fast,
+}
+
+
+def play_random_game(engine, board_size, max_moves):
+    game = engine.GameState.new_game(board_size)
+    bots = {
+        Player.black: RandomBot(),
+        Player.white: RandomBot(),
+    }
+    num_moves = 0
+    while not game.is_over() and num_moves < max_moves:
+        game = game.apply_move(bots[game.next_player].select_move(game))
+        num_moves += 1
+    return num_moves
+
+
+def random_positions(engine, board_size, num_games, max_moves):
+    """Every position of num_games random self-play games"""
+    bot = RandomBot()
+    positions = []
+    for _ in range(num_games):
+        game = engine.GameState.new_game(board_size)
+        while not game.is_over() and len(positions) < max_moves * num_games:
+            positions.append(game)
+            game = game.apply_move(bot.select_move(game))
+    return positions
+
+
+def with_moves(positions):
+    """(position, its legal plays) pairs, so expanding them times the moves alone"""
+    return [
+        (game, [move for move in game.legal_moves() if move.is_play])
+        for game in positions
+    ]
+
+
+def expand_apply_move(expansions):
+    """Plays the moves of every (position, moves) pair through apply_move, returns the
+    move count"""
+    num_moves = 0
+    for game, moves in expansions:
+        for move in moves:
+            game.apply_move(move)
+        num_moves += len(moves)
+    return num_moves
+
+
+def expand_play_undo(expansions):
+    """expand_apply_move with play/undo on one MutableGameState per position"""
+    num_moves = 0
+    for game, moves in expansions:
+        state = goboard_fast.MutableGameState.from_game_state(game)
+        for move in moves:
+            state.play(move)
+            state.undo()
+        num_moves += len(moves)
+    return num_moves
+
+
+def time_per_call(function, positions, repeats=3):
+    """Best time of function(positions) in microseconds per unit it returns"""
+    best = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        units = function(positions)
+        elapsed = 1e6 * (time.perf_counter() - start) / max(units, 1)
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def snapshot(positions):
+    for game in positions:
+        game.board.padded_arrays()
+    return len(positions)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--board-size', '-b', type=int, default=9)
+    parser.add_argument('--num-games', '-n', type=int, default=1)
+    parser.add_argument('--max-moves', '-m', type=int, default=1000)
+    parser.add_argument('--engines', nargs='+', default=list(ENGINES), choices=list(ENGINES))
+    parser.add_argument('--baseline', default='goboard_slow', choices=list(ENGINES))
+    args = parser.parse_args()
+
+    print('random games')
+    timings = {}
+    for name in args.engines:
+        total_moves = 0
+        start = time.perf_counter()
+        for _ in range(args.num_games):
+            total_moves += play_random_game(ENGINES[name], args.board_size, args.max_moves)
+        elapsed = time.perf_counter() - start
+        timings[name] = 1000 * elapsed / max(total_moves, 1)
+        print('%-14s %8.2fs per game  %8.3fms per move' % (
+            name, elapsed / args.num_games, timings[name]))
+    if args.baseline in timings:
+        for name in args.engines:
+            print('%-14s %6.1fx against %s' % (
+                name, timings[args.baseline] / timings[name], args.baseline))
+
+    # goboard_slow has neither legal_moves nor padded_arrays, so the search and
+    # snapshot rows compare goboard_fast with goboard
+    print('expanding every legal move / padded_arrays snapshot, in us')
+    positions = random_positions(goboard, args.board_size, args.num_games, args.max_moves)
+    fast_positions = random_positions(goboard_fast, args.board_size, args.num_games,
+                                      args.max_moves)
+    expansions = with_moves(positions)
+    fast_expansions = with_moves(fast_positions)
+    rows = [
+        ('goboard', expand_apply_move, expansions),
+        ('goboard_fast', expand_apply_move, fast_expansions),
+        ('play/undo', expand_play_undo, fast_expansions),
+    ]
+    reference = None
+    for name, expand, game_states in rows:
+        per_move = time_per_call(expand, game_states)
+        reference = reference or per_move
+        print('%-14s %8.1fus per move  %5.1fx' % (name, per_move, reference / per_move))
+    slow_snapshot = time_per_call(snapshot, positions)
+    fast_snapshot = time_per_call(snapshot, fast_positions)
+    print('%-14s %8.1fus goboard  %8.1fus goboard_fast  %5.1fx' % (
+        'padded_arrays', slow_snapshot, fast_snapshot, slow_snapshot / fast_snapshot))
+
+
+if __name__ == '__main__':
+    main()
@@ -4,4 +4,5 @@ from .predict import *
 from .pg import *
 from .termination import *
 from .helpers import *
+from .cache import *
 
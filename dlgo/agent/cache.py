@@ -0,0 +1,140 @@
+from collections import OrderedDict
+
+import numpy as np
+
+from dlgo import zobrist
+
+__all__ = [
+    'InferenceCache',
+]
+
+# (rotations by 90 degrees, mirrored first) for the 8 symmetries of a square board;
+# other boards only have the first 4 (identity, both mirrors and the half turn)
+_SYMMETRIES = [(0, False), (2, True), (2, False), (0, True),
+               (1, False), (3, False), (1, True), (3, True)]
+
+
+def _transform(plane, symmetry):
+    turns, mirrored = symmetry
+    if mirrored:
+        plane = plane[:, ::-1]
+    return np.rot90(plane, turns)
+
+
+def _inverse_transform(plane, symmetry):
+    turns, mirrored = symmetry
+    plane = np.rot90(plane, -turns)
+    if mirrored:
+        plane = plane[:, ::-1]
+    return plane
+
+
+class InferenceCache:
+    """
+    LRU cache of model outputs for single positions, keyed by (zobrist hash,
+    next_player, encoder name, model id). Holds at most max_entries outputs and at most
+    max_bytes bytes of output arrays; either bound may be None.
+
+    The key only covers the stones and the player to move, so encoders that read the
+    move history or ko (like the turns-since planes of AlphaGoEncoder) get the output
+    of whichever history was seen first. The model id is id(model).
+
+    With symmetric, positions equal up to rotation and mirroring share an entry: the
+    key uses the smallest hash over all symmetries of the board, and outputs with one
+    value per point are stored in that orientation and turned back on every hit. Only
+    meaningful for models trained to be symmetric.
+
+    hits, misses and evictions count lookups since creation.
+    """
+    def __init__(self, max_entries=1 << 16, max_bytes=None, symmetric=False):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.symmetric = symmetric
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.num_bytes = 0
+        self._entries = OrderedDict()  # key -> (outputs, nbytes)
+
+    def predict(self, model, encoder, game_state):
+        """
+        model.predict for game_state alone: the output row of every model output, a
+        list for models with several outputs, an array otherwise
+        """
+        key, symmetry = self._key(model, encoder, game_state)
+        entry = self._entries.get(key)
+        if entry is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            outputs = entry[0]
+        else:
+            self.misses += 1
+            prediction = model.predict(encoder.encode_batch([game_state]))
+            if isinstance(prediction, (list, tuple)):
+                outputs = [np.array(output[0]) for output in prediction]
+            else:
+                outputs = np.array(prediction[0])
+            if symmetry is not None:
+                outputs = self._map(outputs, encoder, _transform, symmetry)
+            self._store(key, outputs)
+        if symmetry is not None:
+            outputs = self._map(outputs, encoder, _inverse_transform, symmetry)
+        return outputs
+
+    def _key(self, model, encoder, game_state):
+        board = game_state.board
+        if not self.symmetric:
+            board_hash = board.zobrist_hash()
+            symmetry = None
+        else:
+            colors = board.color_array()
+            symmetries = _SYMMETRIES if board.num_rows == board.num_cols else _SYMMETRIES[:4]
+            hashes = zobrist.get_table(board.num_rows, board.num_cols).hash_colors(
+                np.stack([_transform(colors, symmetry) for symmetry in symmetries])
+            )
+            best = int(np.argmin(hashes))
+            board_hash = int(hashes[best])
+            symmetry = symmetries[best]
+        return (board_hash, game_state.next_player, encoder.name(), id(model)), symmetry
+
+    @staticmethod
+    def _map(outputs, encoder, transform, symmetry):
+        shape = (encoder.board_height, encoder.board_width)
+        num_points = shape[0] * shape[1]
+
+        def map_output(output):
+            if output.size != num_points:
+                return output
+            plane = transform(output.reshape(shape), symmetry)
+            return np.ascontiguousarray(plane).reshape(output.shape)
+
+        if isinstance(outputs, list):
+            return [map_output(output) for output in outputs]
+        return map_output(outputs)
+
+    def _store(self, key, outputs):
+        arrays = outputs if isinstance(outputs, list) else [outputs]
+        for output in arrays:
+            # Shared by every hit, must not be changed in place
+            output.flags.writeable = False
+        nbytes = sum(output.nbytes for output in arrays)
+        self._entries[key] = (outputs, nbytes)
+        self.num_bytes += nbytes
+        while self._entries and (
+                (self.max_entries is not None and len(self._entries) > self.max_entries) or
+                (self.max_bytes is not None and self.num_bytes > self.max_bytes)):
+            _, (_, evicted_bytes) = self._entries.popitem(last=False)
+            self.num_bytes -= evicted_bytes
+            self.evictions += 1
+
+    def clear(self):
+        self._entries.clear()
+        self.num_bytes = 0
+
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def __len__(self):
+        return len(self._entries)
@@ -1,4 +1,4 @@
-from dlgo.gotypes import Point
+from dlgo.geometry import get_geometry
 
 
 def is_point_an_eye(board, point, color):
@@ -9,29 +9,17 @@ def is_point_an_eye(board, point, color):
     if board.get(point) is not None:
         return False
 
-    for neighbor in point.neighbors():
-        if board.is_on_grid(neighbor):
-            neighbor_color = board.get(neighbor)
-            if neighbor_color != color:
-                return False
+    geometry = get_geometry(board.num_rows, board.num_cols)
+    for neighbor in geometry.neighbors[point]:
+        neighbor_color = board.get(neighbor)
+        if neighbor_color != color:
+            return False
 
     friendly_corners = 0
-    off_board_corners = 0
-    corners = [
-        Point(point.row - 1, point.col - 1),
-        Point(point.row - 1, point.col + 1),
-        Point(point.row + 1, point.col - 1),
-        Point(point.row + 1, point.col + 1),
-    ]
-    for corner in corners:
-        if board.is_on_grid(corner):
-            corner_color = board.get(corner)
-            if corner_color == color:
-                friendly_corners += 1
-        else:
-            off_board_corners += 1
+    for corner in geometry.diagonals[point]:
+        if board.get(corner) == color:
+            friendly_corners += 1
+    off_board_corners = geometry.off_board_diagonals[point]
     if off_board_corners > 0:
         return off_board_corners + friendly_corners == 4
     return friendly_corners >= 3
-
-
@@ -2,7 +2,7 @@ import random
 
 from dlgo.agent.base import Agent
 from dlgo.agent.helpers import is_point_an_eye
-from dlgo.goboard_slow import Move
+from dlgo.goboard import Move
 from dlgo.gotypes import Point
 
 
@@ -11,13 +11,20 @@ class RandomBot(Agent):
         """
         Choose a random valid move but preserves our own eyes.
         """
-        candidates = []
-        for r in range(1, game_state.board.num_rows + 1):
-            for c in range(1, game_state.board.num_cols + 1):
-                candidate = Point(row=r, col=c)
-                if game_state.is_valid_move(Move.play(candidate))\
-                        and not is_point_an_eye(game_state.board, candidate, game_state.next_player):
-                    candidates.append(candidate)
+        if hasattr(game_state, 'legal_moves'):
+            points = [move.point for move in game_state.legal_moves() if move.is_play]
+        else:
+            # goboard_slow has no legal_moves, check every point
+            points = []
+            for r in range(1, game_state.board.num_rows + 1):
+                for c in range(1, game_state.board.num_cols + 1):
+                    candidate = Point(row=r, col=c)
+                    if game_state.is_valid_move(Move.play(candidate)):
+                        points.append(candidate)
+        candidates = [
+            point for point in points
+            if not is_point_an_eye(game_state.board, point, game_state.next_player)
+        ]
         if not candidates:
             return Move.pass_turn()
         return Move.play(random.choice(candidates))
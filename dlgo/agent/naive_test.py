@@ -0,0 +1,24 @@
+import random
+import unittest
+
+from dlgo import goboard, goboard_fast, goboard_slow
+from dlgo.agent.naive import RandomBot
+
+
+class RandomBotTest(unittest.TestCase):
+    def test_plays_valid_moves_on_every_engine(self):
+        random.seed(7)
+        bot = RandomBot()
+        for engine in (goboard_slow, goboard, goboard_fast):
+            game = engine.GameState.new_game(5)
+            num_moves = 0
+            while not game.is_over() and num_moves < 200:
+                move = bot.select_move(game)
+                self.assertTrue(game.is_valid_move(move), engine.__name__)
+                game = game.apply_move(move)
+                num_moves += 1
+            self.assertTrue(game.is_over(), engine.__name__)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -31,10 +31,12 @@ class PolicyAgent(Agent):
         self._encoder = encoder
         self._collector = None
         self._temperature = 0.0
+        self._inference_cache = None
 
     def predict(self, game_state):
-        encoded_state = self._encoder.encode(game_state)
-        input_tensor = np.array([encoded_state])
+        if self._inference_cache is not None:
+            return self._inference_cache.predict(self._model, self._encoder, game_state)
+        input_tensor = self._encoder.encode_batch([game_state])
         return self._model.predict(input_tensor)[0]
 
     def set_temperature(self, temperature):
@@ -43,18 +45,22 @@ class PolicyAgent(Agent):
     def set_collector(self, collector):
         self._collector = collector
 
+    def set_inference_cache(self, inference_cache):
+        self._inference_cache = inference_cache
+
     def select_move(self, game_state):
         num_moves = self._encoder.board_width * self._encoder.board_height
 
-        board_tensor = self._encoder.encode(game_state)
-        x = np.array([board_tensor])
+        board_tensor = None
+        if self._collector is not None:
+            board_tensor = self._encoder.encode(game_state)
 
         if np.random.random() < self._temperature:
             # Explore random moves.
             move_probs = np.ones(num_moves) / num_moves
         else:
             # Follow our current policy.
-            move_probs = self._model.predict(x)[0]
+            move_probs = self.predict(game_state)
 
         # Prevent move probs from getting stuck at 0 or 1.
         eps = 1e-5
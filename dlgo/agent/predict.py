@@ -11,10 +11,15 @@ class DeepLearningAgent(Agent):
         Agent.__init__(self)
         self.model = model
         self.encoder = encoder
+        self.inference_cache = None
+
+    def set_inference_cache(self, inference_cache):
+        self.inference_cache = inference_cache
 
     def predict(self, game_state):
-        encoded_state = self.encoder.encode(game_state)
-        input_tensor = np.array([encoded_state])
+        if self.inference_cache is not None:
+            return self.inference_cache.predict(self.model, self.encoder, game_state)
+        input_tensor = self.encoder.encode_batch([game_state])
         return self.model.predict(input_tensor)[0]
 
     def select_move(self, game_state):
@@ -2,5 +2,6 @@ from .base import *
 from .oneplane import *
 from .sevenplane import *
 from .simple import *
+from .ladders import *
 from .alphago import *
 from .utils import *
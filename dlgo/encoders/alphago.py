@@ -1,9 +1,14 @@
+from collections import namedtuple
+
+import numpy as np
+
 from dlgo.encoders.base import Encoder
-from dlgo.encoders.utils import is_ladder_escape, is_ladder_capture
+from dlgo.encoders.ladders import LadderReader
+from dlgo.encoders.utils import board_arrays
+from dlgo.geometry import get_geometry
 from dlgo.gotypes import Point, Player
-from dlgo.goboard import Move
+from dlgo.goboard import EMPTY
 from dlgo.agent.helpers import is_point_an_eye
-import numpy as np
 
 """
 Feature name            num of planes   Description
@@ -40,89 +45,190 @@ def offset(feature):
     return FEATURE_OFFSETS[feature]
 
 
+_MoveAnalysis = namedtuple('_MoveAnalysis', [
+    'legal', 'sensible', 'liberties_after', 'capture_size', 'self_atari_size',
+    'ladder_capture_candidates', 'ladder_escape_candidates',
+])
+
+
+def _analyze_moves(game_state, colors, ko):
+    """
+    What a play of next_player would do on every point, as (num_rows, num_cols) arrays,
+    from the strings next to each empty point. colors and ko are from board_arrays.
+    - legal: game_state.is_valid_move, sensible: legal and not filling an own eye
+    - liberties_after: liberties of the player's string through the point after the
+      move, capture_size: opponent stones it takes, self_atari_size: stones of that
+      string if it is left in atari. All three are 0 on illegal points.
+    - ladder_capture_candidates / ladder_escape_candidates: legal points next to an
+      opponent string with two liberties / next to a string in atari
+    """
+    board = game_state.board
+    player = game_state.next_player
+    shape = colors.shape
+    legal = np.zeros(shape, dtype=bool)
+    sensible = np.zeros(shape, dtype=bool)
+    liberties_after = np.zeros(shape, dtype=np.int16)
+    capture_size = np.zeros(shape, dtype=np.int16)
+    self_atari_size = np.zeros(shape, dtype=np.int16)
+    ladder_capture_candidates = np.zeros(shape, dtype=bool)
+    ladder_escape_candidates = np.zeros(shape, dtype=bool)
+    analysis = _MoveAnalysis(legal, sensible, liberties_after, capture_size, self_atari_size,
+                             ladder_capture_candidates, ladder_escape_candidates)
+    if game_state.is_over():
+        return analysis
+
+    geometry = get_geometry(board.num_rows, board.num_cols)
+    neighbors = geometry.neighbors
+    num_cols = shape[1]
+    strings = {}  # stone -> GoString, filled as the strings come up
+    for index in np.flatnonzero((colors == EMPTY) & ~ko).tolist():
+        point = geometry.points[index]
+        row, col = divmod(index, num_cols)
+        own_strings = []
+        captured = []
+        new_liberties = set()
+        for neighbor in neighbors[point]:
+            if neighbor in strings:
+                go_string = strings[neighbor]
+            else:
+                go_string = board.get_go_string(neighbor)
+                if go_string is not None:
+                    for stone in go_string.stones:
+                        strings[stone] = go_string
+            if go_string is None:
+                new_liberties.add(neighbor)
+                continue
+            num_liberties = go_string.num_liberties
+            if num_liberties == 1:
+                ladder_escape_candidates[row, col] = True
+            if go_string.color == player:
+                if go_string not in own_strings:
+                    own_strings.append(go_string)
+                    new_liberties |= go_string.liberties
+            elif num_liberties == 1:
+                if go_string not in captured:
+                    captured.append(go_string)
+            elif num_liberties == 2:
+                ladder_capture_candidates[row, col] = True
+        new_liberties.discard(point)
+        string_size = 1 + sum(len(go_string.stones) for go_string in own_strings)
+        if captured:
+            # Captured stones next to the new string become its liberties
+            new_stones = {point}
+            for go_string in own_strings:
+                new_stones |= go_string.stones
+            for go_string in captured:
+                capture_size[row, col] += len(go_string.stones)
+                for stone in go_string.stones:
+                    if any(neighbor in new_stones for neighbor in neighbors[stone]):
+                        new_liberties.add(stone)
+        if not new_liberties:
+            # Self capture
+            capture_size[row, col] = 0
+            continue
+        legal[row, col] = True
+        liberties_after[row, col] = len(new_liberties)
+        if len(new_liberties) == 1:
+            self_atari_size[row, col] = string_size
+        sensible[row, col] = not is_point_an_eye(board, point, player)
+    ladder_capture_candidates &= legal
+    ladder_escape_candidates &= legal
+    return analysis
+
+
+# Code of a value on each of the eight planes of a one-hot feature, see encode()
+_PLANE_CODES = np.arange(1, 9).reshape(8, 1, 1)
+
+
 class AlphaGoEncoder(Encoder):
-    def __init__(self, board_size=(19, 19), use_player_plane=True):
+    """
+    ladder_reader is a LadderReader shared by all encode calls, so its cache carries
+    over between positions. By default every encode or encode_batch call reads with a
+    fresh one.
+    """
+    def __init__(self, board_size=(19, 19), use_player_plane=True, ladder_reader=None):
         self.board_width, self.board_height = board_size
         self.use_player_plane = use_player_plane
         self.num_planes = 48 + use_player_plane
+        self.ladder_reader = ladder_reader
 
     def name(self):
         return 'alphago'
 
     def encode(self, game_state):
+        """
+        Builds all planes from one snapshot of the board and one pass over the empty
+        points (see _analyze_moves), so no move is ever played on a board copy. Ladders
+        are read by ladder_reader, only where one can start: next to an opponent string
+        with two liberties, or next to a string in atari.
+        The one-hot features use their planes for 1 to 8 or more liberties, stones and
+        move ages (see Board.move_ages), and for 0 to 7 or more captured stones.
+        """
         board_tensor = np.zeros((self.num_planes, self.board_height, self.board_width))
-        for r in range(self.board_height):
-            for c in range(self.board_width):
-                point = Point(row=r + 1, col=c + 1)
-
-                go_string = game_state.board.get_go_string(point)
-                if go_string and go_string.color == game_state.next_player:
-                    board_tensor[offset("stone_color")][r][c] = 1
-                elif go_string and go_string.color == game_state.next_player.other:
-                    board_tensor[offset("stone_color") + 1][r][c] = 1
-                else:
-                    board_tensor[offset("stone_color") + 2][r][c] = 1
-
-                board_tensor[offset("ones")] = self.ones()
-                board_tensor[offset("zeros")] = self.zeros()
-
-                if not is_point_an_eye(game_state.board, point, game_state.next_player):
-                    board_tensor[offset("sensibleness")][r][c] = 1
-
-                ages = min(game_state.board.move_ages.get(r, c), 8)
-                if ages > 0:
-                    print(ages)
-                    board_tensor[offset("turns_since") + ages][r][c] = 1
-
-                if game_state.board.get_go_string(point):
-                    liberties = min(game_state.board.get_go_string(point).num_liberties, 8)
-                    board_tensor[offset("liberties") + liberties][r][c] = 1
-
-                move = Move(point)
-                if game_state.is_valid_move(move):
-                    new_state = game_state.apply_move(move)
-                    liberties = min(new_state.board.get_go_string(point).num_liberties, 8)
-                    board_tensor[offset("liberties_after") + liberties][r][c] = 1
-
-                    adjacent_strings = [game_state.board.get_go_string(nb)
-                                        for nb in point.neighbors()]
-                    capture_count = 0
-                    for go_string in adjacent_strings:
-                        other_player = game_state.next_player.other
-                        if go_string and go_string.num_liberties == 1 and go_string.color == other_player:
-                            capture_count += len(go_string.stones)
-                    capture_count = min(capture_count, 8)
-                    board_tensor[offset("capture_size") + capture_count][r][c] = 1
-
-                if go_string and go_string.num_liberties == 1:
-                    go_string = game_state.board.get_go_string(point)
-                    if go_string:
-                        num_atari_stones = min(len(go_string.stones), 8)
-                        board_tensor[offset("self_atari_size") + num_atari_stones][r][c] = 1
-
-                if is_ladder_capture(game_state, point):
-                    board_tensor[offset("ladder_capture")][r][c] = 1
-
-                if is_ladder_escape(game_state, point):
-                    board_tensor[offset("ladder_escape")][r][c] = 1
-
-                if self.use_player_plane:
-                    if game_state.next_player == Player.black:
-                        board_tensor[offset("ones")] = self.ones()
-                    else:
-                        board_tensor[offset("zeros")] = self.zeros()
-
+        self._fill_planes(board_tensor, game_state, self.ladder_reader)
         return board_tensor
 
+    def encode_batch(self, game_states, out=None):
+        """Fills the planes of each state straight into its row of the batch, reading
+        all ladders of the batch with one LadderReader"""
+        out = self.batch_output(len(game_states), out)
+        out[...] = 0
+        reader = self.ladder_reader
+        if reader is None:
+            reader = LadderReader()
+        for board_tensor, game_state in zip(out, game_states):
+            self._fill_planes(board_tensor, game_state, reader)
+        return out
+
+    def _fill_planes(self, board_tensor, game_state, reader):
+        """Sets the planes of game_state in the zeroed board_tensor, reading ladders with
+        reader or a new LadderReader if it is None"""
+        player = game_state.next_player
+        colors, liberties, ko = board_arrays(game_state)
+        moves = _analyze_moves(game_state, colors, ko)
+
+        board_tensor[offset("stone_color")] = colors == player.value
+        board_tensor[offset("stone_color") + 1] = colors == player.other.value
+        board_tensor[offset("stone_color") + 2] = colors == EMPTY
+        board_tensor[offset("ones")] = 1
+        board_tensor[offset("sensibleness")] = moves.sensible
+
+        if hasattr(game_state.board, 'move_ages'):
+            self._one_hot(board_tensor, "turns_since", game_state.board.move_ages())
+        self._one_hot(board_tensor, "liberties", liberties)
+        self._one_hot(board_tensor, "liberties_after", moves.liberties_after)
+        # Shifted by one, so that legal moves capturing nothing land on the first plane
+        self._one_hot(board_tensor, "capture_size", moves.capture_size + moves.legal)
+        self._one_hot(board_tensor, "self_atari_size", moves.self_atari_size)
+
+        capture_candidates = np.argwhere(moves.ladder_capture_candidates).tolist()
+        escape_candidates = np.argwhere(moves.ladder_escape_candidates).tolist()
+        if capture_candidates or escape_candidates:
+            if reader is None:
+                reader = LadderReader()
+            state = reader.mutable_state(game_state)
+            for row, col in capture_candidates:
+                if reader.is_ladder_capture(state, Point(row + 1, col + 1)):
+                    board_tensor[offset("ladder_capture"), row, col] = 1
+            for row, col in escape_candidates:
+                if reader.is_ladder_escape(state, Point(row + 1, col + 1)):
+                    board_tensor[offset("ladder_escape"), row, col] = 1
+
+        if self.use_player_plane and player == Player.black:
+            board_tensor[offset("current_player_color")] = 1
+
+    @staticmethod
+    def _one_hot(board_tensor, feature, values):
+        """Sets the eight planes of feature from values of 1 to 8 or more, 0 sets none"""
+        start = offset(feature)
+        board_tensor[start:start + 8] = np.minimum(values, 8) == _PLANE_CODES
+
     def ones(self):
         return np.ones((1, self.board_height, self.board_width))
 
     def zeros(self):
         return np.zeros((1, self.board_height, self.board_width))
 
-    def capture_size(self, game_state, num_planes=8):
-        pass
-
     def encode_point(self, point):
         return self.board_width * (point.row - 1) + (point.col - 1)
 
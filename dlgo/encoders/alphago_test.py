@@ -0,0 +1,31 @@
+import random
+import unittest
+
+import numpy as np
+
+from dlgo import goboard
+from dlgo.agent.naive import RandomBot
+from dlgo.encoders.alphago import AlphaGoEncoder
+
+
+class AlphaGoEncoderTest(unittest.TestCase):
+    def test_encode_batch_matches_encode(self):
+        random.seed(3)
+        bot = RandomBot()
+        game = goboard.GameState.new_game(9)
+        game_states = []
+        while not game.is_over() and len(game_states) < 120:
+            game_states.append(game)
+            game = game.apply_move(bot.select_move(game))
+        encoder = AlphaGoEncoder((9, 9))
+        expected = np.array([encoder.encode(game_state) for game_state in game_states])
+
+        out = np.ones((len(game_states) + 1,) + encoder.shape(), dtype=np.float32)
+        batch = encoder.encode_batch(game_states, out=out)
+        self.assertEqual(np.float32, batch.dtype)
+        self.assertTrue(np.array_equal(expected, batch))
+        self.assertTrue(np.array_equal(expected, encoder.encode_batch(game_states)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,8 @@
 from abc import ABCMeta, abstractmethod
 import importlib
 
+import numpy as np
+
 
 class Encoder(metaclass=ABCMeta):
     """
@@ -30,6 +32,28 @@ class Encoder(metaclass=ABCMeta):
     def shape(self):
         raise NotImplementedError()
 
+    def encode_batch(self, game_states, out=None):
+        """
+        Encodes game_states into one (N, C, H, W) float32 array, N being
+        len(game_states). out may be a preallocated array with at least N rows of
+        shape(); its first N rows are overwritten and returned. Encoders with a
+        vectorized implementation override this, the default encodes state by state.
+        """
+        out = self.batch_output(len(game_states), out)
+        for i, game_state in enumerate(game_states):
+            out[i] = self.encode(game_state)
+        return out
+
+    def batch_output(self, num_states, out=None):
+        """The first num_states rows of out after checking their shape, or a new
+        float32 array for them if out is None"""
+        shape = (num_states,) + tuple(self.shape())
+        if out is None:
+            return np.empty(shape, dtype=np.float32)
+        if out.shape[0] < num_states or tuple(out.shape[1:]) != shape[1:]:
+            raise ValueError('Output of shape %s has no room for %s' % (out.shape, shape))
+        return out[:num_states]
+
 
 def get_encoder_by_name(name, board_size):
     if isinstance(board_size, int):
@@ -0,0 +1,247 @@
+import threading
+from collections import OrderedDict
+
+from dlgo.encoders.utils import guess_ladder_stones
+from dlgo.goboard import Move
+from dlgo.goboard_fast import MutableGameState
+
+__all__ = [
+    'LadderReader',
+]
+
+# Roles of the string in a cached read: in atari with its owner to move, or just moved
+# with the chaser to move
+CAPTURED = 'captured'
+CHASED = 'chased'
+
+
+class LadderReader:
+    """
+    Reads ladders like is_ladder_capture and is_ladder_escape, playing the moves on
+    one MutableGameState and taking them back instead of copying a board per ply.
+
+    Every read position is cached by (zobrist hash, string id, role), role telling
+    whether the string is in atari with its owner to move or the chaser is to move, so
+    a ladder reached from several candidate points, or read again for the same
+    position, is read once. The key leaves out the history, which only matters through
+    ko, and a ko needs a capture: positions after a capturing move of the read are
+    neither cached nor looked up. Neither are results cut off by max_depth. At most
+    max_entries results are kept, the least recently used go first. Extensions to 1
+    or to 3 and more liberties decide the chase right away, they are counted with
+    Board.num_liberties_after_move instead of being played.
+
+    reads counts is_ladder_capture/is_ladder_escape calls, nodes_searched the moves
+    played during them and cache_hits the positions answered from the cache, all
+    since creation or reset_stats(). Reads from several threads are safe, they take
+    turns on the cache.
+    """
+    def __init__(self, max_depth=50, max_entries=1 << 18):
+        self.max_depth = max_depth
+        self.max_entries = max_entries
+        self._cache = OrderedDict()  # (zobrist hash, string id, role) -> bool
+        self._cutoffs = 0  # reads stopped by max_depth so far
+        self._captures = []  # for every move of the current read, whether it captured
+        self._lock = threading.Lock()
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.reads = 0
+        self.nodes_searched = 0
+        self.cache_hits = 0
+
+    def stats(self):
+        return {
+            'reads': self.reads,
+            'nodes_searched': self.nodes_searched,
+            'cache_hits': self.cache_hits,
+            'cache_entries': len(self._cache),
+        }
+
+    def clear(self):
+        self._cache.clear()
+
+    def is_ladder_capture(self, game_state, candidate):
+        """True if next_player playing candidate ataris an opponent string that can't
+        escape the ladder"""
+        return self._read(True, game_state, candidate)
+
+    def is_ladder_escape(self, game_state, candidate):
+        """True if next_player playing candidate gets an own string in atari out of
+        the ladder"""
+        return self._read(False, game_state, candidate)
+
+    @staticmethod
+    def mutable_state(game_state):
+        """The state to read on: game_state itself if it is a MutableGameState. Reads
+        leave it as they found it, so callers reading many points can convert once."""
+        if isinstance(game_state, MutableGameState):
+            return game_state
+        return MutableGameState.from_game_state(game_state)
+
+    def _read(self, try_capture, game_state, candidate):
+        state = self.mutable_state(game_state)
+        with self._lock:
+            self.reads += 1
+            return self._read_state(try_capture, state, candidate)
+
+    def _read_state(self, try_capture, state, candidate):
+        move = Move.play(candidate)
+        if not self.max_depth or not state.is_valid_move(move):
+            return False
+        ladder_stones = guess_ladder_stones(state, candidate, try_capture)
+        if not try_capture:
+            ladder_stones = self._undecided_escapes(state, candidate, ladder_stones)
+            if ladder_stones is None:
+                return True
+        if not ladder_stones:
+            return False
+        self._play(state, move)
+        try:
+            for ladder_stone in ladder_stones:
+                if try_capture:
+                    if self._is_captured(state, ladder_stone, self.max_depth - 1):
+                        return True
+                elif not self._is_chased_down(state, ladder_stone, self.max_depth - 1):
+                    return True
+            return False
+        finally:
+            self._undo(state)
+
+    @staticmethod
+    def _undecided_escapes(state, candidate, ladder_stones):
+        """The ladder stones whose escape by candidate needs reading, None if one
+        certainly escapes. candidate extends a string to the liberty count of
+        num_liberties_after_move, where 3 or more escape and 1 gets captured."""
+        board = state.board
+        undecided = []
+        num_liberties = None
+        for ladder_stone in ladder_stones:
+            if candidate not in board.get_go_string(ladder_stone).liberties:
+                # Freed by a capture, see how the reading goes
+                undecided.append(ladder_stone)
+                continue
+            if num_liberties is None:
+                num_liberties = board.num_liberties_after_move(state.next_player, candidate)
+            if num_liberties >= 3:
+                return None
+            if num_liberties == 2:
+                undecided.append(ladder_stone)
+        return undecided
+
+    def _is_captured(self, state, ladder_stone, depth):
+        """See utils.is_ladder_captured"""
+        board = state.board
+        go_string = board.get_go_string(ladder_stone)
+        if go_string is None:
+            return True
+        if not depth:
+            self._cutoffs += 1
+            return False
+        key = (board.zobrist_hash(), board.string_id(ladder_stone), CAPTURED)
+        result = self._lookup(key)
+        if result is not None:
+            return result
+        cutoffs = self._cutoffs
+        result = True
+        for point in _escape_candidates(board, go_string):
+            move = Move.play(point)
+            if not state.is_valid_move(move):
+                continue
+            if point in go_string.liberties:
+                # Extending decides the chase by the new liberty count alone, unless
+                # two are left: no need to play it then
+                num_liberties = board.num_liberties_after_move(state.next_player, point)
+                if num_liberties >= 3:
+                    result = False
+                    break
+                if num_liberties <= 1:
+                    continue
+            self._play(state, move)
+            escaped = not self._is_chased_down(state, ladder_stone, depth - 1)
+            self._undo(state)
+            if escaped:
+                result = False
+                break
+        if self._cutoffs == cutoffs:
+            self._store(key, result)
+        return result
+
+    def _is_chased_down(self, state, ladder_stone, depth):
+        """See utils.is_ladder_chased_down"""
+        board = state.board
+        num_liberties = board.num_liberties(ladder_stone)
+        if num_liberties <= 1:
+            return True
+        if num_liberties >= 3:
+            return False
+        if not depth:
+            self._cutoffs += 1
+            return False
+        key = (board.zobrist_hash(), board.string_id(ladder_stone), CHASED)
+        result = self._lookup(key)
+        if result is not None:
+            return result
+        cutoffs = self._cutoffs
+        result = False
+        for point in board.get_go_string(ladder_stone).liberties:
+            move = Move.play(point)
+            if not state.is_valid_move(move):
+                continue
+            self._play(state, move)
+            captured = self._is_captured(state, ladder_stone, depth - 1)
+            self._undo(state)
+            if captured:
+                result = True
+                break
+        if self._cutoffs == cutoffs:
+            self._store(key, result)
+        return result
+
+    def _play(self, state, move):
+        self.nodes_searched += 1
+        self._captures.append(_is_capture(state, move.point))
+        state.play(move)
+
+    def _undo(self, state):
+        self._captures.pop()
+        state.undo()
+
+    def _lookup(self, key):
+        if any(self._captures):
+            return None
+        result = self._cache.get(key)
+        if result is not None:
+            self.cache_hits += 1
+            self._cache.move_to_end(key)
+        return result
+
+    def _store(self, key, result):
+        if any(self._captures):
+            return
+        self._cache[key] = result
+        if len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+
+
+def _is_capture(state, point):
+    """Whether next_player playing point takes an opponent string off the board"""
+    board = state.board
+    opponent = state.next_player.other
+    for neighbor in board.geometry.neighbors[point]:
+        if board.num_liberties(neighbor) == 1 and board.get(neighbor) == opponent:
+            return True
+    return False
+
+
+def _escape_candidates(board, go_string):
+    """utils.escape_candidates, only building the GoStrings of neighbors in atari"""
+    candidates = list(go_string.liberties)
+    neighbors = board.geometry.neighbors
+    opponent = go_string.color.other
+    for stone in go_string.stones:
+        for neighbor in neighbors[stone]:
+            if board.num_liberties(neighbor) == 1 and board.get(neighbor) == opponent:
+                for liberty in board.get_go_string(neighbor).liberties:
+                    if liberty not in candidates:
+                        candidates.append(liberty)
+    return candidates
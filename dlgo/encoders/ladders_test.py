@@ -0,0 +1,52 @@
+import threading
+import unittest
+
+from dlgo import goboard
+from dlgo.encoders.ladders import LadderReader
+from dlgo.encoders.utils import is_ladder_capture
+from dlgo.goboard import Move
+from dlgo.gotypes import Point
+
+
+def ladder_position(white_stone=Point(16, 16)):
+    """White (4, 4) with two liberties in a black net, black to move. White's other
+    stone breaks the ladder if it sits on its path."""
+    game = goboard.GameState.new_game(19)
+    for point in [Point(3, 4), Point(4, 4), Point(4, 3), white_stone, Point(5, 5), Point(17, 3)]:
+        game = game.apply_move(Move.play(point))
+    return game
+
+
+class LadderReaderTest(unittest.TestCase):
+    def test_ladder_capture(self):
+        game = ladder_position()
+        reader = LadderReader()
+        self.assertTrue(reader.is_ladder_capture(game, Point(4, 5)))
+        self.assertEqual(is_ladder_capture(game, Point(4, 5)),
+                         reader.is_ladder_capture(game, Point(4, 5)))
+        self.assertGreater(reader.stats()['nodes_searched'], 0)
+
+    def test_ladder_breaker(self):
+        game = ladder_position(Point(7, 2))
+        self.assertFalse(LadderReader().is_ladder_capture(game, Point(4, 5)))
+        self.assertFalse(is_ladder_capture(game, Point(4, 5)))
+
+    def test_shared_reader_from_threads(self):
+        reader = LadderReader()
+        games = [ladder_position(), ladder_position(Point(7, 2))] * 4
+        expected = [is_ladder_capture(game, Point(4, 5)) for game in games]
+        results = [None] * len(games)
+
+        def read(i):
+            results[i] = reader.is_ladder_capture(games[i], Point(4, 5))
+
+        threads = [threading.Thread(target=read, args=(i,)) for i in range(len(games))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(expected, results)
+
+
+if __name__ == '__main__':
+    unittest.main()
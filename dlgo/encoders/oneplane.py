@@ -1,8 +1,17 @@
 import numpy as np
 
 from dlgo.encoders.base import Encoder
+from dlgo.encoders.utils import board_colors, next_player_values, stack_board_colors
 from dlgo.goboard import Point
 
+# Plane value by the color on a point (EMPTY, black, white), for black and for white
+# to move
+_STONE_VALUES = np.array([
+    [0.0, 0.0, 0.0],
+    [0.0, 1.0, -1.0],
+    [0.0, -1.0, 1.0],
+])
+
 
 class OnePlaneEncoder(Encoder):
     def __init__(self, board_size):
@@ -13,19 +22,14 @@ class OnePlaneEncoder(Encoder):
         return 'oneplane'
 
     def encode(self, game_state):
-        board_matrix = np.zeros(self.shape())
-        next_player = game_state.next_player
-        for r in range(self.board_height):
-            for c in range(self.board_width):
-                p = Point(row=r+1, col=c+1)
-                go_string = game_state.board.get_go_string(p)
-                if go_string is None:
-                    continue
-                if go_string.color == next_player:
-                    board_matrix[0, r, c] = 1
-                else:
-                    board_matrix[0, r, c] = -1
-        return board_matrix
+        colors = board_colors(game_state.board)
+        return _STONE_VALUES[game_state.next_player.value][colors].reshape(self.shape())
+
+    def encode_batch(self, game_states, out=None):
+        out = self.batch_output(len(game_states), out)
+        colors = stack_board_colors(game_states, self.board_height, self.board_width)
+        out[:, 0] = _STONE_VALUES[next_player_values(game_states), colors]
+        return out
 
     def encode_point(self, point):
         """
@@ -1,6 +1,12 @@
 import numpy as np
 from dlgo.encoders.base import Encoder
-from dlgo.goboard import Move, Point
+from dlgo.encoders.utils import board_arrays, next_player_values, stack_board_arrays
+from dlgo.goboard import EMPTY, Point
+
+# Code of a stone on each of the six liberty planes, see encode(). NumPy scalars of
+# the liberties' dtype keep the arithmetic in int16.
+_MAX_LIBERTIES = np.int16(3)
+_LIBERTY_CODES = np.arange(1, 7, dtype=np.int16).reshape(6, 1, 1)
 
 
 class SevenPlaneEncoder(Encoder):
@@ -13,23 +19,27 @@ class SevenPlaneEncoder(Encoder):
 
     def encode(self, game_state):
         board_tensor = np.zeros(self.shape())
-        base_plane = {
-            game_state.next_player: 0,
-            game_state.next_player.other: 3,
-        }
-        for row in range(self.board_height):
-            for col in range(self.board_width):
-                p = Point(row=row + 1, col=col + 1)
-                go_string = game_state.board.get_go_string(p)
-                if go_string is None:
-                    if game_state.does_move_violate_ko(game_state.next_player, Move.play(p)):
-                        board_tensor[6][row][col] = 1
-                else:
-                    liberty_plane = min(3, go_string.num_liberties) - 1
-                    liberty_plane += base_plane[go_string.color]
-                    board_tensor[liberty_plane][row][col] = 1
+        colors, liberties, ko = board_arrays(game_state)
+        # 1 to 3 for stones of the player to move, 4 to 6 for opponent stones, 0 on
+        # empty points
+        codes = np.minimum(liberties, _MAX_LIBERTIES)
+        codes += (colors == game_state.next_player.other.value) * _MAX_LIBERTIES
+        board_tensor[:6] = codes == _LIBERTY_CODES
+        board_tensor[6] = ko
         return board_tensor
 
+    def encode_batch(self, game_states, out=None):
+        out = self.batch_output(len(game_states), out)
+        colors, liberties, ko = stack_board_arrays(
+            game_states, self.board_height, self.board_width)
+        players = next_player_values(game_states)
+        codes = np.minimum(liberties, _MAX_LIBERTIES)
+        # Stones of neither EMPTY nor the player to move are the opponent's
+        codes += ((colors != players) & (colors != EMPTY)) * _MAX_LIBERTIES
+        out[:, :6] = codes[:, np.newaxis] == _LIBERTY_CODES
+        out[:, 6] = ko
+        return out
+
     def encode_point(self, point):
         return self.board_width * (point.row - 1) + point.col + 1
 
@@ -1,8 +1,13 @@
 import numpy as np
 from dlgo.encoders.base import Encoder
-from dlgo.goboard import Move
+from dlgo.encoders.utils import board_arrays, next_player_values, stack_board_arrays
 from dlgo.gotypes import Player, Point
 
+# Code of a stone on each of the eight liberty planes, see encode(). NumPy scalars of
+# the liberties' dtype keep the arithmetic in int16.
+_MAX_LIBERTIES = np.int16(4)
+_LIBERTY_CODES = np.arange(1, 9, dtype=np.int16).reshape(8, 1, 1)
+
 
 class SimpleEncoder(Encoder):
     """
@@ -26,21 +31,27 @@ class SimpleEncoder(Encoder):
             board_tensor[8] = 1
         else:
             board_tensor[9] = 1
-        for r in range(self.board_height):
-            for c in range(self.board_width):
-                p = Point(row=r+1, col=c+1)
-                go_string = game_state.board.get_go_string(p)
-
-                if go_string is None:
-                    if game_state.does_move_violate_ko(game_state.next_player, Move.play(p)):
-                        board_tensor[10][r][c] = 1
-                else:
-                    liberty_plane = min(4, go_string.num_liberties) - 1
-                    if go_string.color == Player.white:
-                        liberty_plane += 4
-                    board_tensor[liberty_plane][r][c] = 1
+        colors, liberties, ko = board_arrays(game_state)
+        # 1 to 4 for black stones, 5 to 8 for white ones, 0 on empty points
+        codes = np.minimum(liberties, _MAX_LIBERTIES)
+        codes += (colors == Player.white.value) * _MAX_LIBERTIES
+        board_tensor[:8] = codes == _LIBERTY_CODES
+        board_tensor[10] = ko
         return board_tensor
 
+    def encode_batch(self, game_states, out=None):
+        out = self.batch_output(len(game_states), out)
+        colors, liberties, ko = stack_board_arrays(
+            game_states, self.board_height, self.board_width)
+        codes = np.minimum(liberties, _MAX_LIBERTIES)
+        codes += (colors == Player.white.value) * _MAX_LIBERTIES
+        out[:, :8] = codes[:, np.newaxis] == _LIBERTY_CODES
+        players = next_player_values(game_states)
+        out[:, 8] = players == Player.black.value
+        out[:, 9] = players == Player.white.value
+        out[:, 10] = ko
+        return out
+
     def encode_point(self, point):
         return self.board_width * (point.row - 1) + point.col - 1
 
@@ -1,4 +1,8 @@
-from dlgo.goboard import Move
+import numpy as np
+
+from dlgo.geometry import get_geometry
+from dlgo.goboard import Move, EMPTY, BORDER
+from dlgo.gotypes import Point
 
 
 def is_ladder_capture(game_state, candidate, recursion_depth=50):
@@ -11,95 +15,212 @@ def is_ladder_escape(game_state, candidate, recursion_depth=50):
 
 def is_ladder(try_capture, game_state, candidate,
               ladder_stones=None, recursion_depth=50):
-    """Ladders are played out in reversed roles, one player tries to capture,
-    the other to escape. We determine the ladder status by recursively calling
-    is_ladder in opposite roles, providing suitable capture or escape candidates.
+    """Ladders are played out in turns, one player ataris the string, the other
+    extends or captures an atari-ing string to escape. We determine the ladder status
+    by reading these moves recursively.
     Arguments:
     try_capture: boolean flag to indicate if you want to capture or escape the ladder
     game_state: current game state, instance of GameState
-    candidate: a move that potentially leads to escaping the ladder or capturing it, instance of Move
-    ladder_stones: the stones to escape or capture, list of Point. Will be inferred if not provided.
-    recursion_depth: when to stop recursively calling this function, integer valued.
-    Returns True if game state is a ladder and try_capture is true (the ladder captures)
-    or if game state is not a ladder and try_capture is false (you can successfully escape)
-    and False otherwise.
+    candidate: the point next_player would play, instance of Point
+    ladder_stones: a stone of every string to capture or escape with, list of Point. Will be inferred if not provided.
+    recursion_depth: when to stop reading, integer valued. A ladder not decided by then counts as escaped.
+    Returns True if try_capture is true and candidate puts one of the strings in atari
+    it can't escape from, or if try_capture is false and candidate gets one of the
+    strings out of atari for good, and False otherwise.
     """
-
-    if not game_state.is_valid_move(Move(candidate)) or not recursion_depth:
+    move = Move.play(candidate)
+    if not recursion_depth or not game_state.is_valid_move(move):
         return False
 
-    next_player = game_state.next_player
-    capture_player = next_player if try_capture else next_player.other
-    escape_player = capture_player.other
-
     if ladder_stones is None:
-        ladder_stones = guess_ladder_stones(game_state, candidate, escape_player)
+        ladder_stones = guess_ladder_stones(game_state, candidate, try_capture)
+    if not ladder_stones:
+        return False
 
+    next_state = game_state.apply_move(move)
     for ladder_stone in ladder_stones:
-        current_state = game_state.apply_move(candidate)
-
         if try_capture:
-            candidates = determine_escape_candidates(
-                game_state, ladder_stone, capture_player)
-            attempted_escapes = [  # now try to escape
-                is_ladder(False, current_state, escape_candidate,
-                          ladder_stone, recursion_depth - 1)
-                for escape_candidate in candidates]
-
-            if not any(attempted_escapes):
-                return True  # if at least one escape fails, we capture
-        else:
-            if count_liberties(current_state, ladder_stone) >= 3:
-                return True  # successful escape
-            if count_liberties(current_state, ladder_stone) == 1:
-                continue  # failed escape, others might still do
-            candidates = liberties(current_state, ladder_stone)
-            attempted_captures = [  # now try to capture
-                is_ladder(True, current_state, capture_candidate,
-                          ladder_stone, recursion_depth - 1)
-                for capture_candidate in candidates]
-            if any(attempted_captures):
-                continue  # failed escape, try others
-            return True  # candidate can't be caught in a ladder, escape.
-    return False  # no captures / no escapes
-
-
-def is_candidate(game_state, move, player):
-    return game_state.next_player == player and \
-        count_liberties(game_state, move) == 2
-
-
-def guess_ladder_stones(game_state, move, escape_player):
-    adjacent_strings = [game_state.board.get_go_string(nb) for nb in move.neighbors() if game_state.board.get_go_string(nb)]
-    if adjacent_strings:
-        string = adjacent_strings[0]
-        neighbors = []
-        for string in adjacent_strings:
-            stones = string.stones
-            for stone in stones:
-                neighbors.append(stone)
-        return [Move(nb) for nb in neighbors if is_candidate(game_state, Move(nb), escape_player)]
+            if is_ladder_captured(next_state, ladder_stone, recursion_depth - 1):
+                return True
+        elif not is_ladder_chased_down(next_state, ladder_stone, recursion_depth - 1):
+            return True
+    return False
+
+
+def guess_ladder_stones(game_state, candidate, try_capture):
+    """For a capture, the opponent strings next to candidate with two liberties. For an
+    escape, the own strings in atari that candidate extends, or frees by capturing."""
+    board = game_state.board
+    player = game_state.next_player
+    neighbors = get_geometry(board.num_rows, board.num_cols).neighbors
+    seen = []
+    ladder_stones = []
+    for neighbor in neighbors[candidate]:
+        go_string = board.get_go_string(neighbor)
+        if go_string is None or go_string in seen:
+            continue
+        seen.append(go_string)
+        if try_capture:
+            if go_string.color == player.other and go_string.num_liberties == 2:
+                ladder_stones.append(neighbor)
+        elif go_string.color == player:
+            if go_string.num_liberties == 1:
+                ladder_stones.append(neighbor)
+        elif go_string.num_liberties == 1:
+            for stone in go_string.stones:
+                for other in neighbors[stone]:
+                    own_string = board.get_go_string(other)
+                    if own_string is not None and own_string.color == player and \
+                            own_string.num_liberties == 1 and own_string not in seen:
+                        seen.append(own_string)
+                        ladder_stones.append(other)
+    return ladder_stones
+
+
+def is_ladder_captured(game_state, ladder_stone, recursion_depth):
+    """The string of ladder_stone is in atari and its owner to move: True if neither
+    extending nor capturing an atari-ing string gets it out of the ladder"""
+    go_string = game_state.board.get_go_string(ladder_stone)
+    if go_string is None:
+        return True
+    if not recursion_depth:
+        return False
+    for point in escape_candidates(game_state, go_string):
+        move = Move.play(point)
+        if game_state.is_valid_move(move) and not is_ladder_chased_down(
+                game_state.apply_move(move), ladder_stone, recursion_depth - 1):
+            return False
+    return True
+
+
+def is_ladder_chased_down(game_state, ladder_stone, recursion_depth):
+    """The owner of ladder_stone's string just moved: True if the opponent, to move,
+    captures it or ataris it into a ladder it can't escape"""
+    go_string = game_state.board.get_go_string(ladder_stone)
+    if go_string is None or go_string.num_liberties == 1:
+        return True
+    if go_string.num_liberties >= 3 or not recursion_depth:
+        return False
+    for point in go_string.liberties:
+        move = Move.play(point)
+        if game_state.is_valid_move(move) and is_ladder_captured(
+                game_state.apply_move(move), ladder_stone, recursion_depth - 1):
+            return True
+    return False
+
+
+def escape_candidates(game_state, go_string):
+    """The liberty of go_string, and the liberties of neighboring strings in atari,
+    which capture them"""
+    board = game_state.board
+    neighbors = get_geometry(board.num_rows, board.num_cols).neighbors
+    candidates = list(go_string.liberties)
+    for stone in go_string.stones:
+        for neighbor in neighbors[stone]:
+            other_string = board.get_go_string(neighbor)
+            if other_string is not None and other_string.color != go_string.color and \
+                    other_string.num_liberties == 1:
+                for liberty in other_string.liberties:
+                    if liberty not in candidates:
+                        candidates.append(liberty)
+    return candidates
+
+
+def count_liberties(game_state, point):
+    go_string = game_state.board.get_go_string(point)
+    if go_string:
+        return go_string.num_liberties
     else:
-        return []
+        return 0
 
 
-def determine_escape_candidates(game_state, move, capture_player):
-    escape_candidates = move.neighbors()
-    for other_ladder_stone in game_state.board.get_go_string(move).stones:
-        for neighbor in other_ladder_stone.neighbors():
-            right_color = game_state.color(neighbor) == capture_player
-            one_liberty = count_liberties(game_state, neighbor) == 1
-            if right_color and one_liberty:
-                escape_candidates.append(liberties(game_state, neighbor))
-    return escape_candidates
+def liberties(game_state, point):
+    return list(game_state.board.get_go_string(point).liberties)
 
 
-def count_liberties(game_state, move):
-    if game_state.board.get_go_string(move):
-        return game_state.board.get_go_string(move).num_liberties
-    else:
-        return 0
+def board_colors(board):
+    """(num_rows, num_cols) int8 array holding EMPTY or Player.value"""
+    if hasattr(board, 'color_array'):
+        return board.color_array()
+    colors = np.zeros((board.num_rows, board.num_cols), dtype=np.int8)
+    for row in range(board.num_rows):
+        for col in range(board.num_cols):
+            stone = board.get(Point(row + 1, col + 1))
+            if stone is not None:
+                colors[row, col] = stone.value
+    return colors
 
 
-def liberties(game_state, move):
-    return list(game_state.board.get_go_string(move).liberties)
+def board_arrays(game_state):
+    """
+    Snapshot of the board for vectorized encoders, as (num_rows, num_cols) arrays:
+    - colors: EMPTY or Player.value
+    - liberties: liberty count of the string on each point, 0 on empty points
+    - ko: True on the empty points where next_player would violate superko, the same
+      answer as game_state.does_move_violate_ko
+    """
+    board = game_state.board
+    if hasattr(board, 'padded_arrays'):
+        padded_colors, padded_liberties = board.padded_arrays()
+    else:
+        padded_colors = np.full((board.num_rows + 2, board.num_cols + 2), BORDER, dtype=np.int8)
+        padded_liberties = np.zeros(padded_colors.shape, dtype=np.int16)
+        for row in range(1, board.num_rows + 1):
+            for col in range(1, board.num_cols + 1):
+                go_string = board.get_go_string(Point(row, col))
+                if go_string is None:
+                    padded_colors[row, col] = EMPTY
+                else:
+                    padded_colors[row, col] = go_string.color.value
+                    padded_liberties[row, col] = go_string.num_liberties
+    colors = padded_colors[1:-1, 1:-1]
+    return colors, padded_liberties[1:-1, 1:-1], _ko_mask(game_state, colors)
+
+
+def stack_board_colors(game_states, num_rows, num_cols):
+    """board_colors() of every game state's board as one (N, num_rows, num_cols) array"""
+    colors = np.empty((len(game_states), num_rows, num_cols), dtype=np.int8)
+    for i, game_state in enumerate(game_states):
+        colors[i] = board_colors(game_state.board)
+    return colors
+
+
+def stack_board_arrays(game_states, num_rows, num_cols):
+    """board_arrays() of every game state, each stacked into an (N, num_rows, num_cols)
+    array"""
+    shape = (len(game_states), num_rows, num_cols)
+    colors = np.empty(shape, dtype=np.int8)
+    liberties = np.empty(shape, dtype=np.int16)
+    ko = np.empty(shape, dtype=bool)
+    for i, game_state in enumerate(game_states):
+        colors[i], liberties[i], ko[i] = board_arrays(game_state)
+    return colors, liberties, ko
+
+
+def next_player_values(game_states):
+    """(N, 1, 1) array of next_player.value, to broadcast against stacked boards"""
+    values = [game_state.next_player.value for game_state in game_states]
+    return np.array(values, dtype=np.int8).reshape(len(game_states), 1, 1)
+
+
+def _ko_mask(game_state, colors):
+    """
+    A move on point p can only bring back an earlier position if that position had a
+    stone of the mover on p. p is empty now, and only captures remove stones, so such a
+    stone was captured there since. Just the points where the board's captured_colors()
+    has the mover's bit get the exact check; boards without it check every empty point.
+    """
+    board = game_state.board
+    player = game_state.next_player
+    ko = np.zeros(colors.shape, dtype=bool)
+    if hasattr(board, 'captured_colors'):
+        candidates = board.captured_colors() & player.value
+        candidates[colors != EMPTY] = 0
+    else:
+        candidates = colors == EMPTY
+    num_cols = colors.shape[1]
+    for index in np.flatnonzero(candidates).tolist():
+        row, col = divmod(index, num_cols)
+        if game_state.does_move_violate_ko(player, Move.play(Point(row + 1, col + 1))):
+            ko[row, col] = True
+    return ko
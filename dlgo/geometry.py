@@ -0,0 +1,79 @@
+import numpy as np
+
+from dlgo.gotypes import Point
+
+__all__ = [
+    'CENTER',
+    'EDGE',
+    'CORNER',
+    'Geometry',
+    'get_geometry',
+]
+
+# Location of a point, by how many of its diagonals fall off the board
+CENTER = 'center'
+EDGE = 'edge'
+CORNER = 'corner'
+
+_geometries = {}
+
+
+class Geometry:
+    """
+    Lookup tables for one board size, built once and shared by every board of that size:
+    - points: on-board points in row-major order, index i is row (i // num_cols) + 1
+    - neighbors / diagonals: point -> tuple of its on-board neighbors / diagonals
+    - off_board_diagonals / location: how many diagonals are off the board, and
+      whether that makes the point a CENTER, EDGE or CORNER point
+    - neighbor_index: (num_points, 4) array of row-major neighbor indices, where
+      off-board neighbors point at index num_points (a sentinel slot)
+    - padded_points: Point for every index of a board padded with a one point border
+      (row * (num_cols + 2) + col), None on the border
+    """
+    def __init__(self, num_rows, num_cols):
+        self.num_rows = num_rows
+        self.num_cols = num_cols
+        self.num_points = num_rows * num_cols
+        self.points = tuple(
+            Point(row, col)
+            for row in range(1, num_rows + 1)
+            for col in range(1, num_cols + 1)
+        )
+        self.on_grid = frozenset(self.points)
+
+        self.neighbors = {}
+        self.diagonals = {}
+        self.off_board_diagonals = {}
+        self.location = {}
+        for point in self.points:
+            self.neighbors[point] = tuple(p for p in point.neighbors() if p in self.on_grid)
+            self.diagonals[point] = tuple(p for p in point.diagonals() if p in self.on_grid)
+            off_board = 4 - len(self.diagonals[point])
+            self.off_board_diagonals[point] = off_board
+            if off_board == 0:
+                self.location[point] = CENTER
+            elif len(self.neighbors[point]) >= 3:
+                self.location[point] = EDGE
+            else:
+                self.location[point] = CORNER
+
+        self.neighbor_index = np.full((self.num_points, 4), self.num_points, dtype=np.intp)
+        for i, point in enumerate(self.points):
+            for j, neighbor in enumerate(self.neighbors[point]):
+                self.neighbor_index[i, j] = self.index(neighbor)
+
+        stride = num_cols + 2
+        self.padded_points = [None] * ((num_rows + 2) * stride)
+        for point in self.points:
+            self.padded_points[point.row * stride + point.col] = point
+
+    def index(self, point):
+        return (point.row - 1) * self.num_cols + point.col - 1
+
+
+def get_geometry(num_rows, num_cols):
+    key = (num_rows, num_cols)
+    geometry = _geometries.get(key)
+    if geometry is None:
+        geometry = _geometries[key] = Geometry(num_rows, num_cols)
+    return geometry
@@ -1,14 +1,49 @@
+import array
 import copy
+
+import numpy as np
+
 from dlgo.gotypes import Player, Point
 from dlgo import zobrist
+from dlgo.geometry import get_geometry
+from dlgo.history import SituationHistory
 
 from .scoring import compute_game_result
 
 
+# Values used by padded_arrays(); stones use Player.value
+EMPTY = 0
+BORDER = 3
+
+
+def non_suicide_mask(colors, liberties, player):
+    """
+    Vectorized part of the legality check. colors and liberties are the padded arrays of
+    Board.padded_arrays(). A point is a candidate if it is empty and has an empty
+    neighbor, connects to a friendly string with a spare liberty or captures an
+    opponent string in atari. Returns a (num_rows, num_cols) bool array.
+    """
+    color = player.value
+    other_color = player.other.value
+    has_liberty = np.zeros(colors[1:-1, 1:-1].shape, dtype=bool)
+    for rows, cols in ((slice(0, -2), slice(1, -1)), (slice(2, None), slice(1, -1)),
+                       (slice(1, -1), slice(0, -2)), (slice(1, -1), slice(2, None))):
+        neighbor_colors = colors[rows, cols]
+        neighbor_liberties = liberties[rows, cols]
+        has_liberty |= neighbor_colors == EMPTY
+        has_liberty |= (neighbor_colors == color) & (neighbor_liberties > 1)
+        has_liberty |= (neighbor_colors == other_color) & (neighbor_liberties == 1)
+    return (colors[1:-1, 1:-1] == EMPTY) & has_liberty
+
+
 class Move:
     """
-    A player can either place a stone, move, or resign
+    A player can either place a stone, move, or resign.
+    Moves are immutable flyweights: Move.play() hands out one instance per point and
+    Move.pass_turn() / Move.resign() always return the same two singletons.
     """
+    __slots__ = ('point', 'is_play', 'is_pass', 'is_resign')
+
     def __init__(self, point=None, is_pass=False, is_resign=False):
         # needs one to be True for the following
         assert (point is not None) ^ is_pass ^ is_resign
@@ -19,21 +54,48 @@ class Move:
 
     @classmethod
     def play(cls, point):
-        return Move(point=point)
+        move = _PLAY_MOVES.get(point)
+        if move is None:
+            move = _PLAY_MOVES[point] = Move(point=point)
+        return move
 
     @classmethod
     def pass_turn(cls):
-        return Move(is_pass=True)
+        return _PASS
 
     @classmethod
     def resign(cls):
-        return Move(is_resign=True)
+        return _RESIGN
+
+    def __eq__(self, other):
+        return isinstance(other, Move) and \
+            self.point == other.point and \
+            self.is_pass == other.is_pass and \
+            self.is_resign == other.is_resign
+
+    def __hash__(self):
+        return hash((self.point, self.is_pass, self.is_resign))
+
+    def __reduce__(self):
+        # Unpickle and deepcopy back to the shared instances
+        if self.is_pass:
+            return Move.pass_turn, ()
+        if self.is_resign:
+            return Move.resign, ()
+        return Move.play, (self.point,)
+
+
+_PLAY_MOVES = {}
+_PASS = Move(is_pass=True)
+_RESIGN = Move(is_resign=True)
 
 
 class GoString:
     """
     Keeps track of a string of stones. Needed to calculate the liberties of stones for computational purposes
     """
+    __slots__ = ('color', 'stones', 'liberties')
+
     def __init__(self, color, stones, liberties):
         self.color = color
         self.stones = frozenset(stones)
@@ -76,6 +138,40 @@ class Board:
         self.num_cols = num_cols
         self._grid = {} # maps Point to GoString
         self._hash = zobrist.EMPTY_BOARD
+        self._hash_codes = zobrist.get_table(num_rows, num_cols).by_point
+        self.geometry = get_geometry(num_rows, num_cols)
+        # Colors padded with a BORDER ring, index row * (num_cols + 2) + col
+        self._colors = bytearray([BORDER]) * ((num_rows + 2) * (num_cols + 2))
+        for point in self.geometry.points:
+            self._colors[point.row * (num_cols + 2) + point.col] = EMPTY
+        # Same layout, Player.value bits of the colors ever captured on each point
+        self._captured = bytearray(len(self._colors))
+        # Same layout, number of the move that placed the stone on each point, counting
+        # from 1. Left stale when a stone is captured, move_ages() masks empty points.
+        self._move_numbers = array.array('I', bytes(4 * len(self._colors)))
+        self._num_moves = 0
+
+    def __deepcopy__(self, memo):
+        # GoStrings are immutable and the geometry tables are shared per board size,
+        # so copying the grid mapping and the color bytes is all a deep copy needs
+        board = Board.__new__(Board)
+        board.__dict__.update(self.__dict__)
+        board._grid = dict(self._grid)
+        board._colors = self._colors[:]
+        board._captured = self._captured[:]
+        board._move_numbers = self._move_numbers[:]
+        return board
+
+    def __getstate__(self):
+        # Leave out the tables shared per board size, __setstate__ looks them up again
+        state = self.__dict__.copy()
+        del state['_hash_codes'], state['geometry']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._hash_codes = zobrist.get_table(self.num_rows, self.num_cols).by_point
+        self.geometry = get_geometry(self.num_rows, self.num_cols)
 
     def place_stone(self, player, point):
         assert self.is_on_grid(point)
@@ -85,9 +181,7 @@ class Board:
         adjacent_same_color = [] # neighbor_strings that are same color
         adjacent_opposite_color = [] # neighbor_strings that are opposite color
         liberties = [] # neighbors that are liberties
-        for neighbor in point.neighbors():
-            if not self.is_on_grid(neighbor):
-                continue
+        for neighbor in self.geometry.neighbors[point]:
             neighbor_string = self._grid.get(neighbor)
             if neighbor_string is None:
                 liberties.append(neighbor)
@@ -105,7 +199,10 @@ class Board:
         for new_string_point in new_string.stones:
             self._grid[new_string_point] = new_string
 
-        self._hash ^= zobrist.HASH_CODE[point, player]
+        self._colors[point.row * (self.num_cols + 2) + point.col] = player.value
+        self._hash ^= self._hash_codes[point][player.value]
+        self._num_moves += 1
+        self._move_numbers[point.row * (self.num_cols + 2) + point.col] = self._num_moves
 
         for other_color_string in adjacent_opposite_color:
             replacement = other_color_string.without_liberty(point)
@@ -123,22 +220,91 @@ class Board:
         Remove strings from grid
         """
         for point in string.stones:
-            for neighbor in point.neighbors():
+            for neighbor in self.geometry.neighbors[point]:
                 neighbor_string = self._grid.get(neighbor)
                 if neighbor_string is None:
                     continue
                 if neighbor_string is not string:
                     self._replace_string(neighbor_string.with_liberty(point))
             self._grid[point] = None
-            self._hash ^= zobrist.HASH_CODE[point, string.color]
+            self._colors[point.row * (self.num_cols + 2) + point.col] = EMPTY
+            self._captured[point.row * (self.num_cols + 2) + point.col] |= string.color.value
+            self._hash ^= self._hash_codes[point][string.color.value]
 
     def zobrist_hash(self):
         return self._hash
 
+    def is_self_capture(self, player, point):
+        """Decides suicide from the neighboring strings without placing the stone"""
+        for neighbor in self.geometry.neighbors[point]:
+            neighbor_string = self._grid.get(neighbor)
+            if neighbor_string is None:
+                return False
+            if neighbor_string.color == player:
+                if neighbor_string.num_liberties > 1:
+                    return False
+            elif neighbor_string.num_liberties == 1:
+                return False
+        return True
+
+    def hash_after_move(self, player, point):
+        """Predicts zobrist_hash() after player plays point, including captures"""
+        next_hash = self._hash ^ self._hash_codes[point][player.value]
+        captured = []
+        for neighbor in self.geometry.neighbors[point]:
+            neighbor_string = self._grid.get(neighbor)
+            if neighbor_string is None or neighbor_string.color == player:
+                continue
+            if neighbor_string.num_liberties == 1 and \
+                    not any(neighbor_string is string for string in captured):
+                captured.append(neighbor_string)
+                for stone in neighbor_string.stones:
+                    next_hash ^= self._hash_codes[stone][neighbor_string.color.value]
+        return next_hash
+
+    def padded_arrays(self):
+        """
+        Returns (colors, liberties) as (num_rows + 2, num_cols + 2) arrays with a BORDER
+        ring. colors holds EMPTY or Player.value, liberties the liberty count of the
+        string on each point (0 for empty points)
+        """
+        colors = self.padded_colors()
+        liberties = np.zeros(colors.shape, dtype=np.int16)
+        for point, string in self._grid.items():
+            if string is not None:
+                liberties[point.row, point.col] = string.num_liberties
+        return colors, liberties
+
+    def padded_colors(self):
+        """The colors array of padded_arrays() on its own, without the liberty counts"""
+        colors = np.frombuffer(self._colors, dtype=np.int8)
+        return colors.reshape(self.num_rows + 2, self.num_cols + 2).copy()
+
+    def color_array(self):
+        """(num_rows, num_cols) int8 array holding EMPTY or Player.value"""
+        return self.padded_colors()[1:-1, 1:-1]
+
+    def captured_colors(self):
+        """
+        (num_rows, num_cols) int8 array of the Player.value bits of the colors whose
+        stones were ever captured on each point of this board
+        """
+        captured = np.frombuffer(self._captured, dtype=np.int8)
+        return captured.reshape(self.num_rows + 2, self.num_cols + 2)[1:-1, 1:-1].copy()
+
+    def move_ages(self):
+        """
+        (num_rows, num_cols) array of how many stones were placed on this board since the
+        one on each point, that one included: 1 for the latest stone, 0 on empty points.
+        Passes don't count, they leave the board alone.
+        """
+        colors = self.color_array()
+        move_numbers = np.frombuffer(self._move_numbers, dtype=np.uint32)
+        move_numbers = move_numbers.reshape(self.num_rows + 2, self.num_cols + 2)[1:-1, 1:-1]
+        return np.where(colors != EMPTY, self._num_moves + 1 - move_numbers.astype(np.int64), 0)
+
     def is_on_grid(self, point):
-        valid_row_range = 1 <= point.row <= self.num_rows
-        valid_col_range = 1 <= point.col <= self.num_cols
-        return valid_row_range and valid_col_range
+        return point in self.geometry.on_grid
 
     def get(self, point):
         """Returns the Player if a stone is on point"""
@@ -168,12 +334,14 @@ class GameState:
         self.next_player = next_player
         self.previous_state = previous
         if self.previous_state is None:
-            self.previous_states = frozenset()
+            self.previous_states = SituationHistory()
         else:
-            self.previous_states = frozenset(
-                previous.previous_states | {(previous.next_player, previous.board.zobrist_hash())}
+            # Shares all but a few trie nodes with the previous state's history
+            self.previous_states = previous.previous_states.add(
+                (previous.next_player, previous.board.zobrist_hash())
             )
         self.last_move = move
+        self._legal_points = None
 
     def apply_move(self, move):
         if move.is_play:
@@ -181,14 +349,14 @@ class GameState:
             next_board.place_stone(self.next_player, move.point)
         else:
             next_board = self.board
-        return GameState(next_board, self.next_player.other, self, move)
+        return type(self)(next_board, self.next_player.other, self, move)
 
     @classmethod
     def new_game(cls, board_size):
         if isinstance(board_size, int):
             board_size = (board_size, board_size)
         board = Board(*board_size)
-        return GameState(board, Player.black, None, None)
+        return cls(board, Player.black, None, None)
 
     def is_over(self):
         if self.last_move is None:
@@ -203,10 +371,7 @@ class GameState:
     def is_move_self_capture(self, player, move):
         if not move.is_play:
             return False
-        next_board = copy.deepcopy(self.board)
-        next_board.place_stone(player, move.point)
-        new_string = next_board.get_go_string(move.point)
-        return new_string.num_liberties == 0
+        return self.board.is_self_capture(player, move.point)
 
     @property
     def situation(self):
@@ -220,9 +385,7 @@ class GameState:
         """
         if not move.is_play:
             return False
-        next_board = copy.deepcopy(self.board)
-        next_board.place_stone(player, move.point)
-        next_situation = (player.other, next_board.zobrist_hash())
+        next_situation = (player.other, self.board.hash_after_move(player, move.point))
         return next_situation in self.previous_states
 
     def is_valid_move(self, move):
@@ -230,19 +393,100 @@ class GameState:
             return False
         if move.is_pass or move.is_resign:
             return True
+        if self._legal_points is not None:
+            return move.point in self._legal_points
         return (
             self.board.get(move.point) is None # point is empty/liberty
             and not self.is_move_self_capture(self.next_player, move)
             and not self.does_move_violate_ko(self.next_player, move)
         )
 
+    def legal_move_mask(self):
+        """
+        Returns a (num_rows, num_cols) bool array, True where next_player may play.
+        Suicide is ruled out for all points at once from the padded arrays; only the
+        remaining candidates get a predicted hash superko lookup.
+        """
+        if self.is_over():
+            return np.zeros((self.board.num_rows, self.board.num_cols), dtype=bool)
+        colors, liberties = self.board.padded_arrays()
+        mask = non_suicide_mask(colors, liberties, self.next_player)
+        if len(self.previous_states):
+            for row, col in zip(*np.nonzero(mask)):
+                point = Point(int(row) + 1, int(col) + 1)
+                if self.does_move_violate_ko(self.next_player, Move.play(point)):
+                    mask[row, col] = False
+        return mask
+
+    def legal_points(self):
+        """
+        Frozenset of the points next_player may play, cached on the state. When the
+        state two plies back (same player to move) has its set cached, only points whose
+        surroundings changed since then are re-checked: the stones played, stones they
+        captured, their neighbors and the liberties of every string touching them, plus
+        every empty point where next_player's stones were ever captured. Only there can
+        a move repeat a position (see encoders.utils._ko_mask), and a board change
+        anywhere can impose or lift such a superko ban.
+        """
+        if self._legal_points is None:
+            self._legal_points = self._compute_legal_points()
+        return self._legal_points
+
+    def _compute_legal_points(self):
+        if self.is_over():
+            return frozenset()
+        grandparent = None
+        if self.previous_state is not None:
+            grandparent = self.previous_state.previous_state
+        if grandparent is None or grandparent._legal_points is None or grandparent.is_over():
+            colors, liberties = self.board.padded_arrays()
+            candidates = non_suicide_mask(colors, liberties, self.next_player)
+            legal_points = set()
+            for row, col in zip(*np.nonzero(candidates)):
+                point = Point(int(row) + 1, int(col) + 1)
+                if not self.does_move_violate_ko(self.next_player, Move.play(point)):
+                    legal_points.add(point)
+            return frozenset(legal_points)
+
+        changed = set(self._changed_points())
+        changed.update(self.previous_state._changed_points())
+        neighbors = self.board.geometry.neighbors
+        affected = set()
+        for point in changed:
+            for nearby in (point, *neighbors[point]):
+                affected.add(nearby)
+                string = self.board.get_go_string(nearby)
+                if string is not None:
+                    affected |= string.liberties
+
+        captured = self.board.captured_colors() & self.next_player.value
+        for row, col in zip(*np.nonzero(captured)):
+            affected.add(Point(int(row) + 1, int(col) + 1))
+
+        legal_points = set(grandparent._legal_points)
+        legal_points -= affected
+        for point in affected:
+            move = Move.play(point)
+            if self.board.get(point) is not None or self.is_move_self_capture(self.next_player, move):
+                continue
+            if not self.does_move_violate_ko(self.next_player, move):
+                legal_points.add(point)
+        return frozenset(legal_points)
+
+    def _changed_points(self):
+        """The point last_move played plus any stones it captured"""
+        if self.last_move is None or not self.last_move.is_play:
+            return []
+        point = self.last_move.point
+        previous_board = self.previous_state.board
+        changed = [point]
+        for neighbor in self.board.geometry.neighbors[point]:
+            if previous_board.get(neighbor) is not None and self.board.get(neighbor) is None:
+                changed.extend(previous_board.get_go_string(neighbor).stones)
+        return changed
+
     def legal_moves(self):
-        moves = []
-        for row in range(1, self.board.num_rows + 1):
-            for col in range(1, self.board.num_cols + 1):
-                move = Move.play(Point(row, col))
-                if self.is_valid_move(move):
-                    moves.append(move)
+        moves = [Move.play(point) for point in self.legal_points()]
         # These two moves are always legal.
         moves.append(Move.pass_turn())
         moves.append(Move.resign())
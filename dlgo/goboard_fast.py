@@ -0,0 +1,619 @@
+import array
+
+import numpy as np
+
+from dlgo.gotypes import Player, Point
+from dlgo import goboard
+from dlgo.goboard import Move, GoString, EMPTY, BORDER, non_suicide_mask
+from dlgo import zobrist
+from dlgo.geometry import get_geometry
+from dlgo.history import SituationHistory
+
+from .scoring import compute_game_result
+
+__all__ = [
+    'Board',
+    'GameState',
+    'GoString',
+    'Move',
+    'MutableGameState',
+]
+
+# Contents of a point in the padded array, next to EMPTY and BORDER
+BLACK = Player.black.value
+WHITE = Player.white.value
+
+COLOR_TO_PLAYER = (None, Player.black, Player.white, None)
+
+_hash_tables = {}
+
+
+def _hash_table(num_rows, num_cols):
+    """
+    Zobrist codes re-keyed by padded point index: table[index][color]
+    """
+    key = (num_rows, num_cols)
+    if key not in _hash_tables:
+        by_point = zobrist.get_table(num_rows, num_cols).by_point
+        geometry = get_geometry(num_rows, num_cols)
+        _hash_tables[key] = [
+            (0, 0, 0) if point is None else by_point[point]
+            for point in geometry.padded_points
+        ]
+    return _hash_tables[key]
+
+
+class Board:
+    """
+    Array-backed board. Points live in a flat array padded with a ring of BORDER
+    cells, so Point(row, col) maps to index row * (num_cols + 2) + col and the
+    neighbors of an index are always index -/+ 1 and index -/+ stride.
+    Every stone carries the id of its string; a string keeps a tuple of its stones
+    and a frozenset of its liberties. Strings are never mutated in place, which
+    makes copy() a handful of shallow list/dict copies (copy-on-write).
+
+    Use it where a search plays many moves from one position: make_move/unmake_move
+    and MutableGameState.play/undo change it in place and take them back, and
+    padded_arrays() reads the encoder snapshots straight from its arrays.
+    """
+    def __init__(self, num_rows, num_cols):
+        self.num_rows = num_rows
+        self.num_cols = num_cols
+        self._stride = num_cols + 2
+        self._colors = bytearray([BORDER]) * ((num_rows + 2) * self._stride)
+        for row in range(1, num_rows + 1):
+            for col in range(1, num_cols + 1):
+                self._colors[row * self._stride + col] = EMPTY
+        # Same layout, Player.value bits of the colors ever captured on each point. Undo
+        # keeps the marks, they only narrow down where a position can repeat
+        self._captured = bytearray(len(self._colors))
+        # Same layout, number of the move that placed the stone on each point, counting
+        # from 1. Left stale when a stone is captured or taken back, move_ages() masks
+        # empty points.
+        self._move_numbers = array.array('I', bytes(4 * len(self._colors)))
+        self._num_moves = 0
+        # 0 means no string. An array rather than a list, so NumPy can read it in place
+        self._string_ids = array.array('H', bytes(2 * len(self._colors)))
+        self._stones = {}  # maps string id to tuple of point indices
+        self._liberties = {}  # maps string id to frozenset of point indices
+        # len() of every liberty set by string id, kept in step for padded_arrays()
+        self._liberty_counts = array.array('h', bytes(2 * len(self._colors)))
+        self._hash_table = _hash_table(num_rows, num_cols)
+        self._hash = zobrist.EMPTY_BOARD
+        self.geometry = get_geometry(num_rows, num_cols)
+        # GoString views by string id, shared between copies and only reused while the
+        # board still holds the very same stones/liberties records
+        self._go_strings = {}
+
+    def copy(self):
+        board = Board.__new__(Board)
+        board.num_rows = self.num_rows
+        board.num_cols = self.num_cols
+        board._stride = self._stride
+        board._colors = self._colors[:]
+        board._captured = self._captured[:]
+        board._move_numbers = self._move_numbers[:]
+        board._num_moves = self._num_moves
+        board._string_ids = self._string_ids[:]
+        board._stones = self._stones.copy()
+        board._liberties = self._liberties.copy()
+        board._liberty_counts = self._liberty_counts[:]
+        board._hash_table = self._hash_table
+        board._hash = self._hash
+        board._go_strings = self._go_strings
+        board.geometry = self.geometry
+        return board
+
+    def __deepcopy__(self, memo):
+        # Strings are immutable, so a shallow copy is already a deep one
+        return self.copy()
+
+    def __getstate__(self):
+        # Leave out the tables shared per board size and the GoString cache,
+        # __setstate__ looks them up again
+        state = self.__dict__.copy()
+        del state['_hash_table'], state['geometry'], state['_go_strings']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._hash_table = _hash_table(self.num_rows, self.num_cols)
+        self.geometry = get_geometry(self.num_rows, self.num_cols)
+        self._go_strings = {}
+
+    @classmethod
+    def from_board(cls, board):
+        """Build an array-backed copy of any board exposing get_go_string()"""
+        if isinstance(board, Board):
+            return board.copy()
+        new_board = cls(board.num_rows, board.num_cols)
+        stride = new_board._stride
+        string_ids = {}  # id() of each GoString met -> its string id
+        for point in new_board.geometry.points:
+            go_string = board.get_go_string(point)
+            if go_string is None:
+                continue
+            index = point.row * stride + point.col
+            color = go_string.color.value
+            string_id = string_ids.get(id(go_string))
+            if string_id is None:
+                # Copy the string record once, from its first stone in point order
+                string_id = string_ids[id(go_string)] = index
+                new_board._stones[string_id] = tuple(
+                    stone.row * stride + stone.col for stone in go_string.stones)
+                liberties = frozenset(
+                    liberty.row * stride + liberty.col for liberty in go_string.liberties)
+                new_board._liberties[string_id] = liberties
+                new_board._liberty_counts[string_id] = len(liberties)
+            new_board._colors[index] = color
+            new_board._string_ids[index] = string_id
+            new_board._hash ^= new_board._hash_table[index][color]
+            new_board._num_moves += 1
+            new_board._move_numbers[index] = new_board._num_moves
+        captured = getattr(board, '_captured', None)
+        if captured is not None:
+            # goboard.Board uses the same padded layout
+            new_board._captured = bytearray(captured)
+        else:
+            # Unknown past, any stone may have been captured anywhere
+            new_board._captured = bytearray([Player.black.value | Player.white.value]) * \
+                len(new_board._captured)
+        move_numbers = getattr(board, '_move_numbers', None)
+        if move_numbers is not None:
+            new_board._move_numbers = move_numbers[:]
+            new_board._num_moves = board._num_moves
+        # Otherwise the stones count as placed in point order
+        return new_board
+
+    def place_stone(self, player, point):
+        self._place_stone(player, point, None)
+
+    def make_move(self, player, point):
+        """
+        Place a stone in place and return a journal entry that unmake_move() uses to
+        restore the board. Strings are immutable, so the entry only holds references
+        to the string records the move replaced, merged or captured.
+        """
+        changes = []
+        previous_hash = self._hash
+        string_id = self._place_stone(player, point, changes)
+        return point.row * self._stride + point.col, string_id, previous_hash, changes
+
+    def unmake_move(self, entry):
+        index, string_id, previous_hash, changes = entry
+        colors = self._colors
+        string_ids = self._string_ids
+        colors[index] = EMPTY
+        string_ids[index] = 0
+        del self._stones[string_id]
+        del self._liberties[string_id]
+        for old_id, color, stones, liberties in reversed(changes):
+            self._stones[old_id] = stones
+            self._liberties[old_id] = liberties
+            self._liberty_counts[old_id] = len(liberties)
+            if color != EMPTY:
+                for stone in stones:
+                    colors[stone] = color
+                    string_ids[stone] = old_id
+        self._hash = previous_hash
+        self._num_moves -= 1
+
+    def _place_stone(self, player, point, changes):
+        """
+        Returns the id of the string the new stone belongs to. If changes is a list, the
+        string records the move overwrites are appended to it as
+        (string id, color to restore or EMPTY, stones, liberties).
+        """
+        assert self.is_on_grid(point)
+        index = point.row * self._stride + point.col
+        assert self._colors[index] == EMPTY
+
+        colors = self._colors
+        string_ids = self._string_ids
+        color = player.value
+        other_color = player.other.value
+
+        # Sort through the neighbors to analyze the situation
+        adjacent_same_color = []
+        adjacent_opposite_color = []
+        liberties = []
+        for neighbor in (index - 1, index + 1, index - self._stride, index + self._stride):
+            neighbor_color = colors[neighbor]
+            if neighbor_color == EMPTY:
+                liberties.append(neighbor)
+            elif neighbor_color == color:
+                string_id = string_ids[neighbor]
+                if string_id not in adjacent_same_color:
+                    adjacent_same_color.append(string_id)
+            elif neighbor_color == other_color:
+                string_id = string_ids[neighbor]
+                if string_id not in adjacent_opposite_color:
+                    adjacent_opposite_color.append(string_id)
+
+        # Go Rules
+        colors[index] = color
+        if adjacent_same_color:
+            # Merge smaller strings into the biggest one, relabeling only their stones
+            adjacent_same_color.sort(key=lambda s: len(self._stones[s]), reverse=True)
+            new_id = adjacent_same_color[0]
+            stones = list(self._stones[new_id])
+            new_liberties = set(self._liberties[new_id])
+            if changes is not None:
+                changes.append((new_id, EMPTY, self._stones[new_id], self._liberties[new_id]))
+            for other_id in adjacent_same_color[1:]:
+                other_stones = self._stones.pop(other_id)
+                other_liberties = self._liberties.pop(other_id)
+                if changes is not None:
+                    changes.append((other_id, color, other_stones, other_liberties))
+                for stone in other_stones:
+                    string_ids[stone] = new_id
+                stones.extend(other_stones)
+                new_liberties |= other_liberties
+            stones.append(index)
+            new_liberties.update(liberties)
+            new_liberties.discard(index)
+            string_ids[index] = new_id
+            self._stones[new_id] = tuple(stones)
+            self._liberties[new_id] = frozenset(new_liberties)
+            self._liberty_counts[new_id] = len(new_liberties)
+        else:
+            new_id = index
+            string_ids[index] = index
+            self._stones[index] = (index,)
+            self._liberties[index] = frozenset(liberties)
+            self._liberty_counts[index] = len(liberties)
+
+        self._hash ^= self._hash_table[index][color]
+        self._num_moves += 1
+        self._move_numbers[index] = self._num_moves
+
+        for other_id in adjacent_opposite_color:
+            old_liberties = self._liberties[other_id]
+            if changes is not None:
+                changes.append((other_id, EMPTY, self._stones[other_id], old_liberties))
+            replacement = old_liberties - {index}
+            if replacement:
+                self._liberties[other_id] = replacement
+                self._liberty_counts[other_id] = len(replacement)
+            else:
+                self._remove_string(other_id, new_id, changes)
+        return new_id
+
+    def _remove_string(self, string_id, new_id=0, changes=None):
+        """
+        Remove strings from grid and hand their points back as liberties
+        """
+        colors = self._colors
+        string_ids = self._string_ids
+        stones = self._stones.pop(string_id)
+        del self._liberties[string_id]
+        color = colors[stones[0]]
+        if changes is not None:
+            # Replace the entry recorded before the liberty was taken with a capture entry
+            changes[-1] = (string_id, color, stones, changes[-1][3])
+        captured = self._captured
+        for stone in stones:
+            colors[stone] = EMPTY
+            captured[stone] |= color
+            string_ids[stone] = 0
+            self._hash ^= self._hash_table[stone][color]
+
+        gained = {}
+        for stone in stones:
+            for neighbor in (stone - 1, stone + 1, stone - self._stride, stone + self._stride):
+                neighbor_id = string_ids[neighbor]
+                if neighbor_id:
+                    gained.setdefault(neighbor_id, []).append(stone)
+        for neighbor_id, points in gained.items():
+            if changes is not None and neighbor_id != new_id \
+                    and not any(change[0] == neighbor_id for change in changes):
+                changes.append((neighbor_id, EMPTY, self._stones[neighbor_id], self._liberties[neighbor_id]))
+            self._liberties[neighbor_id] = self._liberties[neighbor_id].union(points)
+            self._liberty_counts[neighbor_id] = len(self._liberties[neighbor_id])
+
+    def zobrist_hash(self):
+        return self._hash
+
+    def is_self_capture(self, player, point):
+        """Decides suicide from neighbor liberty counts without placing the stone"""
+        index = point.row * self._stride + point.col
+        colors = self._colors
+        color = player.value
+        for neighbor in (index - 1, index + 1, index - self._stride, index + self._stride):
+            neighbor_color = colors[neighbor]
+            if neighbor_color == EMPTY:
+                return False
+            if neighbor_color == BORDER:
+                continue
+            num_liberties = len(self._liberties[self._string_ids[neighbor]])
+            if neighbor_color == color:
+                if num_liberties > 1:
+                    return False
+            elif num_liberties == 1:
+                return False
+        return True
+
+    def num_liberties_after_move(self, player, point):
+        """
+        Predicts num_liberties(point) after player plays the empty point, including the
+        points its captures free next to the new string, without placing the stone
+        """
+        index = point.row * self._stride + point.col
+        colors = self._colors
+        string_ids = self._string_ids
+        color = player.value
+        stride = self._stride
+        liberties = set()
+        own_ids = []
+        captured_ids = []
+        for neighbor in (index - 1, index + 1, index - stride, index + stride):
+            neighbor_color = colors[neighbor]
+            if neighbor_color == EMPTY:
+                liberties.add(neighbor)
+            elif neighbor_color == BORDER:
+                continue
+            else:
+                string_id = string_ids[neighbor]
+                if neighbor_color == color:
+                    if string_id not in own_ids:
+                        own_ids.append(string_id)
+                        liberties |= self._liberties[string_id]
+                elif len(self._liberties[string_id]) == 1 and string_id not in captured_ids:
+                    captured_ids.append(string_id)
+        liberties.discard(index)
+        for string_id in captured_ids:
+            for stone in self._stones[string_id]:
+                for neighbor in (stone - 1, stone + 1, stone - stride, stone + stride):
+                    if neighbor == index or string_ids[neighbor] in own_ids:
+                        liberties.add(stone)
+                        break
+        return len(liberties)
+
+    def hash_after_move(self, player, point):
+        """Predicts zobrist_hash() after player plays point, including captures"""
+        index = point.row * self._stride + point.col
+        colors = self._colors
+        other_color = player.other.value
+        next_hash = self._hash ^ self._hash_table[index][player.value]
+        captured = []
+        for neighbor in (index - 1, index + 1, index - self._stride, index + self._stride):
+            if colors[neighbor] != other_color:
+                continue
+            string_id = self._string_ids[neighbor]
+            if string_id not in captured and len(self._liberties[string_id]) == 1:
+                captured.append(string_id)
+                for stone in self._stones[string_id]:
+                    next_hash ^= self._hash_table[stone][other_color]
+        return next_hash
+
+    def padded_arrays(self):
+        """
+        Returns (colors, liberties) as (num_rows + 2, num_cols + 2) arrays with a BORDER
+        ring. colors holds EMPTY or Player.value, liberties the liberty count of the
+        string on each point (0 for empty points)
+        """
+        colors = self.padded_colors()
+        string_ids = np.frombuffer(self._string_ids, dtype=np.uint16)
+        liberties = np.frombuffer(self._liberty_counts, dtype=np.int16)[string_ids]
+        return colors, liberties.reshape(colors.shape)
+
+    def padded_colors(self):
+        """The colors array of padded_arrays() on its own, without the liberty counts"""
+        colors = np.frombuffer(self._colors, dtype=np.int8)
+        return colors.reshape(self.num_rows + 2, self._stride).copy()
+
+    def color_array(self):
+        """(num_rows, num_cols) int8 array holding EMPTY or Player.value"""
+        return self.padded_colors()[1:-1, 1:-1]
+
+    def captured_colors(self):
+        """
+        (num_rows, num_cols) int8 array of the Player.value bits of the colors whose
+        stones were ever captured on each point of this board
+        """
+        captured = np.frombuffer(self._captured, dtype=np.int8)
+        return captured.reshape(self.num_rows + 2, self._stride)[1:-1, 1:-1].copy()
+
+    def string_id(self, point):
+        """
+        Id of the string on point, 0 if it is empty. An id is the index of one of the
+        string's stones, so (zobrist_hash(), string_id) names a string of a position.
+        """
+        return self._string_ids[point.row * self._stride + point.col]
+
+    def num_liberties(self, point):
+        """Liberty count of the string on point, 0 if it is empty or off the board.
+        Cheaper than get_go_string(point).num_liberties, no GoString gets built."""
+        return self._liberty_counts[self._string_ids[point.row * self._stride + point.col]]
+
+    def move_ages(self):
+        """
+        (num_rows, num_cols) array of how many stones were placed on this board since the
+        one on each point, that one included: 1 for the latest stone, 0 on empty points.
+        Passes don't count, they leave the board alone.
+        """
+        colors = self.color_array()
+        move_numbers = np.frombuffer(self._move_numbers, dtype=np.uint32)
+        move_numbers = move_numbers.reshape(self.num_rows + 2, self._stride)[1:-1, 1:-1]
+        return np.where(colors != EMPTY, self._num_moves + 1 - move_numbers.astype(np.int64), 0)
+
+    def is_on_grid(self, point):
+        return point in self.geometry.on_grid
+
+    def _point(self, index):
+        return self.geometry.padded_points[index]
+
+    def get(self, point):
+        """Returns the Player if a stone is on point"""
+        if not self.is_on_grid(point):
+            return None
+        return COLOR_TO_PLAYER[self._colors[point.row * self._stride + point.col]]
+
+    def get_go_string(self, point):
+        """Returns the entire string if a stone is on point"""
+        if not self.is_on_grid(point):
+            return None
+        string_id = self._string_ids[point.row * self._stride + point.col]
+        if not string_id:
+            return None
+        stones = self._stones[string_id]
+        liberties = self._liberties[string_id]
+        cached = self._go_strings.get(string_id)
+        if cached is not None and cached[0] is stones and cached[1] is liberties:
+            return cached[2]
+        go_string = GoString(
+            COLOR_TO_PLAYER[self._colors[string_id]],
+            [self._point(stone) for stone in stones],
+            [self._point(liberty) for liberty in liberties],
+        )
+        self._go_strings[string_id] = (stones, liberties, go_string)
+        return go_string
+
+
+class GameState(goboard.GameState):
+    """
+    goboard.GameState on top of the array-backed Board; apply_move copies the board
+    with Board.copy() instead of copy.deepcopy()
+    """
+    def apply_move(self, move):
+        if move.is_play:
+            next_board = self.board.copy()
+            next_board.place_stone(self.next_player, move.point)
+        else:
+            next_board = self.board
+        return GameState(next_board, self.next_player.other, self, move)
+
+    @classmethod
+    def new_game(cls, board_size):
+        if isinstance(board_size, int):
+            board_size = (board_size, board_size)
+        board = Board(*board_size)
+        return GameState(board, Player.black, None, None)
+
+
+class MutableGameState:
+    """
+    A game that is advanced with play() and rewound with undo() instead of creating a
+    new GameState per move. Each play() pushes a journal entry holding the board
+    changes, so search code can walk millions of nodes on a single board.
+    """
+    def __init__(self, board, next_player, previous_states=None, last_moves=(None, None)):
+        self.board = board
+        self.next_player = next_player
+        self._previous_states = previous_states if previous_states is not None else SituationHistory()
+        self._situations = {}  # situations reached since construction, with counts
+        self._moves = list(last_moves)
+        self._journal = []
+
+    @classmethod
+    def from_game_state(cls, game_state):
+        second_last_move = None
+        if game_state.previous_state is not None:
+            second_last_move = game_state.previous_state.last_move
+        return cls(
+            Board.from_board(game_state.board),
+            game_state.next_player,
+            game_state.previous_states,
+            (second_last_move, game_state.last_move),
+        )
+
+    @classmethod
+    def new_game(cls, board_size):
+        if isinstance(board_size, int):
+            board_size = (board_size, board_size)
+        return cls(Board(*board_size), Player.black)
+
+    @property
+    def last_move(self):
+        return self._moves[-1]
+
+    def play(self, move):
+        situation = (self.next_player, self.board.zobrist_hash())
+        self._situations[situation] = self._situations.get(situation, 0) + 1
+        entry = None
+        if move.is_play:
+            entry = self.board.make_move(self.next_player, move.point)
+        self._journal.append((situation, entry))
+        self._moves.append(move)
+        self.next_player = self.next_player.other
+
+    def undo(self):
+        """Take back the last move played and return it"""
+        situation, entry = self._journal.pop()
+        if entry is not None:
+            self.board.unmake_move(entry)
+        count = self._situations[situation] - 1
+        if count:
+            self._situations[situation] = count
+        else:
+            del self._situations[situation]
+        self.next_player = self.next_player.other
+        return self._moves.pop()
+
+    def is_over(self):
+        last_move, second_last_move = self._moves[-1], self._moves[-2]
+        if last_move is None:
+            return False
+        if last_move.is_resign:
+            return True
+        if second_last_move is None:
+            return False
+        return last_move.is_pass and second_last_move.is_pass
+
+    def _is_previous_situation(self, situation):
+        return situation in self._situations or situation in self._previous_states
+
+    def is_move_self_capture(self, player, move):
+        if not move.is_play:
+            return False
+        return self.board.is_self_capture(player, move.point)
+
+    def does_move_violate_ko(self, player, move):
+        if not move.is_play:
+            return False
+        next_situation = (player.other, self.board.hash_after_move(player, move.point))
+        return self._is_previous_situation(next_situation)
+
+    def is_valid_move(self, move):
+        if self.is_over():
+            return False
+        if move.is_pass or move.is_resign:
+            return True
+        return (
+            self.board.get(move.point) is None
+            and not self.is_move_self_capture(self.next_player, move)
+            and not self.does_move_violate_ko(self.next_player, move)
+        )
+
+    def legal_move_mask(self):
+        """
+        Returns a (num_rows, num_cols) bool array, True where next_player may play
+        """
+        if self.is_over():
+            return np.zeros((self.board.num_rows, self.board.num_cols), dtype=bool)
+        colors, liberties = self.board.padded_arrays()
+        mask = non_suicide_mask(colors, liberties, self.next_player)
+        for row, col in zip(*np.nonzero(mask)):
+            point = Point(int(row) + 1, int(col) + 1)
+            if self.does_move_violate_ko(self.next_player, Move.play(point)):
+                mask[row, col] = False
+        return mask
+
+    def legal_moves(self):
+        moves = []
+        for row in range(1, self.board.num_rows + 1):
+            for col in range(1, self.board.num_cols + 1):
+                move = Move.play(Point(row, col))
+                if self.is_valid_move(move):
+                    moves.append(move)
+        moves.append(Move.pass_turn())
+        moves.append(Move.resign())
+        return moves
+
+    def winner(self):
+        if not self.is_over():
+            return None
+        if self.last_move.is_resign:
+            return self.next_player
+        game_result = compute_game_result(self)
+        return game_result.winner
@@ -0,0 +1,171 @@
+import copy
+import random
+import unittest
+
+import numpy as np
+
+from dlgo import goboard, goboard_fast, goboard_slow, zobrist
+from dlgo.geometry import get_geometry
+from dlgo.goboard import Move
+from dlgo.gotypes import Player, Point
+from dlgo.scoring import compute_game_result
+
+BOARD_SIZE = 5
+
+
+def snapshot(board):
+    points = get_geometry(board.num_rows, board.num_cols).points
+    return tuple(board.get(point) for point in points)
+
+
+def reference_legal_points(board, player, situations):
+    """Legal points from scratch: place the stone on a deep copy of goboard_slow's
+    board, reject suicide and any (player to move, stones) situation seen before"""
+    points = set()
+    for point in get_geometry(board.num_rows, board.num_cols).points:
+        if board.get(point) is not None:
+            continue
+        next_board = copy.deepcopy(board)
+        next_board.place_stone(player, point)
+        if next_board.get_go_string(point).num_liberties == 0:
+            continue
+        if (player.other, snapshot(next_board)) in situations:
+            continue
+        points.add(point)
+    return points
+
+
+def random_game(seed, max_moves=150):
+    """Moves of a random game with the reference legal points of each position it
+    passed through"""
+    rng = random.Random(seed)
+    board = goboard_slow.Board(BOARD_SIZE, BOARD_SIZE)
+    player = Player.black
+    situations = {(player, snapshot(board))}
+    moves = []
+    legal_points = []
+    while len(moves) < max_moves and not (len(moves) >= 2 and
+                                          moves[-1].is_pass and moves[-2].is_pass):
+        points = reference_legal_points(board, player, situations)
+        legal_points.append(points)
+        if points and rng.random() < 0.97:
+            move = Move.play(rng.choice(sorted(points)))
+            board.place_stone(player, move.point)
+        else:
+            move = Move.pass_turn()
+        moves.append(move)
+        player = player.other
+        situations.add((player, snapshot(board)))
+    return moves, legal_points
+
+
+def played_points(legal_moves):
+    return set(move.point for move in legal_moves if move.is_play)
+
+
+def full_hash(board):
+    colors = np.zeros((board.num_rows, board.num_cols), dtype=np.int8)
+    for point in get_geometry(board.num_rows, board.num_cols).points:
+        stone = board.get(point)
+        if stone is not None:
+            colors[point.row - 1, point.col - 1] = stone.value
+    return int(zobrist.get_table(board.num_rows, board.num_cols).hash_colors(colors))
+
+
+def full_area(board):
+    """Area score (black, white) by flood filling every empty region point by point"""
+    neighbors = get_geometry(board.num_rows, board.num_cols).neighbors
+    area = {Player.black: 0, Player.white: 0}
+    seen = set()
+    for point in get_geometry(board.num_rows, board.num_cols).points:
+        stone = board.get(point)
+        if stone is not None:
+            area[stone] += 1
+            continue
+        if point in seen:
+            continue
+        region = [point]
+        seen.add(point)
+        borders = set()
+        for empty in region:
+            for neighbor in neighbors[empty]:
+                color = board.get(neighbor)
+                if color is not None:
+                    borders.add(color)
+                elif neighbor not in seen:
+                    seen.add(neighbor)
+                    region.append(neighbor)
+        if len(borders) == 1:
+            area[borders.pop()] += len(region)
+    return area[Player.black], area[Player.white]
+
+
+class EngineAgreementTest(unittest.TestCase):
+    def check_state(self, game_state, legal_points):
+        self.assertEqual(legal_points, played_points(game_state.legal_moves()))
+        self.assertEqual(full_hash(game_state.board), game_state.board.zobrist_hash())
+
+    def test_engines_agree_with_reference(self):
+        for seed in range(3):
+            moves, legal_points = random_game(seed)
+            for engine in (goboard, goboard_fast):
+                game = engine.GameState.new_game(BOARD_SIZE)
+                for move, points in zip(moves, legal_points):
+                    self.check_state(game, points)
+                    game = game.apply_move(move)
+                result = compute_game_result(game)
+                self.assertEqual(full_area(game.board), (result.b, result.w))
+
+    def test_mutable_game_state_play_and_undo(self):
+        for seed in range(3):
+            moves, legal_points = random_game(seed)
+            game = goboard_fast.MutableGameState.new_game(BOARD_SIZE)
+            hashes = []
+            for move, points in zip(moves, legal_points):
+                self.check_state(game, points)
+                hashes.append(game.board.zobrist_hash())
+                game.play(move)
+            result = compute_game_result(game)
+            self.assertEqual(full_area(game.board), (result.b, result.w))
+            for move, points, board_hash in reversed(list(zip(moves, legal_points, hashes))):
+                self.assertEqual(move, game.undo())
+                self.assertEqual(board_hash, game.board.zobrist_hash())
+                self.check_state(game, points)
+            self.assertEqual(Player.black, game.next_player)
+            self.assertEqual(zobrist.EMPTY_BOARD, game.board.zobrist_hash())
+
+    def test_cached_legal_points_respect_new_superko_bans(self):
+        # The last capture on (1, 1) makes white (1, 3) repeat a position, a ban
+        # far from both of the last two moves
+        sequence = [(2, 3), (1, 1), (1, 3), (2, 2), None, (1, 2), (2, 3), (1, 3), None,
+                    (2, 3), (2, 1), None, (2, 3), (2, 2), None, (1, 1)]
+        for engine in (goboard, goboard_fast):
+            game = engine.GameState.new_game((2, 3))
+            for point in sequence:
+                game.legal_points()
+                move = Move.pass_turn() if point is None else Move.play(Point(*point))
+                game = game.apply_move(move)
+            move = Move.play(Point(1, 3))
+            self.assertTrue(game.does_move_violate_ko(game.next_player, move))
+            self.assertFalse(game.legal_move_mask()[0, 2])
+            self.assertFalse(game.is_valid_move(move))
+            self.assertNotIn(Point(1, 3), game.legal_points())
+
+    def test_goboard_fast_padded_arrays(self):
+        moves, _ = random_game(5)
+        game = goboard_fast.GameState.new_game(BOARD_SIZE)
+        for move in moves:
+            game = game.apply_move(move)
+            colors, liberties = game.board.padded_arrays()
+            for point in get_geometry(BOARD_SIZE, BOARD_SIZE).points:
+                go_string = game.board.get_go_string(point)
+                if go_string is None:
+                    self.assertEqual(0, colors[point.row, point.col])
+                    self.assertEqual(0, liberties[point.row, point.col])
+                else:
+                    self.assertEqual(go_string.color.value, colors[point.row, point.col])
+                    self.assertEqual(go_string.num_liberties, liberties[point.row, point.col])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -16,12 +16,49 @@ class Player(enum.Enum):
 
 Point_ = namedtuple('Point', ['row', 'col'])
 
+# Interned points keyed by (row, col), pre-built for boards up to 19x19 plus border
+_POINTS = {}
+_NEIGHBORS = {}
+_DIAGONALS = {}
+
 
 class Point(Point_):
+    """
+    Points are interned: Point(row, col) always returns the same instance, so a board
+    coordinate costs one object no matter how many moves, strings or nodes refer to it.
+    neighbors() and diagonals() return tuples computed once per point.
+    """
+    __slots__ = ()
+
+    def __new__(cls, row, col):
+        point = _POINTS.get((row, col))
+        if point is None:
+            point = _POINTS[row, col] = Point_.__new__(cls, row, col)
+        return point
+
     def neighbors(self):
-        return [
-            Point(self.row - 1, self.col),
-            Point(self.row + 1, self.col),
-            Point(self.row, self.col - 1),
-            Point(self.row, self.col + 1),
-        ]
+        neighbors = _NEIGHBORS.get(self)
+        if neighbors is None:
+            neighbors = _NEIGHBORS[self] = (
+                Point(self.row - 1, self.col),
+                Point(self.row + 1, self.col),
+                Point(self.row, self.col - 1),
+                Point(self.row, self.col + 1),
+            )
+        return neighbors
+
+    def diagonals(self):
+        diagonals = _DIAGONALS.get(self)
+        if diagonals is None:
+            diagonals = _DIAGONALS[self] = (
+                Point(self.row - 1, self.col - 1),
+                Point(self.row - 1, self.col + 1),
+                Point(self.row + 1, self.col - 1),
+                Point(self.row + 1, self.col + 1),
+            )
+        return diagonals
+
+
+for _row in range(21):
+    for _col in range(21):
+        Point(_row, _col)
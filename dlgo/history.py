@@ -0,0 +1,104 @@
+__all__ = ['SituationHistory']
+
+_BITS = 4
+_WIDTH = 1 << _BITS
+_MASK = _WIDTH - 1
+_HASH_BITS = 64
+_HASH_MASK = (1 << _HASH_BITS) - 1
+
+
+def _situation_hash(situation):
+    """
+    Deterministic 64 bit key for a (player, zobrist hash) situation, so a history keeps
+    its layout when it is pickled into another process.
+    """
+    player, board_hash = situation
+    return (board_hash ^ (player.value * 0x9E3779B97F4A7C15)) & _HASH_MASK
+
+
+def _push_down(situation, shift):
+    node = [None] * _WIDTH
+    node[(_situation_hash(situation) >> shift) & _MASK] = situation
+    return node
+
+
+def _insert(node, situation, key, shift):
+    """
+    Returns a copy of node with situation added, or None if it is already present.
+    Only the nodes along the path are copied, the rest is shared with the original.
+    """
+    index = (key >> shift) & _MASK
+    slot = node[index]
+    if slot is None:
+        child = situation
+    elif type(slot) is list:
+        child = _insert(slot, situation, key, shift + _BITS)
+        if child is None:
+            return None
+    elif type(slot) is frozenset:
+        # Full 64 bit collision bucket
+        if situation in slot:
+            return None
+        child = slot | {situation}
+    elif slot == situation:
+        return None
+    elif shift + _BITS >= _HASH_BITS:
+        child = frozenset((slot, situation))
+    else:
+        child = _insert(_push_down(slot, shift + _BITS), situation, key, shift + _BITS)
+    new_node = node[:]
+    new_node[index] = child
+    return new_node
+
+
+class SituationHistory:
+    """
+    Persistent set of the (next_player, zobrist hash) situations a game went through.
+    It is a hash trie with 16-way nodes that are never modified after creation, so
+    add() copies a handful of small nodes and shares everything else with the parent
+    state's history. Lookups and inserts touch O(log16 n) nodes, effectively O(1).
+    """
+    __slots__ = ('_root', '_size')
+
+    def __init__(self, root=None, size=0):
+        self._root = root if root is not None else [None] * _WIDTH
+        self._size = size
+
+    def add(self, situation):
+        new_root = _insert(self._root, situation, _situation_hash(situation), 0)
+        if new_root is None:
+            return self
+        return SituationHistory(new_root, self._size + 1)
+
+    def __contains__(self, situation):
+        key = _situation_hash(situation)
+        node = self._root
+        shift = 0
+        while True:
+            slot = node[(key >> shift) & _MASK]
+            if slot is None:
+                return False
+            slot_type = type(slot)
+            if slot_type is list:
+                node = slot
+                shift += _BITS
+            elif slot_type is frozenset:
+                return situation in slot
+            else:
+                return slot == situation
+
+    def __len__(self):
+        return self._size
+
+    def __iter__(self):
+        stack = [self._root]
+        while stack:
+            for slot in stack.pop():
+                if slot is None:
+                    continue
+                if type(slot) is list:
+                    stack.append(slot)
+                elif type(slot) is frozenset:
+                    yield from slot
+                else:
+                    yield slot
@@ -1 +1,6 @@
-from .mcts import *
\ No newline at end of file
+from .mcts import *
+from .playout import *
+from .parallel import *
+from .transposition import *
+from .evaluator import *
+from .alphago import *
@@ -0,0 +1,247 @@
+import functools
+import math
+
+import numpy as np
+
+from dlgo import agent
+from dlgo import encoders
+from dlgo.agent.helpers import is_point_an_eye
+from dlgo.agent.pg import policy_gradient_loss
+from dlgo.agent.predict import DeepLearningAgent
+from dlgo.goboard import Move
+from dlgo.gotypes import Player
+from dlgo.mcts.evaluator import LeafEvaluator
+from dlgo.mcts.playout import simulate_playout
+from dlgo.rl.value import load_value_agent
+from dlgo.utils import kerasutil
+
+__all__ = [
+    'AlphaGoNode',
+    'AlphaGoMCTSAgent',
+    'load_alphago_mcts_agent',
+]
+
+
+class AlphaGoNode(object):
+    """
+    Node of the PUCT search. Expanding a node fixes its candidate moves together with
+    their prior probabilities from the policy network. Visit counts and summed values of
+    the candidates live in NumPy arrays indexed like moves, values being the win
+    probability of the player to move at this node. Child nodes are only created when
+    they are first selected.
+    """
+    __slots__ = ('game_state', 'parent', 'index', 'moves', 'priors', 'children',
+                 'child_visits', 'child_values', 'total_visits')
+
+    def __init__(self, game_state, parent=None, index=0):
+        self.game_state = game_state
+        self.parent = parent
+        self.index = index  # position in the parent's arrays
+        self.moves = None  # set by expand
+        self.priors = None
+        self.children = None
+        self.child_visits = None
+        self.child_values = None
+        self.total_visits = 0
+
+    def is_expanded(self):
+        return self.moves is not None
+
+    def is_terminal(self):
+        return self.game_state.is_over()
+
+    def expand(self, moves, priors):
+        self.moves = moves
+        self.priors = priors
+        self.children = [None] * len(moves)
+        self.child_visits = np.zeros(len(moves))
+        self.child_values = np.zeros(len(moves))
+
+    def select_child(self, c_puct):
+        """Child maximizing Q + U, the PUCT rule of AlphaGo"""
+        visits = self.child_visits
+        q_values = np.divide(self.child_values, visits,
+                             out=np.zeros_like(visits), where=visits > 0)
+        # The +1 lets the priors decide the first visit too
+        u_values = c_puct * self.priors * math.sqrt(self.total_visits + 1) / (1 + visits)
+        index = int(np.argmax(q_values + u_values))
+        child = self.children[index]
+        if child is None:
+            child = AlphaGoNode(self.game_state.apply_move(self.moves[index]), self, index)
+            self.children[index] = child
+        return child
+
+    def add_visits(self, count, black_value=None):
+        """
+        Adds count visits through this node to its parent's arrays, and black_value, the
+        win probability of black, to its value sum if given. A visit whose value hasn't
+        been added yet counts as a virtual loss.
+        """
+        parent = self.parent
+        if parent is None:
+            return
+        parent.child_visits[self.index] += count
+        parent.total_visits += count
+        if black_value is not None:
+            if parent.game_state.next_player == Player.white:
+                black_value = 1.0 - black_value
+            parent.child_values[self.index] += black_value
+
+
+class AlphaGoMCTSAgent(agent.Agent):
+    """
+    Monte Carlo tree search guided by neural networks, after AlphaGo.
+    - Selection follows PUCT: Q + c_puct * P * sqrt(N) / (1 + n).
+    - Expansion takes the priors P from policy_agent's network, over the legal moves
+      that don't fill an own eye (passing only when there are none).
+    - A new leaf is worth (1 - rollout_weight) * value + rollout_weight * rollout, from
+      value_agent's network and a fast playout. Without a value agent only rollouts
+      count, and a rollout_weight of 0 skips the rollouts.
+    Leaves are evaluated through a LeafEvaluator: new leaves queue up until batch_size
+    of them are pending or the oldest has waited timeout_ms, then both networks see
+    one predict call for the batch. Every node on the path to a pending leaf carries
+    virtual_loss visits without value until the leaf's result is backed up, which
+    spreads a batch over different leaves. Selecting a pending leaf again runs the
+    batch right away, the tree has nothing new to offer before the results are in.
+    The move played is the root's most visited one; diagnostics() reports the batch
+    statistics of the evaluator.
+
+    policy_agent and value_agent are a DeepLearningAgent and a ValueAgent, or anything
+    else with a model and an encoder.
+    """
+    def __init__(self, policy_agent, value_agent=None, num_simulations=800, c_puct=5.0,
+                 rollout_weight=0.5, batch_size=8, timeout_ms=None, virtual_loss=1):
+        agent.Agent.__init__(self)
+        if value_agent is None:
+            rollout_weight = 1.0
+        self.policy_agent = policy_agent
+        self.value_agent = value_agent
+        self.num_simulations = num_simulations
+        self.c_puct = c_puct
+        self.rollout_weight = rollout_weight
+        self.virtual_loss = virtual_loss
+        network_agents = [policy_agent]
+        if rollout_weight < 1.0:
+            network_agents.append(value_agent)
+        self.evaluator = LeafEvaluator(network_agents, batch_size, timeout_ms)
+        self._waiting = {}  # pending leaf -> simulations waiting for it
+
+    def select_move(self, game_state):
+        root = AlphaGoNode(game_state)
+        self.search(root)
+        if not root.is_expanded():
+            return Move.pass_turn()
+        return root.moves[int(np.argmax(root.child_visits))]
+
+    def diagnostics(self):
+        return self.evaluator.stats()
+
+    def search(self, root):
+        """Runs num_simulations simulations from root"""
+        if root.is_terminal():
+            return
+        # Expand the root alone, every simulation of the first batch would stop there
+        self._submit(root)
+        self.evaluator.flush()
+        for _ in range(self.num_simulations - 1):
+            leaf = self._select_leaf(root)
+            if leaf.is_terminal():
+                winner = leaf.game_state.winner()
+                self._back_up(leaf, 1.0 if winner == Player.black else 0.0, 1)
+            elif leaf in self._waiting:
+                self._waiting[leaf] += 1
+                self.evaluator.flush()
+            else:
+                self._submit(leaf)
+                self.evaluator.poll()
+        self.evaluator.flush()
+
+    def _select_leaf(self, root):
+        node = root
+        while node.is_expanded() and not node.is_terminal():
+            node = node.select_child(self.c_puct)
+        path = node
+        while path is not None:
+            path.add_visits(self.virtual_loss)
+            path = path.parent
+        return node
+
+    def _submit(self, leaf):
+        self._waiting[leaf] = 1
+        self.evaluator.submit(leaf.game_state, functools.partial(self._on_evaluated, leaf))
+
+    def _on_evaluated(self, leaf, move_probs, net_value=None):
+        leaf.expand(*self._candidates(leaf.game_state, move_probs))
+        net_value = 0.0 if net_value is None else float(net_value[0])
+        black_value = self._leaf_value(leaf.game_state, net_value)
+        self._back_up(leaf, black_value, self._waiting.pop(leaf))
+
+    def _back_up(self, leaf, black_value, num_simulations):
+        """Replaces the virtual losses of num_simulations simulations ending at leaf by
+        real visits worth black_value"""
+        node = leaf
+        while node is not None:
+            for _ in range(num_simulations):
+                node.add_visits(1 - self.virtual_loss, black_value)
+            node = node.parent
+
+    def _candidates(self, game_state, move_probs):
+        """Moves to search from game_state and their priors, renormalized over them"""
+        encoder = self.policy_agent.encoder
+        moves = []
+        indices = []
+        for move in game_state.legal_moves():
+            if not move.is_play:
+                continue
+            if is_point_an_eye(game_state.board, move.point, game_state.next_player):
+                continue
+            moves.append(move)
+            indices.append(encoder.encode_point(move.point))
+        if not moves:
+            return [Move.pass_turn()], np.ones(1)
+        eps = 1e-6
+        priors = np.clip(move_probs[indices], eps, 1 - eps)
+        return moves, priors / np.sum(priors)
+
+    def _leaf_value(self, game_state, net_value):
+        """Win probability of black at a new leaf, net_value being the network's for
+        the player to move"""
+        value = min(max(net_value, 0.0), 1.0)
+        if self.rollout_weight > 0.0:
+            winner = simulate_playout(game_state)
+            rollout = 1.0 if winner == game_state.next_player else 0.0
+            value = (1.0 - self.rollout_weight) * value + self.rollout_weight * rollout
+        if game_state.next_player == Player.white:
+            value = 1.0 - value
+        return value
+
+
+def _load_network_agent(h5file):
+    """DeepLearningAgent for an agent file holding an encoder and a model group, like
+    the ones written by DeepLearningAgent, PolicyAgent and ValueAgent"""
+    model = kerasutil.load_model_from_hdf5_group(
+        h5file['model'],
+        custom_objects={'policy_gradient_loss': policy_gradient_loss}
+    )
+    encoder_name = h5file['encoder'].attrs['name']
+    if not isinstance(encoder_name, str):
+        encoder_name = encoder_name.decode('ascii')
+    board_width = h5file['encoder'].attrs['board_width']
+    board_height = h5file['encoder'].attrs['board_height']
+    encoder = encoders.get_encoder_by_name(
+        encoder_name,
+        (board_width, board_height)
+    )
+    return DeepLearningAgent(model, encoder)
+
+
+def load_alphago_mcts_agent(policy_h5file, value_h5file=None, **kwargs):
+    """
+    AlphaGoMCTSAgent from the h5 files of a policy agent (supervised or reinforced)
+    and optionally a value agent. kwargs go to AlphaGoMCTSAgent.
+    """
+    policy_agent = _load_network_agent(policy_h5file)
+    value_agent = None
+    if value_h5file is not None:
+        value_agent = load_value_agent(value_h5file)
+    return AlphaGoMCTSAgent(policy_agent, value_agent, **kwargs)
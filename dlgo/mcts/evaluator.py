@@ -0,0 +1,113 @@
+import threading
+import time
+
+__all__ = [
+    'LeafEvaluator',
+]
+
+
+class LeafEvaluator:
+    """
+    Collects positions waiting for network evaluation and runs them through the
+    networks in batches. network_agents are agents with a model and an encoder (like
+    DeepLearningAgent and ValueAgent); every batch is encoded once per encoder and goes
+    through one model.predict per network.
+
+    submit() queues a game state with a callback, which receives the outputs of all
+    networks for it, in order, once its batch is run. A batch runs as soon as
+    batch_size positions are queued, when poll() or submit() find the oldest one has
+    waited timeout_ms milliseconds, or on flush(). Searches keep the virtual loss of a
+    pending leaf until its callback backs up the result.
+
+    Batches, positions, fill_rate (positions per batch over batch_size) and the mean
+    latency from submit to callback are kept until reset_stats(). Submitting from
+    several threads is safe; callbacks run on the thread that triggers the batch.
+    """
+    def __init__(self, network_agents, batch_size=8, timeout_ms=None):
+        self.network_agents = list(network_agents)
+        self.batch_size = batch_size
+        self.timeout_ms = timeout_ms
+        self._pending = []  # (game_state, callback, submit time)
+        self._lock = threading.Lock()
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.batches = 0
+        self.positions = 0
+        self.total_latency = 0.0
+        self.total_predict_time = 0.0
+
+    def __len__(self):
+        return len(self._pending)
+
+    def submit(self, game_state, callback):
+        with self._lock:
+            self._pending.append((game_state, callback, time.perf_counter()))
+            batch = self._take_batch()
+        self._run(batch)
+
+    def poll(self):
+        """Runs the pending positions if they are due"""
+        with self._lock:
+            batch = self._take_batch()
+        self._run(batch)
+
+    def flush(self):
+        """Runs all pending positions now"""
+        while self._pending:
+            with self._lock:
+                batch = self._pending[:self.batch_size]
+                del self._pending[:self.batch_size]
+            self._run(batch)
+
+    def _take_batch(self):
+        pending = self._pending
+        if len(pending) >= self.batch_size or (
+                pending and self.timeout_ms is not None and
+                (time.perf_counter() - pending[0][2]) * 1000.0 >= self.timeout_ms):
+            batch = pending[:self.batch_size]
+            del pending[:self.batch_size]
+            return batch
+        return []
+
+    def _run(self, batch):
+        if not batch:
+            return
+        start = time.perf_counter()
+        game_states = [game_state for game_state, _, _ in batch]
+        tensors = {}
+        outputs = []
+        for network_agent in self.network_agents:
+            encoder = network_agent.encoder
+            if id(encoder) not in tensors:
+                tensors[id(encoder)] = encoder.encode_batch(game_states)
+            outputs.append(network_agent.model.predict(tensors[id(encoder)]))
+        done = time.perf_counter()
+        with self._lock:
+            self.batches += 1
+            self.positions += len(batch)
+            self.total_predict_time += done - start
+            self.total_latency += sum(done - submitted for _, _, submitted in batch)
+        for i, (_, callback, _) in enumerate(batch):
+            callback(*[output[i] for output in outputs])
+
+    @property
+    def fill_rate(self):
+        return self.positions / (self.batches * self.batch_size) if self.batches else 0.0
+
+    @property
+    def mean_latency_ms(self):
+        return 1000.0 * self.total_latency / self.positions if self.positions else 0.0
+
+    @property
+    def mean_predict_ms(self):
+        return 1000.0 * self.total_predict_time / self.batches if self.batches else 0.0
+
+    def stats(self):
+        return {
+            'batches': self.batches,
+            'positions': self.positions,
+            'fill_rate': self.fill_rate,
+            'mean_latency_ms': self.mean_latency_ms,
+            'mean_predict_ms': self.mean_predict_ms,
+        }
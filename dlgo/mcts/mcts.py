@@ -1,40 +1,175 @@
 import random
 import math
+import time
+
+import numpy as np
 
 from dlgo.gotypes import Player
 from dlgo import agent
+from dlgo.geometry import get_geometry
+from dlgo.goboard import Move
+from dlgo.mcts.playout import simulate_playout
+
+
+class NodeStats(object):
+    """
+    Win counts and rollouts of a node. Kept apart from MCTSNode so that nodes of the
+    same situation can share them through a TranspositionTable.
+    """
+    __slots__ = ('win_counts', 'num_rollouts')
+
+    def __init__(self):
+        self.win_counts = {
+            Player.black: 0,
+            Player.white: 0,
+        }
+        self.num_rollouts = 0
+
+
+def pseudo_legal_moves(game_state):
+    """
+    Every empty point plus pass and resign: a superset of the legal moves that takes no
+    legality checks to build
+    """
+    board = game_state.board
+    points = get_geometry(board.num_rows, board.num_cols).points
+    if hasattr(board, 'color_array'):
+        empty = [points[i] for i in np.flatnonzero(board.color_array() == 0).tolist()]
+    else:
+        empty = [point for point in points if board.get(point) is None]
+    moves = [Move.play(point) for point in empty]
+    moves.append(Move.pass_turn())
+    moves.append(Move.resign())
+    return moves
 
 
 class MCTSNode(object):
     """
     Data Structure supporting Monte Carlo Tree Search
+
+    Besides its own NodeStats, a node keeps the visits of its children, and how many of
+    those the player to move here won, in NumPy arrays indexed by child.index, plus
+    their sum in total_visits. select_child scores all children from these arrays at
+    once. With a transposition table a new child's entries start from the shared
+    statistics of its situation.
+
+    Moves are generated lazily: unvisited_moves stays None until the node is first
+    asked for a child, then holds pseudo_legal_moves() in no particular order. Only a
+    candidate drawn for expansion is checked with is_valid_move, illegal ones are
+    dropped as they come up.
     """
-    def __init__(self, game_state, parent=None, move=None):
+    __slots__ = ('game_state', 'parent', 'move', 'stats', 'children', 'unvisited_moves',
+                 '_next_move', 'index', 'child_visits', 'child_wins', 'total_visits')
+
+    def __init__(self, game_state, parent=None, move=None, stats=None):
         self.game_state = game_state
         self.parent = parent
         self.move = move
-        self.win_counts ={
-            Player.black: 0,
-            Player.white: 0,
-        }
-        self.num_rollouts = 0
+        self.stats = stats if stats is not None else NodeStats()
         self.children = []
-        self.unvisited_moves = game_state.legal_moves()
+        self.unvisited_moves = None
+        self._next_move = None  # legal move drawn by can_add_child
+        self.index = 0  # position in the parent's arrays
+        self.child_visits = None  # allocated with the first child
+        self.child_wins = None
+        self.total_visits = 0
+
+    @property
+    def win_counts(self):
+        return self.stats.win_counts
+
+    @property
+    def num_rollouts(self):
+        return self.stats.num_rollouts
 
-    def add_random_child(self):
-        index = random.randint(0, len(self.unvisited_moves) - 1)
-        new_move = self.unvisited_moves.pop(index)
+    def depth(self):
+        depth = 0
+        node = self.parent
+        while node is not None:
+            depth += 1
+            node = node.parent
+        return depth
+
+    def add_random_child(self, transposition_table=None):
+        if not self.can_add_child():
+            raise ValueError('No legal move left to expand')
+        new_move, self._next_move = self._next_move, None
         new_game_state = self.game_state.apply_move(new_move)
-        new_node = MCTSNode(new_game_state, self, new_move)
-        self.children.append(new_node)
+        stats = None
+        if transposition_table is not None:
+            stats = transposition_table.lookup(new_game_state, self.depth() + 1)
+        new_node = MCTSNode(new_game_state, self, new_move, stats)
+        self._attach(new_node)
         return new_node
 
+    def _allocate(self, num_children):
+        """
+        Sizes the child arrays for num_children children plus all that can still come:
+        new children only come from _next_move and unvisited_moves
+        """
+        capacity = num_children + len(self.unvisited_moves or ()) + \
+            (self._next_move is not None)
+        self.child_visits = np.zeros(capacity)
+        self.child_wins = np.zeros(capacity)
+
+    def _attach(self, child):
+        if self.child_visits is None:
+            self._allocate(len(self.children) + 1)
+        child.index = len(self.children)
+        self.children.append(child)
+        self.child_visits[child.index] = child.stats.num_rollouts
+        self.child_wins[child.index] = child.stats.win_counts[self.game_state.next_player]
+        self.total_visits += child.stats.num_rollouts
+
+    def retain_children(self, children):
+        """Drops all children but the given ones, keeping the arrays in step"""
+        visits = self.child_visits
+        wins = self.child_wins
+        indices = [child.index for child in children]
+        self.children = []
+        self.child_visits = None
+        self.total_visits = 0
+        if children:
+            self._allocate(len(children))
+        for child in children:
+            self._attach(child)
+        if visits is not None and children:
+            self.child_visits[:len(children)] = visits[indices]
+            self.child_wins[:len(children)] = wins[indices]
+            self.total_visits = int(visits[indices].sum())
+
     def record_win(self, winner):
-        self.win_counts[winner] += 1
-        self.num_rollouts += 1
+        self.stats.win_counts[winner] += 1
+        self.stats.num_rollouts += 1
+        parent = self.parent
+        if parent is not None:
+            parent.child_visits[self.index] += 1
+            parent.total_visits += 1
+            if winner == parent.game_state.next_player:
+                parent.child_wins[self.index] += 1
+
+    def add_virtual_loss(self, amount):
+        """Counts amount extra rollouts without a win (negative amounts take them back)"""
+        self.stats.num_rollouts += amount
+        parent = self.parent
+        if parent is not None:
+            parent.child_visits[self.index] += amount
+            parent.total_visits += amount
 
     def can_add_child(self):
-        return len(self.unvisited_moves) > 0
+        if self._next_move is None:
+            if self.unvisited_moves is None:
+                self.unvisited_moves = pseudo_legal_moves(self.game_state)
+            moves = self.unvisited_moves
+            while moves:
+                # Swap a random candidate to the end and pop it
+                index = random.randrange(len(moves))
+                moves[index], moves[-1] = moves[-1], moves[index]
+                move = moves.pop()
+                if self.game_state.is_valid_move(move):
+                    self._next_move = move
+                    break
+        return self._next_move is not None
 
     def is_terminal(self):
         return self.game_state.is_over()
@@ -43,40 +178,163 @@ class MCTSNode(object):
         return float(self.win_counts[player]) / float(self.num_rollouts)
 
 
+def situation_key(game_state):
+    """
+    Identifies a position for tree reuse. last_move tells apart states with the same
+    stones and player to move, like a position and the one after two passes.
+    """
+    return (game_state.next_player, game_state.board.zobrist_hash(), game_state.last_move)
+
+
+def child_stats(root):
+    """(move, win counts by player, num_rollouts) for every expanded child of root"""
+    return [
+        (child.move, dict(child.win_counts), child.num_rollouts)
+        for child in root.children
+    ]
+
+
 class MCTSAgent(agent.Agent):
     """
     Monte Carlo Tree Search Bot
+
+    The search runs num_rounds playouts, or as many as fit into time_budget_ms
+    milliseconds, whichever ends first; either budget may be None but not both. Every
+    check_interval rounds it also stops once no other move can overtake the best one
+    in the rounds that are left (see is_decided).
+
+    With reuse_tree the subtree under the selected move is kept after select_move, and
+    the next call continues from the node of its position (found by Zobrist hash, up to
+    two plies down), so its statistics carry over. Everything else is dropped.
+
+    An optional TranspositionTable lets nodes of the same (next_player, zobrist hash)
+    situation, reached by different move orders, share their statistics.
     """
-    def __init__(self, num_rounds, temperature):
+    def __init__(self, num_rounds, temperature, time_budget_ms=None, check_interval=32,
+                 reuse_tree=True, transposition_table=None):
         agent.Agent.__init__(self)
+        if num_rounds is None and time_budget_ms is None:
+            raise ValueError('MCTSAgent needs num_rounds, time_budget_ms or both')
         self.num_rounds = num_rounds
         self.temperature = temperature
+        self.time_budget_ms = time_budget_ms
+        self.check_interval = check_interval
+        self.reuse_tree = reuse_tree
+        self.transposition_table = transposition_table
+        self._last_root = None
 
     def select_move(self, game_state):
-        root = MCTSNode(game_state)
+        root = self.find_root(game_state)
 
         # Only one layer of depth here. Add more for loop to add more depth.
-        for i in range(self.num_rounds):
-            node = root
-            while (not node.can_add_child()) and (not node.is_terminal()):
-                node = self.select_child(node)
-            if node.can_add_child():
-                node = node.add_random_child()
-            # Simulate a rollout here
-            # Explore other heavy rollouts here
-            # - https://fuego.sourceforge.net/
-            # - https://github.com/pasky/pachi
-            winner = self.simulate_random_game(node.game_state)
-
-            # Propagate scores back up the tree
-            while node is not None:
-                node.record_win(winner)
-                node = node.parent
+        self.search(root)
+
+        move = self.choose_move(game_state, child_stats(root))
+        self.keep_subtree(root, move)
+        return move
+
+    def find_root(self, game_state):
+        """
+        Node for game_state from the tree kept by the previous select_move: the old root
+        itself, the child of the move played, or the grandchild of the reply. Falls back
+        to a fresh MCTSNode.
+        """
+        last_root, self._last_root = self._last_root, None
+        if last_root is not None:
+            key = situation_key(game_state)
+            nodes = [last_root]
+            for _ in range(3):
+                for node in nodes:
+                    if situation_key(node.game_state) == key:
+                        # Cut the path back up, so the rest of the old tree is freed
+                        node.parent = None
+                        return node
+                nodes = [child for node in nodes for child in node.children]
+        stats = None
+        if self.transposition_table is not None:
+            stats = self.transposition_table.lookup(game_state, 0)
+        return MCTSNode(game_state, stats=stats)
+
+    def keep_subtree(self, root, move):
+        """Remember root for the next find_root, with only the child of move under it"""
+        if self.reuse_tree:
+            root.retain_children([child for child in root.children if child.move == move])
+            self._last_root = root
 
+    def search(self, root):
+        """Runs rounds on root until a budget runs out or the best move is decided"""
+        if self.transposition_table is not None:
+            self.transposition_table.new_search()
+        start = time.perf_counter()
+        deadline = None
+        if self.time_budget_ms is not None:
+            deadline = start + self.time_budget_ms / 1000.0
+        rounds = 0
+        while self.num_rounds is None or rounds < self.num_rounds:
+            self.run_round(root)
+            rounds += 1
+            now = time.perf_counter()
+            if deadline is not None and now >= deadline:
+                break
+            if rounds % self.check_interval == 0:
+                remaining = math.inf
+                if self.num_rounds is not None:
+                    remaining = self.num_rounds - rounds
+                if deadline is not None:
+                    # Rounds left at the average speed so far
+                    remaining = min(remaining, (deadline - now) * rounds / (now - start))
+                if self.is_decided(root, remaining):
+                    break
+        return rounds
+
+    @staticmethod
+    def is_decided(root, remaining_rounds):
+        """
+        True if the child with the best win percentage keeps it even when it loses all
+        remaining_rounds playouts while any other child wins all of them.
+        """
+        if root.can_add_child() or not root.children or remaining_rounds == math.inf:
+            return False
+        player = root.game_state.next_player
+        best = max(root.children, key=lambda child: child.winning_frac(player))
+        worst_best = best.win_counts[player] / (best.num_rollouts + remaining_rounds)
+        for child in root.children:
+            if child is best:
+                continue
+            best_other = (child.win_counts[player] + remaining_rounds) / \
+                (child.num_rollouts + remaining_rounds)
+            if best_other >= worst_best:
+                return False
+        return True
+
+    def run_round(self, root):
+        node = root
+        while (not node.can_add_child()) and (not node.is_terminal()):
+            node = self.select_child(node)
+        if node.can_add_child():
+            node = node.add_random_child(self.transposition_table)
+        # Simulate a rollout here
+        # Explore other heavy rollouts here
+        # - https://fuego.sourceforge.net/
+        # - https://github.com/pasky/pachi
+        winner = self.simulate_random_game(node.game_state)
+
+        # Propagate scores back up the tree
+        while node is not None:
+            node.record_win(winner)
+            node = node.parent
+
+    @staticmethod
+    def choose_move(game_state, stats):
+        """
+        Picks the move with the best win percentage for the player to move, from
+        (move, win counts by player, num_rollouts) tuples as returned by child_stats
+        """
         # prepare scores for the next moves
         scored_moves = [
-            (child.winning_frac(game_state.next_player), child.move, child.num_rollouts)
-            for child in root.children
+            (win_counts[game_state.next_player] / num_rollouts, move, num_rollouts)
+            for move, win_counts, num_rollouts in stats
+            if num_rollouts > 0
         ]
         scored_moves.sort(key=lambda x: x[0], reverse=True)
         for s, m, n in scored_moves[:10]:
@@ -85,11 +343,10 @@ class MCTSAgent(agent.Agent):
         # Pick a move based on the scored_moves
         best_move = None
         best_pct = -1.0
-        for child in root.children:
-            child_pct = child.winning_frac(game_state.next_player)
+        for child_pct, move, num_rollouts in scored_moves:
             if child_pct > best_pct:
                 best_pct = child_pct
-                best_move = child.move
+                best_move = move
         print('Select move %s with win pct %.3f' % (best_move, best_pct))
         return best_move
 
@@ -97,33 +354,20 @@ class MCTSAgent(agent.Agent):
         """Select a child according to the upper confidence bound for
         trees (UCT) metric.
         """
-        total_rollouts = sum(child.num_rollouts for child in node.children)
-        log_rollouts = math.log(total_rollouts)
-
-        best_score = -1
-        best_child = None
-        # Loop over each child.
-        for child in node.children:
-            # Calculate the UCT score.
-            win_percentage = child.winning_frac(node.game_state.next_player)
-            exploration_factor = math.sqrt(log_rollouts / child.num_rollouts)
-            uct_score = win_percentage + self.temperature * exploration_factor
-            # Check if this is the largest we've seen so far.
-            if uct_score > best_score:
-                best_score = uct_score
-                best_child = child
-        return best_child
+        num_children = len(node.children)
+        visits = node.child_visits[:num_children]
+        log_rollouts = math.log(node.total_visits)
+
+        # UCT scores of all children at once, argmax keeps the first of equal scores
+        win_percentage = node.child_wins[:num_children] / visits
+        exploration_factor = np.sqrt(log_rollouts / visits)
+        uct_scores = win_percentage + self.temperature * exploration_factor
+        return node.children[int(np.argmax(uct_scores))]
 
     @staticmethod
     def simulate_random_game(game):
-        bots = {
-            Player.black: agent.RandomBot(),
-            Player.white: agent.RandomBot(),
-        }
-        while not game.is_over():
-            bot_move = bots[game.next_player].select_move(game)
-            game = game.apply_move(bot_move)
-        return game.winner()
+        # Light playout on a compact board, see playout.simulate_playout
+        return simulate_playout(game)
 
 
 
@@ -0,0 +1,30 @@
+import unittest
+
+from dlgo.goboard import GameState
+from dlgo.mcts.mcts import MCTSNode
+
+
+class MCTSNodeTest(unittest.TestCase):
+    def test_retain_children_with_pending_move(self):
+        root = MCTSNode(GameState.new_game(5))
+        for _ in range(3):
+            root.add_random_child()
+        # Draws the next move into _next_move, like MCTSAgent.is_decided does
+        self.assertTrue(root.can_add_child())
+        kept = root.children[1]
+        kept.record_win(root.game_state.next_player)
+        root.retain_children([kept])
+
+        self.assertEqual([kept], root.children)
+        self.assertEqual(0, kept.index)
+        self.assertEqual(1, root.child_visits[0])
+        self.assertEqual(1, root.child_wins[0])
+        self.assertEqual(1, root.total_visits)
+        while root.can_add_child():
+            root.add_random_child()
+        self.assertEqual(len(root.children), len(set(child.move for child in root.children)))
+        self.assertLessEqual(len(root.children), len(root.child_visits))
+
+
+if __name__ == '__main__':
+    unittest.main()
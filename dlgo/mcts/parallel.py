@@ -0,0 +1,189 @@
+import copy
+import multiprocessing
+import queue
+import random
+import time
+
+from dlgo.mcts.mcts import MCTSAgent, MCTSNode, child_stats
+from dlgo.mcts.playout import simulate_playout
+
+__all__ = [
+    'ParallelMCTSAgent',
+]
+
+ROOT = 'root'
+TREE = 'tree'
+
+
+def detach_game_state(game_state):
+    """
+    Shallow copy of game_state that keeps only one earlier state, so it pickles
+    without the whole chain of previous states. Superko history is kept in full,
+    since previous_states is its own (persistent) structure.
+    """
+    state = copy.copy(game_state)
+    if state.previous_state is not None:
+        # is_over() still needs the previous move
+        state.previous_state = copy.copy(state.previous_state)
+        state.previous_state.previous_state = None
+    return state
+
+
+def _init_worker():
+    # Forked workers inherit the parent's random state, reseed so playouts differ
+    random.seed()
+
+
+def _search_tree(game_state, num_rounds, temperature, time_budget_ms):
+    """Root parallel task: a complete search of its own, returns the root's child stats"""
+    searcher = MCTSAgent(num_rounds, temperature, time_budget_ms)
+    root = MCTSNode(game_state)
+    searcher.search(root)
+    return child_stats(root)
+
+
+def _merge_child_stats(results):
+    merged = {}
+    for stats in results:
+        for move, win_counts, num_rollouts in stats:
+            if move not in merged:
+                merged[move] = (dict(win_counts), num_rollouts)
+            else:
+                total_wins, total_rollouts = merged[move]
+                for player, wins in win_counts.items():
+                    total_wins[player] += wins
+                merged[move] = (total_wins, total_rollouts + num_rollouts)
+    return [(move, wins, rollouts) for move, (wins, rollouts) in merged.items()]
+
+
+class ParallelMCTSAgent(MCTSAgent):
+    """
+    MCTSAgent spreading its rounds over a multiprocessing pool.
+    - mode ROOT: every worker grows an independent tree from the same position with
+      num_rounds / num_workers rounds, and the visit and win counts of the root's
+      children are summed over all trees before picking a move.
+    - mode TREE: the tree lives in this process. Up to num_workers leaves are selected
+      at a time and their playouts run in the pool. Every node on the path to a pending
+      leaf gets virtual_loss extra rollouts without a win, which steers the following
+      selections towards other branches until the real result is backed up.
+    Both modes honor num_rounds and time_budget_ms; only root workers stop early once
+    their best move is decided, since tree mode results arrive out of order.
+    The pool is started on first use and kept for later moves; call close() when done.
+    """
+    def __init__(self, num_rounds, temperature, time_budget_ms=None, num_workers=None,
+                 mode=ROOT, virtual_loss=1, reuse_tree=True, transposition_table=None):
+        # Root mode trees live in the workers, only tree mode can keep its tree or use
+        # a transposition table
+        if mode == ROOT:
+            reuse_tree = False
+            transposition_table = None
+        MCTSAgent.__init__(self, num_rounds, temperature, time_budget_ms,
+                           reuse_tree=reuse_tree, transposition_table=transposition_table)
+        if mode not in (ROOT, TREE):
+            raise ValueError('Unknown parallel MCTS mode: {}'.format(mode))
+        if virtual_loss < 1:
+            # select_child needs rollouts on every child, pending ones included
+            raise ValueError('virtual_loss must be at least 1')
+        self.num_workers = num_workers or multiprocessing.cpu_count()
+        self.mode = mode
+        self.virtual_loss = virtual_loss
+        self._pool = None
+
+    def _get_pool(self):
+        if self._pool is None:
+            self._pool = multiprocessing.Pool(processes=self.num_workers, initializer=_init_worker)
+        return self._pool
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_pool'] = None
+        state['_last_root'] = None
+        state['transposition_table'] = None
+        return state
+
+    def select_move(self, game_state):
+        if self.mode == ROOT:
+            return self.choose_move(game_state, self._root_parallel_search(game_state))
+        root = self.find_root(game_state)
+        self._tree_parallel_search(root)
+        move = self.choose_move(game_state, child_stats(root))
+        self.keep_subtree(root, move)
+        return move
+
+    def _root_parallel_search(self, game_state):
+        state = detach_game_state(game_state)
+        if self.num_rounds is None:
+            worker_rounds = [None] * self.num_workers
+        else:
+            rounds, extra = divmod(self.num_rounds, self.num_workers)
+            worker_rounds = [rounds + (1 if i < extra else 0) for i in range(self.num_workers)]
+        tasks = [
+            (state, rounds, self.temperature, self.time_budget_ms)
+            for rounds in worker_rounds
+            if rounds is None or rounds > 0
+        ]
+        results = self._get_pool().starmap(_search_tree, tasks)
+        return _merge_child_stats(results)
+
+    def _tree_parallel_search(self, root):
+        if self.transposition_table is not None:
+            self.transposition_table.new_search()
+        pool = self._get_pool()
+        finished = queue.Queue()
+        deadline = None
+        if self.time_budget_ms is not None:
+            deadline = time.perf_counter() + self.time_budget_ms / 1000.0
+        started = 0
+        pending = 0
+        while self._can_start(started, deadline) or pending:
+            while self._can_start(started, deadline) and pending < self.num_workers:
+                node = self._select_leaf(root)
+                started += 1
+                if node.is_terminal():
+                    # Nothing to play out, back up the result right away
+                    self._back_up(node, node.game_state.winner(), self.virtual_loss)
+                    continue
+                pool.apply_async(
+                    simulate_playout, (detach_game_state(node.game_state),),
+                    callback=lambda winner, node=node: finished.put((node, winner)),
+                    error_callback=lambda error, node=node: finished.put((node, error)),
+                )
+                pending += 1
+            if pending:
+                node, winner = finished.get()
+                pending -= 1
+                if isinstance(winner, BaseException):
+                    raise winner
+                self._back_up(node, winner, self.virtual_loss)
+
+    def _can_start(self, started, deadline):
+        if self.num_rounds is not None and started >= self.num_rounds:
+            return False
+        # Always start one round, so there is a move to return
+        return deadline is None or started == 0 or time.perf_counter() < deadline
+
+    def _select_leaf(self, root):
+        """Selection and expansion of run_round, adding virtual loss along the path"""
+        node = root
+        while (not node.can_add_child()) and (not node.is_terminal()):
+            node = self.select_child(node)
+        if node.can_add_child():
+            node = node.add_random_child(self.transposition_table)
+        path = node
+        while path is not None:
+            path.add_virtual_loss(self.virtual_loss)
+            path = path.parent
+        return node
+
+    @staticmethod
+    def _back_up(node, winner, virtual_loss):
+        while node is not None:
+            node.add_virtual_loss(-virtual_loss)
+            node.record_win(winner)
+            node = node.parent
@@ -0,0 +1,306 @@
+import random
+
+import numpy as np
+
+from dlgo.geometry import get_geometry
+from dlgo.gotypes import Player
+from dlgo.goboard import EMPTY, BORDER
+from dlgo.scoring import GameResult, evaluate_territory
+
+__all__ = [
+    'PlayoutBoard',
+    'simulate_playout',
+]
+
+# Random picks from the empty point list before falling back to a full scan
+_REJECTION_TRIES = 8
+
+# Player.value of the opponent, by Player.value
+_OTHER_COLOR = (EMPTY, Player.white.value, Player.black.value)
+
+
+class PlayoutBoard:
+    """
+    Compact board for random playouts. Uses the padded layout of goboard_fast.Board
+    (index row * (num_cols + 2) + col inside a BORDER ring), keeps strings as circular
+    linked lists of stones and keeps a live list of empty points to sample moves from.
+
+    Strings count pseudo-liberties, one per (stone, empty neighbor) pair, along with
+    the sum and the sum of squares of those liberty indices. The count is zero exactly
+    when the string is captured, and all pseudo-liberties are the same point (atari)
+    exactly when sum * sum == count * squares, so no liberty set is ever built.
+    Only simple ko is enforced; positional superko is too expensive to track for an
+    estimate of the winner.
+    """
+    def __init__(self, num_rows, num_cols):
+        self.num_rows = num_rows
+        self.num_cols = num_cols
+        self.stride = num_cols + 2
+        size = (num_rows + 2) * self.stride
+        self.colors = bytearray([BORDER]) * size
+        self.heads = [0] * size  # string head of every stone
+        self.next_stones = [0] * size  # next stone in the same string
+        self.sizes = [0] * size  # indexed by head
+        self.liberties = [0] * size  # pseudo-liberties, indexed by head
+        self.liberty_sums = [0] * size
+        self.liberty_squares = [0] * size
+        self.empty = []
+        self.empty_slots = [-1] * size  # position of an empty point in self.empty
+        self.ko = 0  # point banned by simple ko, 0 for none
+        for point in get_geometry(num_rows, num_cols).points:
+            index = point.row * self.stride + point.col
+            self.colors[index] = EMPTY
+            self.empty_slots[index] = len(self.empty)
+            self.empty.append(index)
+
+    @classmethod
+    def from_game_state(cls, game_state):
+        """Compact copy of the board of any engine's GameState, including its ko ban"""
+        board = game_state.board
+        playout_board = cls(board.num_rows, board.num_cols)
+        for point in get_geometry(board.num_rows, board.num_cols).points:
+            color = board.get(point)
+            if color is not None:
+                playout_board.play(color.value, point.row * playout_board.stride + point.col)
+        playout_board.ko = playout_board._ko_point(game_state)
+        return playout_board
+
+    def _ko_point(self, game_state):
+        # The last move took a single stone and now stands alone in atari: retaking
+        # at the captured point right away is a simple ko
+        move = game_state.last_move
+        previous = game_state.previous_state
+        if move is None or not move.is_play or previous is None:
+            return 0
+        index = move.point.row * self.stride + move.point.col
+        if self.sizes[self.heads[index]] != 1 or self.liberties[self.heads[index]] != 1:
+            return 0
+        padded_points = get_geometry(self.num_rows, self.num_cols).padded_points
+        captured = []
+        for neighbor in (index - self.stride, index + self.stride, index - 1, index + 1):
+            if self.colors[neighbor] == EMPTY:
+                string = previous.board.get_go_string(padded_points[neighbor])
+                if string is not None:
+                    captured.append((neighbor, len(string.stones)))
+        if len(captured) == 1 and captured[0][1] == 1:
+            return captured[0][0]
+        return 0
+
+    def copy(self):
+        board = PlayoutBoard.__new__(PlayoutBoard)
+        board.__dict__.update(self.__dict__)
+        board.colors = self.colors[:]
+        board.heads = self.heads[:]
+        board.next_stones = self.next_stones[:]
+        board.sizes = self.sizes[:]
+        board.liberties = self.liberties[:]
+        board.liberty_sums = self.liberty_sums[:]
+        board.liberty_squares = self.liberty_squares[:]
+        board.empty = self.empty[:]
+        board.empty_slots = self.empty_slots[:]
+        return board
+
+    def padded_colors(self):
+        """Same array as goboard_fast.Board.padded_colors(), so scoring can read it"""
+        colors = np.frombuffer(self.colors, dtype=np.int8)
+        return colors.reshape(self.num_rows + 2, self.stride).copy()
+
+    def in_atari(self, head):
+        """Whether the string has exactly one liberty"""
+        liberty_sum = self.liberty_sums[head]
+        return liberty_sum * liberty_sum == self.liberties[head] * self.liberty_squares[head]
+
+    def is_legal(self, color, index):
+        """index must be empty. Rejects simple ko and suicide"""
+        if index == self.ko:
+            return False
+        colors = self.colors
+        heads = self.heads
+        for neighbor in (index - self.stride, index + self.stride, index - 1, index + 1):
+            neighbor_color = colors[neighbor]
+            if neighbor_color == EMPTY:
+                return True
+            if neighbor_color == BORDER:
+                continue
+            # index is a liberty of every neighboring string: a friendly string needs
+            # another one, an opponent string without another one is captured
+            if (neighbor_color == color) != self.in_atari(heads[neighbor]):
+                return True
+        return False
+
+    def is_eye(self, color, index):
+        """Same rule as agent.helpers.is_point_an_eye"""
+        colors = self.colors
+        stride = self.stride
+        for neighbor in (index - stride, index + stride, index - 1, index + 1):
+            if colors[neighbor] != color and colors[neighbor] != BORDER:
+                return False
+        friendly_corners = 0
+        off_board_corners = 0
+        for corner in (index - stride - 1, index - stride + 1, index + stride - 1, index + stride + 1):
+            if colors[corner] == color:
+                friendly_corners += 1
+            elif colors[corner] == BORDER:
+                off_board_corners += 1
+        if off_board_corners > 0:
+            return off_board_corners + friendly_corners == 4
+        return friendly_corners >= 3
+
+    def play(self, color, index):
+        """Places a stone of color (Player.value) on the empty point index"""
+        colors = self.colors
+        heads = self.heads
+        next_stones = self.next_stones
+        sizes = self.sizes
+        liberties = self.liberties
+        liberty_sums = self.liberty_sums
+        liberty_squares = self.liberty_squares
+        self._take_empty(index)
+        colors[index] = color
+        heads[index] = index
+        next_stones[index] = index
+        sizes[index] = 1
+        liberties[index] = 0
+        liberty_sums[index] = 0
+        liberty_squares[index] = 0
+        square = index * index
+        neighbors = (index - self.stride, index + self.stride, index - 1, index + 1)
+        for neighbor in neighbors:
+            neighbor_color = colors[neighbor]
+            if neighbor_color == EMPTY:
+                liberties[index] += 1
+                liberty_sums[index] += neighbor
+                liberty_squares[index] += neighbor * neighbor
+            elif neighbor_color != BORDER:
+                head = heads[neighbor]
+                liberties[head] -= 1
+                liberty_sums[head] -= index
+                liberty_squares[head] -= square
+
+        head = index
+        num_captured = 0
+        captured_point = 0
+        for neighbor in neighbors:
+            neighbor_color = colors[neighbor]
+            if neighbor_color == color:
+                other = heads[neighbor]
+                if other != head:
+                    head = self._merge(head, other)
+            elif neighbor_color != EMPTY and neighbor_color != BORDER:
+                if liberties[heads[neighbor]] == 0:
+                    num_captured += sizes[heads[neighbor]]
+                    captured_point = neighbor
+                    self._remove_string(heads[neighbor])
+
+        if num_captured == 1 and sizes[head] == 1 and liberties[head] == 1:
+            self.ko = captured_point
+        else:
+            self.ko = 0
+
+    def _merge(self, head, other):
+        """Joins two strings, relabelling the smaller one. Returns the new head"""
+        heads = self.heads
+        next_stones = self.next_stones
+        if self.sizes[head] < self.sizes[other]:
+            head, other = other, head
+        stone = other
+        while True:
+            heads[stone] = head
+            stone = next_stones[stone]
+            if stone == other:
+                break
+        next_stones[head], next_stones[other] = next_stones[other], next_stones[head]
+        self.sizes[head] += self.sizes[other]
+        self.liberties[head] += self.liberties[other]
+        self.liberty_sums[head] += self.liberty_sums[other]
+        self.liberty_squares[head] += self.liberty_squares[other]
+        return head
+
+    def _remove_string(self, head):
+        colors = self.colors
+        heads = self.heads
+        next_stones = self.next_stones
+        stride = self.stride
+        stones = []
+        stone = head
+        while True:
+            stones.append(stone)
+            colors[stone] = EMPTY
+            stone = next_stones[stone]
+            if stone == head:
+                break
+        for stone in stones:
+            self._add_empty(stone)
+            square = stone * stone
+            for neighbor in (stone - stride, stone + stride, stone - 1, stone + 1):
+                neighbor_color = colors[neighbor]
+                if neighbor_color != EMPTY and neighbor_color != BORDER:
+                    head = heads[neighbor]
+                    self.liberties[head] += 1
+                    self.liberty_sums[head] += stone
+                    self.liberty_squares[head] += square
+
+    def _take_empty(self, index):
+        # Swap the last empty point into the slot of index
+        slot = self.empty_slots[index]
+        last = self.empty.pop()
+        if last != index:
+            self.empty[slot] = last
+            self.empty_slots[last] = slot
+        self.empty_slots[index] = -1
+
+    def _add_empty(self, index):
+        self.empty_slots[index] = len(self.empty)
+        self.empty.append(index)
+
+    def select_move(self, color):
+        """
+        Random legal point that doesn't fill one of color's own eyes, or None to pass.
+        Samples the empty list a few times before scanning all of it.
+        """
+        empty = self.empty
+        if not empty:
+            return None
+        for _ in range(_REJECTION_TRIES):
+            index = empty[int(random.random() * len(empty))]
+            if not self.is_eye(color, index) and self.is_legal(color, index):
+                return index
+        start = random.randrange(len(empty))
+        for i in range(len(empty)):
+            index = empty[(start + i) % len(empty)]
+            if not self.is_eye(color, index) and self.is_legal(color, index):
+                return index
+        return None
+
+
+def simulate_playout(game_state, max_moves=None, komi=7.5):
+    """
+    Plays random moves (never filling own eyes) from game_state until both players
+    pass or max_moves moves were played (default 3 per point), and returns the winner
+    by area score. Works on a PlayoutBoard, so the GameState is left untouched.
+    """
+    if game_state.is_over():
+        return game_state.winner()
+    board = PlayoutBoard.from_game_state(game_state)
+    if max_moves is None:
+        max_moves = 3 * board.num_rows * board.num_cols
+    color = game_state.next_player.value
+    passes = 0
+    for _ in range(max_moves):
+        index = board.select_move(color)
+        if index is None:
+            passes += 1
+            if passes == 2:
+                break
+            board.ko = 0
+        else:
+            passes = 0
+            board.play(color, index)
+        color = _OTHER_COLOR[color]
+    territory = evaluate_territory(board)
+    result = GameResult(
+        territory.num_black_territory + territory.num_black_stones,
+        territory.num_white_territory + territory.num_white_stones,
+        komi=komi
+    )
+    return result.winner
@@ -0,0 +1,94 @@
+from collections import OrderedDict
+
+from dlgo.mcts.mcts import NodeStats
+
+__all__ = [
+    'TranspositionTable',
+]
+
+LRU = 'lru'
+DEPTH = 'depth'
+
+
+class TranspositionTable:
+    """
+    Shared NodeStats for MCTS nodes, keyed by (next_player, zobrist hash), so a
+    position reached by different move orders is searched with one set of statistics.
+    Holds at most capacity entries. Eviction policies:
+    - LRU: drops the least recently looked up situation.
+    - DEPTH: a fixed array of capacity slots indexed by hash. A new situation takes
+      over its slot if the slot is free, was filled during an earlier search, or holds
+      a node at the same depth or deeper; otherwise the slot keeps the entry closer to
+      the root and the new node gets statistics of its own.
+    Evicted statistics stay with the nodes already using them, they just stop being
+    handed out. hits, misses and evictions count lookups since creation.
+    """
+    def __init__(self, capacity=1 << 16, policy=LRU):
+        if policy not in (LRU, DEPTH):
+            raise ValueError('Unknown transposition table policy: {}'.format(policy))
+        self.capacity = capacity
+        self.policy = policy
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._generation = 0
+        self._entries = OrderedDict()  # LRU: key -> NodeStats
+        self._slots = [None] * capacity if policy == DEPTH else None  # (key, stats, depth, generation)
+        self._size = 0
+
+    def new_search(self):
+        """Marks the start of a search, DEPTH entries of earlier searches become replaceable"""
+        self._generation += 1
+
+    def lookup(self, game_state, depth):
+        """NodeStats for game_state's situation, created on a miss. depth is the tree depth"""
+        if game_state.is_over():
+            # After two passes the situation repeats the one before them, but it is a
+            # different (terminal) node
+            return NodeStats()
+        key = (game_state.next_player, game_state.board.zobrist_hash())
+        if self.policy == LRU:
+            return self._lookup_lru(key)
+        return self._lookup_depth(key, depth)
+
+    def _lookup_lru(self, key):
+        stats = self._entries.get(key)
+        if stats is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return stats
+        self.misses += 1
+        stats = self._entries[key] = NodeStats()
+        if len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+        return stats
+
+    def _lookup_depth(self, key, depth):
+        index = (key[1] ^ key[0].value) % self.capacity
+        slot = self._slots[index]
+        if slot is not None and slot[0] == key:
+            self.hits += 1
+            if depth < slot[2] or slot[3] != self._generation:
+                self._slots[index] = (key, slot[1], depth, self._generation)
+            return slot[1]
+        self.misses += 1
+        stats = NodeStats()
+        if slot is None:
+            self._size += 1
+        elif slot[3] == self._generation and slot[2] < depth:
+            return stats
+        else:
+            self.evictions += 1
+        self._slots[index] = (key, stats, depth, self._generation)
+        return stats
+
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def __len__(self):
+        if self.policy == LRU:
+            return len(self._entries)
+        return self._size
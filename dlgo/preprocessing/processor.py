@@ -129,10 +129,9 @@ class GoDataProcessor:
         # Get total number of moves in this zip file
         total_examples = self.num_total_examples(zip_file, game_list, name_list)
 
-        # initialize features and labels
-        shape = self.encoder.shape()
-        feature_shape = np.insert(shape, 0, np.asarray([total_examples]))
-        features = np.zeros(feature_shape)
+        # initialize features and labels, every game is encoded straight into features.
+        # Passes count as examples but aren't encoded, their rows stay zero.
+        features = np.zeros((total_examples,) + tuple(self.encoder.shape()), dtype=np.float32)
         labels = np.zeros((total_examples,))
 
         # Loop through each game in game_list
@@ -145,6 +144,8 @@ class GoDataProcessor:
             sgf = Sgf_game.from_string(sgf_content)
 
             game_state, first_move_done = self.get_handicap(sgf)
+            game_states = []
+            game_labels = []
 
             # Iterates over all moves
             for item in sgf.main_sequence_iter():
@@ -158,11 +159,13 @@ class GoDataProcessor:
                     else:
                         move = Move.pass_turn()
                     if first_move_done and point is not None:
-                        features[counter] = self.encoder.encode(game_state)
-                        labels[counter] = self.encoder.encode_point(point)
-                        counter += 1
+                        game_states.append(game_state)
+                        game_labels.append(self.encoder.encode_point(point))
                     game_state = game_state.apply_move(move)
                     first_move_done = True
+            self.encoder.encode_batch(game_states, out=features[counter:])
+            labels[counter:counter + len(game_labels)] = game_labels
+            counter += len(game_states)
 
         feature_file_base = self.train_data_dir + '/' + data_file_name + '_features_%d'
         label_file_base = self.train_data_dir + '/' + data_file_name + '_labels_%d'
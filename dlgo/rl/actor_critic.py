@@ -24,6 +24,7 @@ class ACAgent(Agent):
         self.collector = None
         self.temperature = 1.0
         self.last_state_value = 0
+        self.inference_cache = None
 
     def set_temperature(self, temperature):
         self.temperature = temperature
@@ -31,15 +32,24 @@ class ACAgent(Agent):
     def set_collector(self, collector):
         self.collector = collector
 
+    def set_inference_cache(self, inference_cache):
+        self.inference_cache = inference_cache
+
     def select_move(self, game_state):
         num_moves = self.encoder.board_width * self.encoder.board_height
 
-        board_tensor = self.encoder.encode(game_state)
-        x = np.array([board_tensor])
-
-        actions, values = self.model.predict(x)
-        move_probs = actions[0]
-        estimated_value = values[0][0]
+        # Only encoded here for the collector or without a cache, which encodes on a miss
+        board_tensor = None
+        if self.inference_cache is not None:
+            if self.collector is not None:
+                board_tensor = self.encoder.encode_batch([game_state])[0]
+            move_probs, value = self.inference_cache.predict(self.model, self.encoder, game_state)
+        else:
+            input_tensor = self.encoder.encode_batch([game_state])
+            board_tensor = input_tensor[0]
+            actions, values = self.model.predict(input_tensor)
+            move_probs, value = actions[0], values[0]
+        estimated_value = value[0]
         self.last_state_value = float(estimated_value)
 
         # Prevent move probs from getting stuck at 0 or 1.
@@ -42,23 +42,21 @@ class QAgent(Agent):
         self.policy = policy
 
     def select_move(self, game_state):
-        board_tensor = self.encoder.encode(game_state)
+        board_tensor = self.encoder.encode_batch([game_state])[0]
 
         # Iterate over all legal moves
         moves = []
-        board_tensors = []
         for move in game_state.legal_moves():
             if not move.is_play:
                 continue
             # moves is a list of integers
             moves.append(self.encoder.encode_point(move.point))
-            board_tensors.append(board_tensor)
         if not moves:
             return goboard.Move.pass_turn()
 
-        # one-hot encode moves
+        # one-hot encode moves, all paired with the same board
         num_moves = len(moves)
-        board_tensors = np.array(board_tensors)
+        board_tensors = np.broadcast_to(board_tensor, (num_moves,) + board_tensor.shape)
         move_vectors = np.zeros((num_moves, self.encoder.num_points()))
         for i, move in enumerate(moves):
             move_vectors[i][move] = 1
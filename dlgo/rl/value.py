@@ -4,6 +4,7 @@ from keras.optimizers import SGD
 
 from dlgo import encoders
 from dlgo import goboard
+from dlgo.goboard_fast import MutableGameState
 from dlgo.utils import kerasutil
 from dlgo.agent import Agent
 from dlgo.agent.helpers import is_point_an_eye
@@ -26,8 +27,7 @@ class ValueAgent(Agent):
         self.last_move_value = 0
 
     def predict(self, game_state):
-        encoded_state = self.encoder.encode(game_state)
-        input_tensor = np.array([encoded_state])
+        input_tensor = self.encoder.encode_batch([game_state])
         return self.model.predict(input_tensor)[0]
 
     def set_temperature(self, temperature):
@@ -43,21 +43,18 @@ class ValueAgent(Agent):
 
     def select_move(self, game_state):
 
-        # Loop over all legal moves.
-        moves = []
-        board_tensors = []
-        for move in game_state.legal_moves():
-            if not move.is_play:
-                continue
-            next_state = game_state.apply_move(move)
-            board_tensor = self.encoder.encode(next_state)
-            moves.append(move)
-            board_tensors.append(board_tensor)
+        moves = [move for move in game_state.legal_moves() if move.is_play]
         if not moves:
             return goboard.Move.pass_turn()
 
-        # num_moves = len(moves)
-        board_tensors = np.array(board_tensors)
+        # Loop over all legal moves, looking ahead on one undoable board and encoding
+        # straight into the rows of the model input.
+        lookahead = MutableGameState.from_game_state(game_state)
+        board_tensors = self.encoder.batch_output(len(moves))
+        for i, move in enumerate(moves):
+            lookahead.play(move)
+            board_tensor = self.encoder.encode_batch([lookahead], out=board_tensors[i:])[0]
+            lookahead.undo()
 
         # Values of the next state from opponent's view.
         opp_values = self.model.predict(board_tensors)
@@ -1,7 +1,10 @@
 from __future__ import absolute_import
 from collections import namedtuple
 
-from dlgo.gotypes import Player, Point
+import numpy as np
+
+from dlgo.gotypes import Player
+from dlgo.geometry import get_geometry
 
 
 class Territory:
@@ -47,58 +50,143 @@ class GameResult(namedtuple('GameResult', 'b w komi')):
 
 
 def evaluate_territory(board):
-
-    status = {}
-    for r in range(1, board.num_rows + 1):
-        for c in range(1, board.num_cols + 1):
-            p = Point(row=r, col=c)
-            if p in status:  # <1>
-                continue
-            stone = board.get(p)
-            if stone is not None:  # <2>
-                status[p] = board.get(p)
-            else:
-                group, neighbors = _collect_region(p, board)
-                if len(neighbors) == 1:  # <3>
-                    neighbor_stone = neighbors.pop()
-                    stone_str = 'b' if neighbor_stone == Player.black else 'w'
-                    fill_with = 'territory_' + stone_str
-                else:
-                    fill_with = 'dame'  # <4>
-                for pos in group:
-                    status[pos] = fill_with
-    return Territory(status)
-
-
-def _collect_region(start_pos, board, visited=None):
-
-    if visited is None:
-        visited = {}
-    if start_pos in visited:
-        return [], set()
-    all_points = [start_pos]
-    all_borders = set()
-    visited[start_pos] = True
-    here = board.get(start_pos)
-    deltas = [(-1, 0), (1, 0), (0, -1), (0, 1)]
-    for delta_r, delta_c in deltas:
-        next_p = Point(row=start_pos.row + delta_r, col=start_pos.col + delta_c)
-        if not board.is_on_grid(next_p):
-            continue
-        neighbor = board.get(next_p)
-        if neighbor == here:
-            points, borders = _collect_region(next_p, board, visited)
-            all_points += points
-            all_borders |= borders
-        else:
-            all_borders.add(neighbor)
-    return all_points, all_borders
-
-
-def compute_game_result(game_state):
+    """
+    Classifies every empty region by the colors of the stones around it. Regions are
+    flood filled on bitboards (see _territory_bits), so the cost is a few big-int
+    operations per step of region diameter instead of Python work per point.
+    """
+    colors = _padded_colors(board)
+    data = colors.tobytes()
+    stride = colors.shape[1]
+    empty, territory_b, territory_w = _territory_bits(data, stride)
+    territory = Territory({})
+    territory.num_black_stones = data.count(Player.black.value)
+    territory.num_white_stones = data.count(Player.white.value)
+    territory.num_black_territory = territory_b.to_bytes(len(data), 'little').count(1)
+    territory.num_white_territory = territory_w.to_bytes(len(data), 'little').count(1)
+    territory.num_dame = data.count(0) - territory.num_black_territory - \
+        territory.num_white_territory
+    if territory.num_dame:
+        dame = (empty & ~(territory_b | territory_w)).to_bytes(len(data), 'little')
+        rows, cols = np.divmod(np.flatnonzero(np.frombuffer(dame, dtype=np.uint8)), stride)
+        points = get_geometry(board.num_rows, board.num_cols).points
+        indices = (rows - 1) * board.num_cols + cols - 1
+        territory.dame_points = [points[i] for i in indices.tolist()]
+    return territory
+
+
+# Bitboards of a single board use one byte per point (bit 0 set or not), so
+# bytes.translate and int.from_bytes turn the color bytes into a bitboard without any
+# per-point Python work.
+# Padding bytes (goboard.BORDER) never translate to a set bit and keep regions from
+# wrapping around from one row to the next.
+_PADDING = 3
+_EMPTY_BITS = bytes.maketrans(b'\x00\x01\x02\x03', b'\x01\x00\x00\x00')
+_BLACK_BITS = bytes.maketrans(b'\x00\x01\x02\x03', b'\x00\x01\x00\x00')
+_WHITE_BITS = bytes.maketrans(b'\x00\x01\x02\x03', b'\x00\x00\x01\x00')
+
+
+def _padded_colors(board):
+    """Board colors with a padding ring, for boards without padded_colors()"""
+    if hasattr(board, 'padded_colors'):
+        return board.padded_colors()
+    colors = np.full((board.num_rows + 2, board.num_cols + 2), _PADDING, dtype=np.int8)
+    colors[1:-1, 1:-1] = 0
+    for point in get_geometry(board.num_rows, board.num_cols).points:
+        stone = board.get(point)
+        if stone is not None:
+            colors[point.row, point.col] = stone.value
+    return colors
+
+
+def _padded_batch(colors):
+    """
+    Color array of shape (N, num_rows, num_cols) with a padding column after every row
+    and a padding row after every board, flattened, so all N boards share one bitboard
+    without regions leaking from one board into the next. Returns the flat array and
+    the row stride.
+    """
+    num_boards, num_rows, num_cols = colors.shape
+    padded = np.full((num_boards, num_rows + 1, num_cols + 1), _PADDING, dtype=np.int8)
+    padded[:, :-1, :-1] = colors
+    return padded.reshape(-1), num_cols + 1
+
+
+def _pack(mask):
+    """Bool array to a bitboard with one bit per point"""
+    return int.from_bytes(np.packbits(mask, bitorder='little').tobytes(), 'little')
+
+
+def _unpack(bits, size):
+    data = np.frombuffer(bits.to_bytes((size + 7) // 8, 'little'), dtype=np.uint8)
+    return np.unpackbits(data, count=size, bitorder='little')
+
+
+def _reach(stones, empty, stride, bits_per_point=8):
+    """Empty points connected to stones through empty points"""
+    col = bits_per_point
+    row = bits_per_point * stride
+    reached = (stones << col | stones >> col | stones << row | stones >> row) & empty
+    while True:
+        grown = (reached | reached << col | reached >> col | reached << row | reached >> row) & empty
+        if grown == reached:
+            return reached
+        reached = grown
+
+
+def _territory_bits(data, stride):
+    """
+    Bitboards (empty, territory_b, territory_w) for the bytes of _padded_colors() with
+    the given row stride. An empty region is black territory if black stones reach it
+    and white stones don't; that is the same as the region being bordered by black
+    stones only.
+    """
+    empty = int.from_bytes(data.translate(_EMPTY_BITS), 'little')
+    black_reach = _reach(int.from_bytes(data.translate(_BLACK_BITS), 'little'), empty, stride)
+    white_reach = _reach(int.from_bytes(data.translate(_WHITE_BITS), 'little'), empty, stride)
+    return empty, black_reach & ~white_reach, white_reach & ~black_reach
+
+
+def compute_game_result(game_state, komi=7.5):
     territory = evaluate_territory(game_state.board)
     return GameResult(
         territory.num_black_territory + territory.num_black_stones,
         territory.num_white_territory + territory.num_white_stones,
-        komi=7.5
+        komi=komi
     )
+
+
+def compute_game_results(boards, komi=7.5):
+    """
+    Scores many final positions at once. boards is a sequence of same-sized boards, or
+    a color array of shape (N, num_rows, num_cols) holding 0 for empty points and
+    Player.value for stones. All positions are stacked into one bitboard, so the flood
+    fill runs once for the whole batch. Returns a list of N GameResults.
+    """
+    if isinstance(boards, np.ndarray):
+        colors = boards.astype(np.int8, copy=False)
+    else:
+        boards = list(boards)
+        if not boards:
+            return []
+        colors = np.stack([_padded_colors(board)[1:-1, 1:-1] for board in boards])
+    if len(colors) == 0:
+        return []
+    # A batch packs one bit per point rather than one byte, the packing is paid once
+    # for all boards while every flood fill step touches 8x less memory
+    flat, stride = _padded_batch(colors)
+    empty = _pack(flat == 0)
+    black = _pack(flat == Player.black.value)
+    white = _pack(flat == Player.white.value)
+    black_reach = _reach(black, empty, stride, bits_per_point=1)
+    white_reach = _reach(white, empty, stride, bits_per_point=1)
+    black_area = _counts_per_board(black | (black_reach & ~white_reach), len(colors), flat.size)
+    white_area = _counts_per_board(white | (white_reach & ~black_reach), len(colors), flat.size)
+    return [
+        GameResult(b, w, komi=komi)
+        for b, w in zip(black_area.tolist(), white_area.tolist())
+    ]
+
+
+def _counts_per_board(bits, num_boards, size):
+    return _unpack(bits, size).reshape(num_boards, -1).sum(axis=1, dtype=np.int64)
@@ -0,0 +1,43 @@
+import random
+import unittest
+
+import numpy as np
+
+from dlgo import goboard, goboard_fast
+from dlgo.agent.naive import RandomBot
+from dlgo.encoders.utils import board_colors
+from dlgo.scoring import compute_game_result, compute_game_results
+
+
+def random_games(engine, board_size, num_games, max_moves):
+    """Final positions of random self-play games, some cut short with open regions"""
+    bot = RandomBot()
+    games = []
+    for i in range(num_games):
+        game = engine.GameState.new_game(board_size)
+        num_moves = 0
+        while not game.is_over() and num_moves < max_moves * (i + 1) // num_games:
+            game = game.apply_move(bot.select_move(game))
+            num_moves += 1
+        games.append(game)
+    return games
+
+
+class ComputeGameResultsTest(unittest.TestCase):
+    def test_matches_compute_game_result(self):
+        random.seed(11)
+        for engine, board_size in [(goboard, 5), (goboard_fast, 9), (goboard, (4, 7))]:
+            games = random_games(engine, board_size, 6, 200)
+            expected = [compute_game_result(game, komi=0.5) for game in games]
+            boards = [game.board for game in games]
+            self.assertEqual(expected, compute_game_results(boards, komi=0.5))
+            colors = np.stack([board_colors(board) for board in boards])
+            self.assertEqual(expected, compute_game_results(colors, komi=0.5))
+
+    def test_empty_batch(self):
+        self.assertEqual([], compute_game_results([]))
+        self.assertEqual([], compute_game_results(np.zeros((0, 9, 9), dtype=np.int8)))
+
+
+if __name__ == '__main__':
+    unittest.main()
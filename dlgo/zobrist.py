@@ -1,730 +1,67 @@
-from .gotypes import Player, Point
+import numpy as np
 
-__all__ = ['HASH_CODE', 'EMPTY_BOARD']
+from dlgo.geometry import get_geometry
+from dlgo.gotypes import Player
 
-HASH_CODE = {
-    (Point(row=1, col=1), Player.black): 4305649885382486408,
-    (Point(row=1, col=1), Player.white): 5345905953582379350,
-    (Point(row=1, col=2), Player.black): 2592001759151296212,
-    (Point(row=1, col=2), Player.white): 8824375275306436452,
-    (Point(row=1, col=3), Player.black): 8430705952763096596,
-    (Point(row=1, col=3), Player.white): 1421083586471709864,
-    (Point(row=1, col=4), Player.black): 4763270373880307882,
-    (Point(row=1, col=4), Player.white): 8672137931997659807,
-    (Point(row=1, col=5), Player.black): 3746652411844017012,
-    (Point(row=1, col=5), Player.white): 9216229410748209172,
-    (Point(row=1, col=6), Player.black): 7854981345406884113,
-    (Point(row=1, col=6), Player.white): 2893892507724713797,
-    (Point(row=1, col=7), Player.black): 793936378356436306,
-    (Point(row=1, col=7), Player.white): 8657848008414352534,
-    (Point(row=1, col=8), Player.black): 2681688630793926664,
-    (Point(row=1, col=8), Player.white): 8847403163942127696,
-    (Point(row=1, col=9), Player.black): 9015451099046217650,
-    (Point(row=1, col=9), Player.white): 1629924307330148634,
-    (Point(row=1, col=10), Player.black): 5964735727352002860,
-    (Point(row=1, col=10), Player.white): 1322568998192014477,
-    (Point(row=1, col=11), Player.black): 1210701910757915428,
-    (Point(row=1, col=11), Player.white): 2995317483241613264,
-    (Point(row=1, col=12), Player.black): 2691978776373519806,
-    (Point(row=1, col=12), Player.white): 5502540824014562086,
-    (Point(row=1, col=13), Player.black): 790441986903216397,
-    (Point(row=1, col=13), Player.white): 5912148680291699081,
-    (Point(row=1, col=14), Player.black): 1479678281784703496,
-    (Point(row=1, col=14), Player.white): 7074787947214850864,
-    (Point(row=1, col=15), Player.black): 5495426730049748333,
-    (Point(row=1, col=15), Player.white): 3120623238334694873,
-    (Point(row=1, col=16), Player.black): 2964582761757298650,
-    (Point(row=1, col=16), Player.white): 3270075234125245914,
-    (Point(row=1, col=17), Player.black): 4992011358860412833,
-    (Point(row=1, col=17), Player.white): 2565453180791231357,
-    (Point(row=1, col=18), Player.black): 7825721135808464231,
-    (Point(row=1, col=18), Player.white): 5636407131158576606,
-    (Point(row=1, col=19), Player.black): 5999003200172058539,
-    (Point(row=1, col=19), Player.white): 6573383084345381589,
-    (Point(row=2, col=1), Player.black): 4489977375087824876,
-    (Point(row=2, col=1), Player.white): 8881533187249126619,
-    (Point(row=2, col=2), Player.black): 380321994876712578,
-    (Point(row=2, col=2), Player.white): 5107004548876841465,
-    (Point(row=2, col=3), Player.black): 5018031003275308480,
-    (Point(row=2, col=3), Player.white): 1812226785356739463,
-    (Point(row=2, col=4), Player.black): 1662371918564304620,
-    (Point(row=2, col=4), Player.white): 6833089915804340452,
-    (Point(row=2, col=5), Player.black): 4992254045184858484,
-    (Point(row=2, col=5), Player.white): 1554983532655395458,
-    (Point(row=2, col=6), Player.black): 6434647483148308564,
-    (Point(row=2, col=6), Player.white): 7765923593774267399,
-    (Point(row=2, col=7), Player.black): 294527065937921877,
-    (Point(row=2, col=7), Player.white): 7175782075794442977,
-    (Point(row=2, col=8), Player.black): 621010655113224128,
-    (Point(row=2, col=8), Player.white): 3390793982837552419,
-    (Point(row=2, col=9), Player.black): 1557305939340801079,
-    (Point(row=2, col=9), Player.white): 5475998325305364442,
-    (Point(row=2, col=10), Player.black): 7479290524402416505,
-    (Point(row=2, col=10), Player.white): 1787811780810185913,
-    (Point(row=2, col=11), Player.black): 2871664393043581386,
-    (Point(row=2, col=11), Player.white): 5979350492698745151,
-    (Point(row=2, col=12), Player.black): 788311038512386406,
-    (Point(row=2, col=12), Player.white): 6877349886019658753,
-    (Point(row=2, col=13), Player.black): 4375919869524058052,
-    (Point(row=2, col=13), Player.white): 3372008447781478015,
-    (Point(row=2, col=14), Player.black): 6905193948341038879,
-    (Point(row=2, col=14), Player.white): 6114658202140701729,
-    (Point(row=2, col=15), Player.black): 3748581267446866347,
-    (Point(row=2, col=15), Player.white): 1279249023754566901,
-    (Point(row=2, col=16), Player.black): 6002478515344429793,
-    (Point(row=2, col=16), Player.white): 1784640996247634215,
-    (Point(row=2, col=17), Player.black): 8763889735584648583,
-    (Point(row=2, col=17), Player.white): 4505738371855204921,
-    (Point(row=2, col=18), Player.black): 5734737307525356821,
-    (Point(row=2, col=18), Player.white): 1567618792114081683,
-    (Point(row=2, col=19), Player.black): 506905225824923284,
-    (Point(row=2, col=19), Player.white): 683637076747735746,
-    (Point(row=3, col=1), Player.black): 1200506333897412308,
-    (Point(row=3, col=1), Player.white): 4585779120730106278,
-    (Point(row=3, col=2), Player.black): 3498571648428490049,
-    (Point(row=3, col=2), Player.white): 7791505289634470365,
-    (Point(row=3, col=3), Player.black): 7781030669997234117,
-    (Point(row=3, col=3), Player.white): 4691899442605432218,
-    (Point(row=3, col=4), Player.black): 7708162302175348417,
-    (Point(row=3, col=4), Player.white): 3001309023460414615,
-    (Point(row=3, col=5), Player.black): 2246136455457281573,
-    (Point(row=3, col=5), Player.white): 3254885961849776187,
-    (Point(row=3, col=6), Player.black): 8477505596057777035,
-    (Point(row=3, col=6), Player.white): 934984604619954266,
-    (Point(row=3, col=7), Player.black): 2288335134730257285,
-    (Point(row=3, col=7), Player.white): 1295236263098078950,
-    (Point(row=3, col=8), Player.black): 7952740330372251125,
-    (Point(row=3, col=8), Player.white): 7881517836208852408,
-    (Point(row=3, col=9), Player.black): 5962557600774695350,
-    (Point(row=3, col=9), Player.white): 4892252369265086454,
-    (Point(row=3, col=10), Player.black): 7209037879917925367,
-    (Point(row=3, col=10), Player.white): 4592432989834839229,
-    (Point(row=3, col=11), Player.black): 8084618610323203993,
-    (Point(row=3, col=11), Player.white): 1241549207420666293,
-    (Point(row=3, col=12), Player.black): 3823500577430507835,
-    (Point(row=3, col=12), Player.white): 8842966267417118959,
-    (Point(row=3, col=13), Player.black): 6605836079791421196,
-    (Point(row=3, col=13), Player.white): 8607843647848463882,
-    (Point(row=3, col=14), Player.black): 7244775718781479559,
-    (Point(row=3, col=14), Player.white): 2742629321058089777,
-    (Point(row=3, col=15), Player.black): 5315310031447416278,
-    (Point(row=3, col=15), Player.white): 8463841458462152360,
-    (Point(row=3, col=16), Player.black): 4833496338618268517,
-    (Point(row=3, col=16), Player.white): 1886691575921571626,
-    (Point(row=3, col=17), Player.black): 3629344192829140109,
-    (Point(row=3, col=17), Player.white): 6672260453201322267,
-    (Point(row=3, col=18), Player.black): 7689643920292413784,
-    (Point(row=3, col=18), Player.white): 8575526941768269065,
-    (Point(row=3, col=19), Player.black): 537794552500994197,
-    (Point(row=3, col=19), Player.white): 6097653537651258658,
-    (Point(row=4, col=1), Player.black): 3880591329088306315,
-    (Point(row=4, col=1), Player.white): 8195289311369561277,
-    (Point(row=4, col=2), Player.black): 5781601347692247590,
-    (Point(row=4, col=2), Player.white): 6298549033801648704,
-    (Point(row=4, col=3), Player.black): 5498005357929139253,
-    (Point(row=4, col=3), Player.white): 8203181192648611723,
-    (Point(row=4, col=4), Player.black): 542840740298791815,
-    (Point(row=4, col=4), Player.white): 2733410908018780106,
-    (Point(row=4, col=5), Player.black): 1517913878613184368,
-    (Point(row=4, col=5), Player.white): 5465166645648566554,
-    (Point(row=4, col=6), Player.black): 3838836509564969516,
-    (Point(row=4, col=6), Player.white): 8769247283303852195,
-    (Point(row=4, col=7), Player.black): 5239532380703259555,
-    (Point(row=4, col=7), Player.white): 911149024959208780,
-    (Point(row=4, col=8), Player.black): 4358754433463604315,
-    (Point(row=4, col=8), Player.white): 3622878048045131498,
-    (Point(row=4, col=9), Player.black): 6649649377129890208,
-    (Point(row=4, col=9), Player.white): 2046049625692866206,
-    (Point(row=4, col=10), Player.black): 5279824291307545683,
-    (Point(row=4, col=10), Player.white): 4647148634024621255,
-    (Point(row=4, col=11), Player.black): 5482367198150700695,
-    (Point(row=4, col=11), Player.white): 3812646880245605637,
-    (Point(row=4, col=12), Player.black): 5588854982286991216,
-    (Point(row=4, col=12), Player.white): 1426225787028191160,
-    (Point(row=4, col=13), Player.black): 158920434435706584,
-    (Point(row=4, col=13), Player.white): 6239525185976904315,
-    (Point(row=4, col=14), Player.black): 8901928090568205104,
-    (Point(row=4, col=14), Player.white): 7149433744765949500,
-    (Point(row=4, col=15), Player.black): 3106395028977794293,
-    (Point(row=4, col=15), Player.white): 3656030666772652903,
-    (Point(row=4, col=16), Player.black): 4236949467809129234,
-    (Point(row=4, col=16), Player.white): 3307717996892165060,
-    (Point(row=4, col=17), Player.black): 3541399108800822464,
-    (Point(row=4, col=17), Player.white): 760813376978683043,
-    (Point(row=4, col=18), Player.black): 7003492691134690116,
-    (Point(row=4, col=18), Player.white): 2905318301700949636,
-    (Point(row=4, col=19), Player.black): 6179245329492961734,
-    (Point(row=4, col=19), Player.white): 6055347039520425069,
-    (Point(row=5, col=1), Player.black): 1612082045655713719,
-    (Point(row=5, col=1), Player.white): 8036418859029062142,
-    (Point(row=5, col=2), Player.black): 1979934657665740671,
-    (Point(row=5, col=2), Player.white): 3379475919238491391,
-    (Point(row=5, col=3), Player.black): 6558967958792726659,
-    (Point(row=5, col=3), Player.white): 3540718173929094504,
-    (Point(row=5, col=4), Player.black): 4914498386962932942,
-    (Point(row=5, col=4), Player.white): 4890892098893501103,
-    (Point(row=5, col=5), Player.black): 1763719482027092339,
-    (Point(row=5, col=5), Player.white): 2074596257764377747,
-    (Point(row=5, col=6), Player.black): 6131659702631341582,
-    (Point(row=5, col=6), Player.white): 1713400425208961965,
-    (Point(row=5, col=7), Player.black): 4827366080925617576,
-    (Point(row=5, col=7), Player.white): 1395845901318454891,
-    (Point(row=5, col=8), Player.black): 8999512246958905973,
-    (Point(row=5, col=8), Player.white): 3870423543347083932,
-    (Point(row=5, col=9), Player.black): 1402036946573413388,
-    (Point(row=5, col=9), Player.white): 962933050438976549,
-    (Point(row=5, col=10), Player.black): 8175049870402478330,
-    (Point(row=5, col=10), Player.white): 7343600551571733389,
-    (Point(row=5, col=11), Player.black): 5212479750170802139,
-    (Point(row=5, col=11), Player.white): 288808874589435736,
-    (Point(row=5, col=12), Player.black): 9145023373906825011,
-    (Point(row=5, col=12), Player.white): 8562952061941522516,
-    (Point(row=5, col=13), Player.black): 6527091893389639111,
-    (Point(row=5, col=13), Player.white): 5279552284247597047,
-    (Point(row=5, col=14), Player.black): 5567379553303057603,
-    (Point(row=5, col=14), Player.white): 7861189438646842483,
-    (Point(row=5, col=15), Player.black): 4468348013085727383,
-    (Point(row=5, col=15), Player.white): 253640229677694286,
-    (Point(row=5, col=16), Player.black): 4282174320949248164,
-    (Point(row=5, col=16), Player.white): 353657239155205367,
-    (Point(row=5, col=17), Player.black): 2568295844092914080,
-    (Point(row=5, col=17), Player.white): 1440100769884575176,
-    (Point(row=5, col=18), Player.black): 233071970098604499,
-    (Point(row=5, col=18), Player.white): 3020935635023074683,
-    (Point(row=5, col=19), Player.black): 1270085136583331560,
-    (Point(row=5, col=19), Player.white): 1102534985195380377,
-    (Point(row=6, col=1), Player.black): 1026699178730155818,
-    (Point(row=6, col=1), Player.white): 1913614197887741788,
-    (Point(row=6, col=2), Player.black): 5578267854538201432,
-    (Point(row=6, col=2), Player.white): 34548802257144726,
-    (Point(row=6, col=3), Player.black): 7070261310808276346,
-    (Point(row=6, col=3), Player.white): 7952346032163218451,
-    (Point(row=6, col=4), Player.black): 7075028967979936939,
-    (Point(row=6, col=4), Player.white): 4036145308882215244,
-    (Point(row=6, col=5), Player.black): 8076713546658506998,
-    (Point(row=6, col=5), Player.white): 6823051636421026161,
-    (Point(row=6, col=6), Player.black): 2469269854376859989,
-    (Point(row=6, col=6), Player.white): 1736867699540025516,
-    (Point(row=6, col=7), Player.black): 6660593668274282579,
-    (Point(row=6, col=7), Player.white): 5705388032791302364,
-    (Point(row=6, col=8), Player.black): 5500386518345277249,
-    (Point(row=6, col=8), Player.white): 4818051671139199483,
-    (Point(row=6, col=9), Player.black): 2710242801123730571,
-    (Point(row=6, col=9), Player.white): 5175627705397730422,
-    (Point(row=6, col=10), Player.black): 8961235115805713177,
-    (Point(row=6, col=10), Player.white): 8432832291200304845,
-    (Point(row=6, col=11), Player.black): 1424177097283663949,
-    (Point(row=6, col=11), Player.white): 7909584231005213924,
-    (Point(row=6, col=12), Player.black): 851244329137112965,
-    (Point(row=6, col=12), Player.white): 7893105343012284521,
-    (Point(row=6, col=13), Player.black): 3881525892600920703,
-    (Point(row=6, col=13), Player.white): 1636974316672465297,
-    (Point(row=6, col=14), Player.black): 6571958608471979191,
-    (Point(row=6, col=14), Player.white): 1326863609239710757,
-    (Point(row=6, col=15), Player.black): 2157109028600769405,
-    (Point(row=6, col=15), Player.white): 5069047270179066882,
-    (Point(row=6, col=16), Player.black): 3707462707472057335,
-    (Point(row=6, col=16), Player.white): 3947161838214330216,
-    (Point(row=6, col=17), Player.black): 8149044100160011561,
-    (Point(row=6, col=17), Player.white): 9008956010295109540,
-    (Point(row=6, col=18), Player.black): 1389832810713309771,
-    (Point(row=6, col=18), Player.white): 6859749445427865582,
-    (Point(row=6, col=19), Player.black): 9123185363703963877,
-    (Point(row=6, col=19), Player.white): 3636412607082667580,
-    (Point(row=7, col=1), Player.black): 3400497308805799889,
-    (Point(row=7, col=1), Player.white): 766455067426918846,
-    (Point(row=7, col=2), Player.black): 3980272350396487076,
-    (Point(row=7, col=2), Player.white): 2072990273547074538,
-    (Point(row=7, col=3), Player.black): 615404632734803807,
-    (Point(row=7, col=3), Player.white): 1095572377297103922,
-    (Point(row=7, col=4), Player.black): 2281425556494650800,
-    (Point(row=7, col=4), Player.white): 2564202516992340956,
-    (Point(row=7, col=5), Player.black): 6153549408658670259,
-    (Point(row=7, col=5), Player.white): 3096038181764050794,
-    (Point(row=7, col=6), Player.black): 4426176007948953025,
-    (Point(row=7, col=6), Player.white): 7414577513007312636,
-    (Point(row=7, col=7), Player.black): 4026814664129175075,
-    (Point(row=7, col=7), Player.white): 4355574985069995438,
-    (Point(row=7, col=8), Player.black): 9050776252563178125,
-    (Point(row=7, col=8), Player.white): 6588468832920237757,
-    (Point(row=7, col=9), Player.black): 353346402858549658,
-    (Point(row=7, col=9), Player.white): 2786829112155900440,
-    (Point(row=7, col=10), Player.black): 7189049480665193209,
-    (Point(row=7, col=10), Player.white): 7986266879517325639,
-    (Point(row=7, col=11), Player.black): 397061190942201905,
-    (Point(row=7, col=11), Player.white): 1646735845894091060,
-    (Point(row=7, col=12), Player.black): 1792482576579282937,
-    (Point(row=7, col=12), Player.white): 8286454753228757043,
-    (Point(row=7, col=13), Player.black): 8161106182785603517,
-    (Point(row=7, col=13), Player.white): 8534807435547430153,
-    (Point(row=7, col=14), Player.black): 8662023926456105800,
-    (Point(row=7, col=14), Player.white): 2424232210416600121,
-    (Point(row=7, col=15), Player.black): 8322808091403912801,
-    (Point(row=7, col=15), Player.white): 1341118173136737390,
-    (Point(row=7, col=16), Player.black): 2567602137198889979,
-    (Point(row=7, col=16), Player.white): 7364072518163141047,
-    (Point(row=7, col=17), Player.black): 5555913118611450717,
-    (Point(row=7, col=17), Player.white): 1162920750134059636,
-    (Point(row=7, col=18), Player.black): 809529979517159333,
-    (Point(row=7, col=18), Player.white): 720466149026519443,
-    (Point(row=7, col=19), Player.black): 2864362084379756,
-    (Point(row=7, col=19), Player.white): 6990253476874736015,
-    (Point(row=8, col=1), Player.black): 398341254103266992,
-    (Point(row=8, col=1), Player.white): 8915781233994447990,
-    (Point(row=8, col=2), Player.black): 8050617719024864630,
-    (Point(row=8, col=2), Player.white): 1589624739039793308,
-    (Point(row=8, col=3), Player.black): 377673611586557523,
-    (Point(row=8, col=3), Player.white): 5405383430272090187,
-    (Point(row=8, col=4), Player.black): 3115397476974797795,
-    (Point(row=8, col=4), Player.white): 3764076809659087136,
-    (Point(row=8, col=5), Player.black): 8556942418058541308,
-    (Point(row=8, col=5), Player.white): 4630174607503122546,
-    (Point(row=8, col=6), Player.black): 627920708796629512,
-    (Point(row=8, col=6), Player.white): 7922312710563711469,
-    (Point(row=8, col=7), Player.black): 679239809435657872,
-    (Point(row=8, col=7), Player.white): 4741017739455385580,
-    (Point(row=8, col=8), Player.black): 3023342417256553588,
-    (Point(row=8, col=8), Player.white): 6645386088481733361,
-    (Point(row=8, col=9), Player.black): 3847646108405021175,
-    (Point(row=8, col=9), Player.white): 1503525542127240682,
-    (Point(row=8, col=10), Player.black): 7845347357859086047,
-    (Point(row=8, col=10), Player.white): 6861392988002159511,
-    (Point(row=8, col=11), Player.black): 7413865234972735906,
-    (Point(row=8, col=11), Player.white): 1209907594339390554,
-    (Point(row=8, col=12), Player.black): 9110682577262541733,
-    (Point(row=8, col=12), Player.white): 4416090752417793782,
-    (Point(row=8, col=13), Player.black): 4285453747180426874,
-    (Point(row=8, col=13), Player.white): 5413506670721424476,
-    (Point(row=8, col=14), Player.black): 578409988460336010,
-    (Point(row=8, col=14), Player.white): 7698129082602208770,
-    (Point(row=8, col=15), Player.black): 5365650715945444885,
-    (Point(row=8, col=15), Player.white): 1025286234687225295,
-    (Point(row=8, col=16), Player.black): 2555420461679509041,
-    (Point(row=8, col=16), Player.white): 546824900424173207,
-    (Point(row=8, col=17), Player.black): 2629586106862305985,
-    (Point(row=8, col=17), Player.white): 8431053603901927382,
-    (Point(row=8, col=18), Player.black): 7917269526185890656,
-    (Point(row=8, col=18), Player.white): 1615484786490066135,
-    (Point(row=8, col=19), Player.black): 1312866118307829853,
-    (Point(row=8, col=19), Player.white): 2899672086176197275,
-    (Point(row=9, col=1), Player.black): 167942851551486359,
-    (Point(row=9, col=1), Player.white): 2927916259627347062,
-    (Point(row=9, col=2), Player.black): 6295772543285533653,
-    (Point(row=9, col=2), Player.white): 6593687556841390423,
-    (Point(row=9, col=3), Player.black): 6530531710473723430,
-    (Point(row=9, col=3), Player.white): 5682975643799648917,
-    (Point(row=9, col=4), Player.black): 7178931980751410572,
-    (Point(row=9, col=4), Player.white): 4284328171053125269,
-    (Point(row=9, col=5), Player.black): 8669998678758369541,
-    (Point(row=9, col=5), Player.white): 370514398227497557,
-    (Point(row=9, col=6), Player.black): 2644237786589958081,
-    (Point(row=9, col=6), Player.white): 3968473025251002384,
-    (Point(row=9, col=7), Player.black): 8660366528651604259,
-    (Point(row=9, col=7), Player.white): 5309066147070475500,
-    (Point(row=9, col=8), Player.black): 7756926197836912951,
-    (Point(row=9, col=8), Player.white): 7911660958275762066,
-    (Point(row=9, col=9), Player.black): 3253433616512588461,
-    (Point(row=9, col=9), Player.white): 3509667304640711783,
-    (Point(row=9, col=10), Player.black): 3714154752586361406,
-    (Point(row=9, col=10), Player.white): 6837917474847820381,
-    (Point(row=9, col=11), Player.black): 2994648570282680710,
-    (Point(row=9, col=11), Player.white): 3749901394301157120,
-    (Point(row=9, col=12), Player.black): 5924670026925051594,
-    (Point(row=9, col=12), Player.white): 2260004933557933334,
-    (Point(row=9, col=13), Player.black): 8090255332567870254,
-    (Point(row=9, col=13), Player.white): 6022893216144799350,
-    (Point(row=9, col=14), Player.black): 1424896908620398112,
-    (Point(row=9, col=14), Player.white): 7361435377295261926,
-    (Point(row=9, col=15), Player.black): 5784697212187019589,
-    (Point(row=9, col=15), Player.white): 1254042140536183071,
-    (Point(row=9, col=16), Player.black): 4643140110437129581,
-    (Point(row=9, col=16), Player.white): 2257922263359359386,
-    (Point(row=9, col=17), Player.black): 92342433181835271,
-    (Point(row=9, col=17), Player.white): 8868072845097105159,
-    (Point(row=9, col=18), Player.black): 4988154153920970240,
-    (Point(row=9, col=18), Player.white): 2126657680639954769,
-    (Point(row=9, col=19), Player.black): 735839028068407149,
-    (Point(row=9, col=19), Player.white): 372651919719802663,
-    (Point(row=10, col=1), Player.black): 8812306872844612778,
-    (Point(row=10, col=1), Player.white): 1858757940382927638,
-    (Point(row=10, col=2), Player.black): 8453576333734999227,
-    (Point(row=10, col=2), Player.white): 5088426574069078134,
-    (Point(row=10, col=3), Player.black): 64031499082793025,
-    (Point(row=10, col=3), Player.white): 1071157517203822920,
-    (Point(row=10, col=4), Player.black): 6416987231631864295,
-    (Point(row=10, col=4), Player.white): 5484896595831417111,
-    (Point(row=10, col=5), Player.black): 3108308763050502147,
-    (Point(row=10, col=5), Player.white): 8648811817859720559,
-    (Point(row=10, col=6), Player.black): 3982468007874570307,
-    (Point(row=10, col=6), Player.white): 1850799481797455922,
-    (Point(row=10, col=7), Player.black): 7313840758136703761,
-    (Point(row=10, col=7), Player.white): 1389184212276244731,
-    (Point(row=10, col=8), Player.black): 5610451006303277467,
-    (Point(row=10, col=8), Player.white): 3013565714520888032,
-    (Point(row=10, col=9), Player.black): 3587614817563332612,
-    (Point(row=10, col=9), Player.white): 5797308884398362317,
-    (Point(row=10, col=10), Player.black): 7987700921955372576,
-    (Point(row=10, col=10), Player.white): 554167453710580272,
-    (Point(row=10, col=11), Player.black): 9056787483765554010,
-    (Point(row=10, col=11), Player.white): 2797172938047180499,
-    (Point(row=10, col=12), Player.black): 4840235120352949812,
-    (Point(row=10, col=12), Player.white): 2660121257331070516,
-    (Point(row=10, col=13), Player.black): 1244135446506491484,
-    (Point(row=10, col=13), Player.white): 5229345495024106300,
-    (Point(row=10, col=14), Player.black): 6527002798041896761,
-    (Point(row=10, col=14), Player.white): 8668648240357775705,
-    (Point(row=10, col=15), Player.black): 3768087715409121770,
-    (Point(row=10, col=15), Player.white): 3717449877067455010,
-    (Point(row=10, col=16), Player.black): 1699084673174163541,
-    (Point(row=10, col=16), Player.white): 7159583806861843014,
-    (Point(row=10, col=17), Player.black): 8166287611156064863,
-    (Point(row=10, col=17), Player.white): 393991298595744040,
-    (Point(row=10, col=18), Player.black): 3945788589332891112,
-    (Point(row=10, col=18), Player.white): 7783899627236755680,
-    (Point(row=10, col=19), Player.black): 7946981679312011405,
-    (Point(row=10, col=19), Player.white): 5160310334639808830,
-    (Point(row=11, col=1), Player.black): 5363092041307523542,
-    (Point(row=11, col=1), Player.white): 715145609417869108,
-    (Point(row=11, col=2), Player.black): 8196871277562303974,
-    (Point(row=11, col=2), Player.white): 507998513286012235,
-    (Point(row=11, col=3), Player.black): 4894993507394748768,
-    (Point(row=11, col=3), Player.white): 4273645517921451708,
-    (Point(row=11, col=4), Player.black): 7372856528122706973,
-    (Point(row=11, col=4), Player.white): 6718390606326638007,
-    (Point(row=11, col=5), Player.black): 6776384325774010062,
-    (Point(row=11, col=5), Player.white): 2954096646516150208,
-    (Point(row=11, col=6), Player.black): 8472103381500649106,
-    (Point(row=11, col=6), Player.white): 4375094675152296242,
-    (Point(row=11, col=7), Player.black): 6317924249216345703,
-    (Point(row=11, col=7), Player.white): 6411666751681659038,
-    (Point(row=11, col=8), Player.black): 383126444398434274,
-    (Point(row=11, col=8), Player.white): 8339437986751469374,
-    (Point(row=11, col=9), Player.black): 3165085632997673901,
-    (Point(row=11, col=9), Player.white): 8263746975139207287,
-    (Point(row=11, col=10), Player.black): 6828395504203195449,
-    (Point(row=11, col=10), Player.white): 1503276935720732094,
-    (Point(row=11, col=11), Player.black): 8951003601297999955,
-    (Point(row=11, col=11), Player.white): 8896764529591966167,
-    (Point(row=11, col=12), Player.black): 1429931131799282823,
-    (Point(row=11, col=12), Player.white): 7739430167598710154,
-    (Point(row=11, col=13), Player.black): 7972726830122936678,
-    (Point(row=11, col=13), Player.white): 4466924835997264395,
-    (Point(row=11, col=14), Player.black): 4022742558208334457,
-    (Point(row=11, col=14), Player.white): 5106454922283778413,
-    (Point(row=11, col=15), Player.black): 6936053498952073610,
-    (Point(row=11, col=15), Player.white): 8262047215956026974,
-    (Point(row=11, col=16), Player.black): 1771032693037436751,
-    (Point(row=11, col=16), Player.white): 159204182548218061,
-    (Point(row=11, col=17), Player.black): 1539676575187820962,
-    (Point(row=11, col=17), Player.white): 2132868761441974735,
-    (Point(row=11, col=18), Player.black): 8591475683398803328,
-    (Point(row=11, col=18), Player.white): 545859684025866095,
-    (Point(row=11, col=19), Player.black): 9192416540150223257,
-    (Point(row=11, col=19), Player.white): 5056171358109513377,
-    (Point(row=12, col=1), Player.black): 8145218917882270611,
-    (Point(row=12, col=1), Player.white): 6589614970563126204,
-    (Point(row=12, col=2), Player.black): 4834015354593854576,
-    (Point(row=12, col=2), Player.white): 8418148916678125710,
-    (Point(row=12, col=3), Player.black): 1583178472831551082,
-    (Point(row=12, col=3), Player.white): 7305722192998577319,
-    (Point(row=12, col=4), Player.black): 2918349989886527389,
-    (Point(row=12, col=4), Player.white): 2174541318529936865,
-    (Point(row=12, col=5), Player.black): 6769275500046413020,
-    (Point(row=12, col=5), Player.white): 3280129433621134572,
-    (Point(row=12, col=6), Player.black): 4540535151278733697,
-    (Point(row=12, col=6), Player.white): 4538991390575462185,
-    (Point(row=12, col=7), Player.black): 1604876873743285137,
-    (Point(row=12, col=7), Player.white): 7512797099055645867,
-    (Point(row=12, col=8), Player.black): 3582796481226067432,
-    (Point(row=12, col=8), Player.white): 4167998600341130996,
-    (Point(row=12, col=9), Player.black): 1488018708939598908,
-    (Point(row=12, col=9), Player.white): 4440524523941845799,
-    (Point(row=12, col=10), Player.black): 4511232608207973482,
-    (Point(row=12, col=10), Player.white): 8594261228622413367,
-    (Point(row=12, col=11), Player.black): 8187037283719136107,
-    (Point(row=12, col=11), Player.white): 7512683370770359595,
-    (Point(row=12, col=12), Player.black): 5319038361577120909,
-    (Point(row=12, col=12), Player.white): 6188419591823077460,
-    (Point(row=12, col=13), Player.black): 8290236215688171968,
-    (Point(row=12, col=13), Player.white): 1945936988165983409,
-    (Point(row=12, col=14), Player.black): 8621171968800744293,
-    (Point(row=12, col=14), Player.white): 901974943494935058,
-    (Point(row=12, col=15), Player.black): 5582163000318367555,
-    (Point(row=12, col=15), Player.white): 5288102999480078639,
-    (Point(row=12, col=16), Player.black): 6222248815078497283,
-    (Point(row=12, col=16), Player.white): 9064226387119361081,
-    (Point(row=12, col=17), Player.black): 2948962349836013985,
-    (Point(row=12, col=17), Player.white): 1137578602730895790,
-    (Point(row=12, col=18), Player.black): 1977270215128481850,
-    (Point(row=12, col=18), Player.white): 3257670330030661254,
-    (Point(row=12, col=19), Player.black): 3429600707391728714,
-    (Point(row=12, col=19), Player.white): 7694404381890956242,
-    (Point(row=13, col=1), Player.black): 6942833977662371558,
-    (Point(row=13, col=1), Player.white): 4449584028501493795,
-    (Point(row=13, col=2), Player.black): 886522255524971390,
-    (Point(row=13, col=2), Player.white): 381536186121222724,
-    (Point(row=13, col=3), Player.black): 59105407722177242,
-    (Point(row=13, col=3), Player.white): 9039713937125984663,
-    (Point(row=13, col=4), Player.black): 5171213754369743889,
-    (Point(row=13, col=4), Player.white): 3082601825425605870,
-    (Point(row=13, col=5), Player.black): 6110682373092784076,
-    (Point(row=13, col=5), Player.white): 1727570764551675025,
-    (Point(row=13, col=6), Player.black): 1113492668654686838,
-    (Point(row=13, col=6), Player.white): 8265160591198912802,
-    (Point(row=13, col=7), Player.black): 7910190084147973180,
-    (Point(row=13, col=7), Player.white): 8249703774539331584,
-    (Point(row=13, col=8), Player.black): 1143108502882896496,
-    (Point(row=13, col=8), Player.white): 8319415860058625383,
-    (Point(row=13, col=9), Player.black): 3862230800418189641,
-    (Point(row=13, col=9), Player.white): 2608613937876414286,
-    (Point(row=13, col=10), Player.black): 884271042297248690,
-    (Point(row=13, col=10), Player.white): 2269780113578875656,
-    (Point(row=13, col=11), Player.black): 4643343161495264476,
-    (Point(row=13, col=11), Player.white): 1967594119328694327,
-    (Point(row=13, col=12), Player.black): 5058867078401684380,
-    (Point(row=13, col=12), Player.white): 7904294512997905682,
-    (Point(row=13, col=13), Player.black): 8155017619448125817,
-    (Point(row=13, col=13), Player.white): 574948330293881166,
-    (Point(row=13, col=14), Player.black): 6234301521059010800,
-    (Point(row=13, col=14), Player.white): 2401721035146051333,
-    (Point(row=13, col=15), Player.black): 3045360951843202909,
-    (Point(row=13, col=15), Player.white): 3929304612080846215,
-    (Point(row=13, col=16), Player.black): 8672579251278296554,
-    (Point(row=13, col=16), Player.white): 7132858388597479302,
-    (Point(row=13, col=17), Player.black): 8258241726608942014,
-    (Point(row=13, col=17), Player.white): 4933477040084116114,
-    (Point(row=13, col=18), Player.black): 6884058775653347246,
-    (Point(row=13, col=18), Player.white): 6866429501489590395,
-    (Point(row=13, col=19), Player.black): 2452183539219863288,
-    (Point(row=13, col=19), Player.white): 5680047188914036061,
-    (Point(row=14, col=1), Player.black): 780142001492978526,
-    (Point(row=14, col=1), Player.white): 4749643898158307761,
-    (Point(row=14, col=2), Player.black): 8141843714631432678,
-    (Point(row=14, col=2), Player.white): 2377534313838822325,
-    (Point(row=14, col=3), Player.black): 4188811345668236364,
-    (Point(row=14, col=3), Player.white): 5802807578444752740,
-    (Point(row=14, col=4), Player.black): 4959434730020251197,
-    (Point(row=14, col=4), Player.white): 8954776504611937714,
-    (Point(row=14, col=5), Player.black): 3681507448474884136,
-    (Point(row=14, col=5), Player.white): 8737517503601399140,
-    (Point(row=14, col=6), Player.black): 7049143531953387887,
-    (Point(row=14, col=6), Player.white): 7309184685694600919,
-    (Point(row=14, col=7), Player.black): 5548919079870268254,
-    (Point(row=14, col=7), Player.white): 8762423548352761947,
-    (Point(row=14, col=8), Player.black): 5363879306278747326,
-    (Point(row=14, col=8), Player.white): 5363332889047260034,
-    (Point(row=14, col=9), Player.black): 3214141211680327031,
-    (Point(row=14, col=9), Player.white): 3556372496085050767,
-    (Point(row=14, col=10), Player.black): 3080724835902630587,
-    (Point(row=14, col=10), Player.white): 3719842621357759613,
-    (Point(row=14, col=11), Player.black): 4658565940149415114,
-    (Point(row=14, col=11), Player.white): 2989225866197359807,
-    (Point(row=14, col=12), Player.black): 2384944811429399234,
-    (Point(row=14, col=12), Player.white): 567309063418923483,
-    (Point(row=14, col=13), Player.black): 3201024300444155500,
-    (Point(row=14, col=13), Player.white): 1822183419394856869,
-    (Point(row=14, col=14), Player.black): 5201467115766257650,
-    (Point(row=14, col=14), Player.white): 6553997775873748799,
-    (Point(row=14, col=15), Player.black): 3407548259738276443,
-    (Point(row=14, col=15), Player.white): 1922442723980464208,
-    (Point(row=14, col=16), Player.black): 6468594081011363995,
-    (Point(row=14, col=16), Player.white): 1654641698886862373,
-    (Point(row=14, col=17), Player.black): 1765647476457252843,
-    (Point(row=14, col=17), Player.white): 175688038018660767,
-    (Point(row=14, col=18), Player.black): 446266353705644313,
-    (Point(row=14, col=18), Player.white): 7848033505818019441,
-    (Point(row=14, col=19), Player.black): 4083530868342800589,
-    (Point(row=14, col=19), Player.white): 3474980082149194739,
-    (Point(row=15, col=1), Player.black): 6364401976450742150,
-    (Point(row=15, col=1), Player.white): 4413500211432803867,
-    (Point(row=15, col=2), Player.black): 520451789862842500,
-    (Point(row=15, col=2), Player.white): 2940408814763798675,
-    (Point(row=15, col=3), Player.black): 1189326278000710359,
-    (Point(row=15, col=3), Player.white): 5697806980348777805,
-    (Point(row=15, col=4), Player.black): 6958945443290564475,
-    (Point(row=15, col=4), Player.white): 7557011389792242718,
-    (Point(row=15, col=5), Player.black): 6403904083636121257,
-    (Point(row=15, col=5), Player.white): 2555413649635575007,
-    (Point(row=15, col=6), Player.black): 6538443029571086871,
-    (Point(row=15, col=6), Player.white): 2776404916980814784,
-    (Point(row=15, col=7), Player.black): 9209089690940136800,
-    (Point(row=15, col=7), Player.white): 7002695468518121760,
-    (Point(row=15, col=8), Player.black): 7761046986064499826,
-    (Point(row=15, col=8), Player.white): 1699562069390332857,
-    (Point(row=15, col=9), Player.black): 2476954268549017918,
-    (Point(row=15, col=9), Player.white): 3462805519868974109,
-    (Point(row=15, col=10), Player.black): 820053457974381559,
-    (Point(row=15, col=10), Player.white): 3774281130415329810,
-    (Point(row=15, col=11), Player.black): 8494181843640468784,
-    (Point(row=15, col=11), Player.white): 5852746921755824844,
-    (Point(row=15, col=12), Player.black): 3857621076108596380,
-    (Point(row=15, col=12), Player.white): 6798583036785117293,
-    (Point(row=15, col=13), Player.black): 2707500787990225047,
-    (Point(row=15, col=13), Player.white): 7710495662884981857,
-    (Point(row=15, col=14), Player.black): 6138666081626432023,
-    (Point(row=15, col=14), Player.white): 1451434796818213750,
-    (Point(row=15, col=15), Player.black): 1182586999895301266,
-    (Point(row=15, col=15), Player.white): 1016777479567147993,
-    (Point(row=15, col=16), Player.black): 7981314155266108487,
-    (Point(row=15, col=16), Player.white): 6986039671797869587,
-    (Point(row=15, col=17), Player.black): 225532373697968174,
-    (Point(row=15, col=17), Player.white): 5862456399598981665,
-    (Point(row=15, col=18), Player.black): 4504268956371264032,
-    (Point(row=15, col=18), Player.white): 8439432833530546462,
-    (Point(row=15, col=19), Player.black): 7733502459361129776,
-    (Point(row=15, col=19), Player.white): 3568862480562216089,
-    (Point(row=16, col=1), Player.black): 7942195829553233814,
-    (Point(row=16, col=1), Player.white): 1248768683745194731,
-    (Point(row=16, col=2), Player.black): 4839096292800883625,
-    (Point(row=16, col=2), Player.white): 4586096592879235680,
-    (Point(row=16, col=3), Player.black): 2026670362318036220,
-    (Point(row=16, col=3), Player.white): 6410930868452444120,
-    (Point(row=16, col=4), Player.black): 7714362551049917131,
-    (Point(row=16, col=4), Player.white): 8941192707358764685,
-    (Point(row=16, col=5), Player.black): 1094947526040471815,
-    (Point(row=16, col=5), Player.white): 53449744337445392,
-    (Point(row=16, col=6), Player.black): 5524278667968081765,
-    (Point(row=16, col=6), Player.white): 8936392981533531334,
-    (Point(row=16, col=7), Player.black): 8559584760964156766,
-    (Point(row=16, col=7), Player.white): 8992069833719369921,
-    (Point(row=16, col=8), Player.black): 6087195587391770455,
-    (Point(row=16, col=8), Player.white): 4336238296059707116,
-    (Point(row=16, col=9), Player.black): 6507368096927733835,
-    (Point(row=16, col=9), Player.white): 4516306159870952632,
-    (Point(row=16, col=10), Player.black): 2826111523839509003,
-    (Point(row=16, col=10), Player.white): 8732097677316764561,
-    (Point(row=16, col=11), Player.black): 3064086781196731024,
-    (Point(row=16, col=11), Player.white): 3509600002868916381,
-    (Point(row=16, col=12), Player.black): 6149902427522729445,
-    (Point(row=16, col=12), Player.white): 2015344887726129990,
-    (Point(row=16, col=13), Player.black): 6665438510489685585,
-    (Point(row=16, col=13), Player.white): 1709001662136557612,
-    (Point(row=16, col=14), Player.black): 5257502957385864681,
-    (Point(row=16, col=14), Player.white): 5774707148185814198,
-    (Point(row=16, col=15), Player.black): 1052010238927786004,
-    (Point(row=16, col=15), Player.white): 7930958861939211524,
-    (Point(row=16, col=16), Player.black): 1177086002253814807,
-    (Point(row=16, col=16), Player.white): 8718654398850192470,
-    (Point(row=16, col=17), Player.black): 1453418755802802426,
-    (Point(row=16, col=17), Player.white): 1961919958211610167,
-    (Point(row=16, col=18), Player.black): 3569959490972419500,
-    (Point(row=16, col=18), Player.white): 1645484948830200077,
-    (Point(row=16, col=19), Player.black): 5213256064075678703,
-    (Point(row=16, col=19), Player.white): 4144958498938954561,
-    (Point(row=17, col=1), Player.black): 5309879015946114671,
-    (Point(row=17, col=1), Player.white): 899369223368176120,
-    (Point(row=17, col=2), Player.black): 4559761914549028789,
-    (Point(row=17, col=2), Player.white): 7967900835855800043,
-    (Point(row=17, col=3), Player.black): 401618683209392475,
-    (Point(row=17, col=3), Player.white): 1735171111876020300,
-    (Point(row=17, col=4), Player.black): 2478344987242698822,
-    (Point(row=17, col=4), Player.white): 4921459919617776806,
-    (Point(row=17, col=5), Player.black): 8299739580707319621,
-    (Point(row=17, col=5), Player.white): 3048621183315388163,
-    (Point(row=17, col=6), Player.black): 8887439951199613693,
-    (Point(row=17, col=6), Player.white): 6482524427173639156,
-    (Point(row=17, col=7), Player.black): 4353133804610304755,
-    (Point(row=17, col=7), Player.white): 5565320643451212598,
-    (Point(row=17, col=8), Player.black): 3983734607116217024,
-    (Point(row=17, col=8), Player.white): 5761517362575540464,
-    (Point(row=17, col=9), Player.black): 5163936900961353169,
-    (Point(row=17, col=9), Player.white): 5201650263920845820,
-    (Point(row=17, col=10), Player.black): 5213631887015525198,
-    (Point(row=17, col=10), Player.white): 1187775127257996338,
-    (Point(row=17, col=11), Player.black): 6233574138684546003,
-    (Point(row=17, col=11), Player.white): 8071481978115973405,
-    (Point(row=17, col=12), Player.black): 7425130411508195267,
-    (Point(row=17, col=12), Player.white): 1271029244489606822,
-    (Point(row=17, col=13), Player.black): 6088554706164902542,
-    (Point(row=17, col=13), Player.white): 6980911682547278816,
-    (Point(row=17, col=14), Player.black): 358245370209358077,
-    (Point(row=17, col=14), Player.white): 8209185910920990475,
-    (Point(row=17, col=15), Player.black): 3805608909866214052,
-    (Point(row=17, col=15), Player.white): 5296415203816385507,
-    (Point(row=17, col=16), Player.black): 2104748797299565984,
-    (Point(row=17, col=16), Player.white): 4234995240874946692,
-    (Point(row=17, col=17), Player.black): 6504496964503531704,
-    (Point(row=17, col=17), Player.white): 3949738087014690202,
-    (Point(row=17, col=18), Player.black): 6225306943641904261,
-    (Point(row=17, col=18), Player.white): 8038121440443922728,
-    (Point(row=17, col=19), Player.black): 6053814355877844724,
-    (Point(row=17, col=19), Player.white): 8617409139788682354,
-    (Point(row=18, col=1), Player.black): 8069098056373045660,
-    (Point(row=18, col=1), Player.white): 1759389397526478813,
-    (Point(row=18, col=2), Player.black): 1996112416289124680,
-    (Point(row=18, col=2), Player.white): 5301154974015658372,
-    (Point(row=18, col=3), Player.black): 7317260721962035926,
-    (Point(row=18, col=3), Player.white): 1227049980659761559,
-    (Point(row=18, col=4), Player.black): 2261545246324487857,
-    (Point(row=18, col=4), Player.white): 1542056914512765823,
-    (Point(row=18, col=5), Player.black): 141249349678927173,
-    (Point(row=18, col=5), Player.white): 632019105334292905,
-    (Point(row=18, col=6), Player.black): 4840678517370193581,
-    (Point(row=18, col=6), Player.white): 7688796944505201874,
-    (Point(row=18, col=7), Player.black): 8866588446227021695,
-    (Point(row=18, col=7), Player.white): 1112462746359900656,
-    (Point(row=18, col=8), Player.black): 5034492271978782076,
-    (Point(row=18, col=8), Player.white): 3155598077627699012,
-    (Point(row=18, col=9), Player.black): 7692201076725242709,
-    (Point(row=18, col=9), Player.white): 7126695292110119855,
-    (Point(row=18, col=10), Player.black): 1034301512706964397,
-    (Point(row=18, col=10), Player.white): 3605856991017765147,
-    (Point(row=18, col=11), Player.black): 1586272684174297972,
-    (Point(row=18, col=11), Player.white): 2322844015554433791,
-    (Point(row=18, col=12), Player.black): 1695270439911503917,
-    (Point(row=18, col=12), Player.white): 1791497378883686881,
-    (Point(row=18, col=13), Player.black): 455956854368275351,
-    (Point(row=18, col=13), Player.white): 7230978875468865117,
-    (Point(row=18, col=14), Player.black): 5506725408047164442,
-    (Point(row=18, col=14), Player.white): 5911747170130768659,
-    (Point(row=18, col=15), Player.black): 6834706777830632685,
-    (Point(row=18, col=15), Player.white): 4392085081151948179,
-    (Point(row=18, col=16), Player.black): 1881864563264737735,
-    (Point(row=18, col=16), Player.white): 282248832961589506,
-    (Point(row=18, col=17), Player.black): 7976316473145361367,
-    (Point(row=18, col=17), Player.white): 7818086917513591375,
-    (Point(row=18, col=18), Player.black): 5654573203062903051,
-    (Point(row=18, col=18), Player.white): 1789622898709956158,
-    (Point(row=18, col=19), Player.black): 7575783943716490944,
-    (Point(row=18, col=19), Player.white): 828270374629893783,
-    (Point(row=19, col=1), Player.black): 6480386388778245708,
-    (Point(row=19, col=1), Player.white): 4961976629517395131,
-    (Point(row=19, col=2), Player.black): 1258157518941779532,
-    (Point(row=19, col=2), Player.white): 3646072405874418461,
-    (Point(row=19, col=3), Player.black): 6856551572564826510,
-    (Point(row=19, col=3), Player.white): 4280462826592186108,
-    (Point(row=19, col=4), Player.black): 7446025038508359338,
-    (Point(row=19, col=4), Player.white): 2329514899084281220,
-    (Point(row=19, col=5), Player.black): 5826528324572497677,
-    (Point(row=19, col=5), Player.white): 2347939477009062392,
-    (Point(row=19, col=6), Player.black): 7813251852862344312,
-    (Point(row=19, col=6), Player.white): 7478710910460166946,
-    (Point(row=19, col=7), Player.black): 5267318332389673824,
-    (Point(row=19, col=7), Player.white): 8348713671424663704,
-    (Point(row=19, col=8), Player.black): 4806545505530375105,
-    (Point(row=19, col=8), Player.white): 1559275607323653057,
-    (Point(row=19, col=9), Player.black): 2960740171501371535,
-    (Point(row=19, col=9), Player.white): 3716429483673563746,
-    (Point(row=19, col=10), Player.black): 3393152020654211563,
-    (Point(row=19, col=10), Player.white): 6979896935569606226,
-    (Point(row=19, col=11), Player.black): 7886831501062796753,
-    (Point(row=19, col=11), Player.white): 8951187606626495344,
-    (Point(row=19, col=12), Player.black): 2244586601321905421,
-    (Point(row=19, col=12), Player.white): 7759758914702422816,
-    (Point(row=19, col=13), Player.black): 7609518478346967677,
-    (Point(row=19, col=13), Player.white): 7672104456938354149,
-    (Point(row=19, col=14), Player.black): 4370391433978327423,
-    (Point(row=19, col=14), Player.white): 6062842426555093327,
-    (Point(row=19, col=15), Player.black): 1077276394913094086,
-    (Point(row=19, col=15), Player.white): 448212263234288205,
-    (Point(row=19, col=16), Player.black): 3498327648744613365,
-    (Point(row=19, col=16), Player.white): 6559932912645185375,
-    (Point(row=19, col=17), Player.black): 1055118465738087110,
-    (Point(row=19, col=17), Player.white): 8977494321428544462,
-    (Point(row=19, col=18), Player.black): 1630324312915402269,
-    (Point(row=19, col=18), Player.white): 727115825396003422,
-    (Point(row=19, col=19), Player.black): 4225697149320212796,
-    (Point(row=19, col=19), Player.white): 8571018647389821175,
-}
+__all__ = ['EMPTY_BOARD', 'DEFAULT_SEED', 'ZobristTable', 'get_table']
 
 EMPTY_BOARD = 0
+DEFAULT_SEED = 20190501
+
+_tables = {}
+
+
+class ZobristTable:
+    """
+    Zobrist keys for one board size, generated deterministically from a seed so every
+    process derives the same hashes without a hard-coded table.
+    - stones: uint64 array (num_points, 3) indexed by row-major point index and color
+      (EMPTY = 0, Player.value for stones); column 0 is all zeros
+    - side_to_move: key to fold in when white is to move
+    - ko: uint64 array (num_points,) of keys for the point banned by simple ko
+    - by_point: Point -> (0, black key, white key) as Python ints for incremental updates
+    """
+    def __init__(self, num_rows, num_cols, seed=DEFAULT_SEED):
+        self.num_rows = num_rows
+        self.num_cols = num_cols
+        self.seed = seed
+        geometry = get_geometry(num_rows, num_cols)
+        rng = np.random.default_rng([seed, num_rows, num_cols])
+        # 63 bit keys keep the Python ints non-negative and within int64
+        keys = rng.integers(1, 2 ** 63, size=3 * geometry.num_points + 1, dtype=np.uint64)
+        self.stones = np.zeros((geometry.num_points, 3), dtype=np.uint64)
+        self.stones[:, 1:] = keys[:2 * geometry.num_points].reshape(-1, 2)
+        self.ko = keys[2 * geometry.num_points:3 * geometry.num_points]
+        self.side_to_move = int(keys[-1])
+        codes = self.stones.tolist()
+        self.by_point = {point: tuple(codes[i]) for i, point in enumerate(geometry.points)}
+
+    def code(self, point, player):
+        return self.by_point[point][player.value]
+
+    def hash_colors(self, colors):
+        """
+        Hash of one or more boards given as color arrays of shape (..., num_rows, num_cols)
+        holding EMPTY or Player.value. Returns uint64 values of shape colors.shape[:-2].
+        """
+        colors = np.asarray(colors)
+        flat = colors.reshape(colors.shape[:-2] + (-1,)).astype(np.intp)
+        codes = self.stones[np.arange(flat.shape[-1]), flat]
+        return np.bitwise_xor.reduce(codes, axis=-1)
+
+    def position_key(self, board_hash, next_player, ko_point=None):
+        """Board hash extended with the side to move and an optional simple-ko point"""
+        key = board_hash
+        if next_player == Player.white:
+            key ^= self.side_to_move
+        if ko_point is not None:
+            key ^= int(self.ko[(ko_point.row - 1) * self.num_cols + ko_point.col - 1])
+        return key
+
+
+def get_table(num_rows, num_cols, seed=DEFAULT_SEED):
+    key = (num_rows, num_cols, seed)
+    table = _tables.get(key)
+    if table is None:
+        table = _tables[key] = ZobristTable(num_rows, num_cols, seed)
+    return table